@@ -0,0 +1,45 @@
+"""
+Microbenchmark of the instantiation of a :py:class:`~manen.page_object_model.component.Component`
+depending on its number of fields.
+
+The configurations of a component are compiled once, when the class is created; instantiating a
+component should therefore have a constant cost, whatever the number of fields.
+
+Usage::
+
+    python benchmarks/component_instantiation.py
+"""
+
+from functools import partial
+from timeit import repeat
+from typing import Annotated
+
+from manen.page_object_model.component import Component, ComponentMeta
+from manen.page_object_model.config import CSS
+
+FIELD_COUNTS = (1, 5, 10, 50, 100)
+NUMBER = 10_000
+
+
+def make_component_class(nb_fields: int) -> type[Component]:
+    annotations = {f"field_{i}": Annotated[str, CSS(f"span.field-{i}")] for i in range(nb_fields)}
+    namespace = {"__annotations__": annotations}
+    return ComponentMeta(f"Component{nb_fields}", (Component,), namespace, slots=True)
+
+
+def main():
+    scope = object()
+    print(f"{'fields':>8} | {'class creation (µs)':>20} | {'instantiation (µs)':>20}")
+    print(f"{'-' * 8}-+-{'-' * 20}-+-{'-' * 20}")
+    for nb_fields in FIELD_COUNTS:
+        creation = min(repeat(partial(make_component_class, nb_fields), number=100, repeat=3))
+        component_class = make_component_class(nb_fields)
+        instantiation = min(repeat(partial(component_class, scope), number=NUMBER, repeat=5))
+        print(
+            f"{nb_fields:>8} | {creation / 100 * 1e6:>20.2f} | "
+            f"{instantiation / NUMBER * 1e6:>20.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Static HTML versions of the pages used in the examples (Books to Scrape, Quotes to Scrape and
+Scrape This Site hockey teams), with the same structure as the real pages, and the page objects
+defined in the ``examples/`` directory.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "examples"))
+
+from scrape_this_site.hockey_teams import ScrapeThisSiteHockeyTeamsPage
+from to_scrape.books import BooksToScrapePage
+from to_scrape.quotes import QuotesToScrapePage
+
+__all__ = (
+    "EXAMPLE_PAGES",
+    "BooksToScrapePage",
+    "QuotesToScrapePage",
+    "ScrapeThisSiteHockeyTeamsPage",
+    "books_page",
+    "hockey_teams_page",
+    "quotes_page",
+)
+
+
+def books_page(nb_books: int = 20, nb_categories: int = 50) -> str:
+    categories = "".join(
+        f'<li><a href="../category/books/category_{i}/index.html">Category {i}</a></li>'
+        for i in range(nb_categories)
+    )
+    books = "".join(
+        f"""
+        <li><article class="product_pod">
+          <div class="image_container">
+            <a href="book_{i}/index.html"><img src="../media/{i}.jpg" class="thumbnail"></a>
+          </div>
+          <p class="star-rating Three"></p>
+          <h3><a href="book_{i}/index.html" title="Book number {i}">Book number...</a></h3>
+          <div class="product_price">
+            <p class="price_color">£{10 + i}.99</p>
+            <p class="instock availability">In stock</p>
+          </div>
+        </article></li>"""
+        for i in range(nb_books)
+    )
+    return f"""
+    <html>
+      <head><title>All products | Books to Scrape - Sandbox</title></head>
+      <body>
+        <aside><ul class="nav nav-list"><li><a href="index.html">Books</a>
+          <ul>{categories}</ul>
+        </li></ul></aside>
+        <div class="page-header"><h1>All products</h1></div>
+        <form class="form-horizontal">
+          <strong>1000</strong> results - showing <strong>1</strong> to
+          <strong>{nb_books}</strong>.
+        </form>
+        <ol class="row">{books}</ol>
+        <ul class="pager">
+          <li class="current">Page 1 of 50</li>
+          <li class="next"><a href="page-2.html">next</a></li>
+        </ul>
+      </body>
+    </html>
+    """
+
+
+def quotes_page(nb_quotes: int = 10, nb_tags: int = 4) -> str:
+    quotes = "".join(
+        f"""
+        <div class="quote">
+          <span class="text">“Quote number {i}.”</span>
+          <span>by <small class="author">Author {i}</small></span>
+          <div class="tags">Tags:
+            {"".join(f'<a class="tag" href="/tag/{j}/">tag-{j}</a>' for j in range(nb_tags))}
+          </div>
+        </div>"""
+        for i in range(nb_quotes)
+    )
+    return f"""
+    <html>
+      <head><title>Quotes to Scrape</title></head>
+      <body>
+        <div class="col-md-8">{quotes}</div>
+        <nav><ul class="pager"><li class="next"><a href="/page/2/">Next</a></li></ul></nav>
+      </body>
+    </html>
+    """
+
+
+def hockey_teams_page(nb_teams: int = 25) -> str:
+    teams = "".join(
+        f"""
+        <tr class="team">
+          <td class="name">Team {i}</td><td class="year">{1990 + i}</td>
+          <td class="wins">{40 + i}</td><td class="losses">{30 - i}</td>
+          <td class="ot-losses"></td><td class="pct">0.{500 + i}</td>
+          <td class="gf">{250 + i}</td><td class="ga">{240 - i}</td>
+          <td class="diff">{10 + 2 * i}</td>
+        </tr>"""
+        for i in range(nb_teams)
+    )
+    pages = "".join(
+        f'<li><a href="/pages/forms/?page_num={i}">{i}</a></li>' for i in range(1, 25)
+    )
+    return f"""
+    <html>
+      <head><title>Hockey Teams: Forms, Searching and Pagination</title></head>
+      <body>
+        <h1>Hockey Teams <small>582 items</small></h1>
+        <a class="data-attribution" href="http://www.opensourcesports.com/hockey/">Source</a>
+        <form class="form form-inline"><input id="q" name="q" value=""></form>
+        <table class="table">{teams}</table>
+        <ul class="pagination">
+          {pages}
+          <li><a href="/pages/forms/?page_num=2" aria-label="Next">»</a></li>
+        </ul>
+      </body>
+    </html>
+    """
+
+
+EXAMPLE_PAGES = {
+    "books": (BooksToScrapePage, books_page(), "https://books.toscrape.com/catalogue/"),
+    "quotes": (QuotesToScrapePage, quotes_page(), "https://quotes.toscrape.com/"),
+    "hockey teams": (
+        ScrapeThisSiteHockeyTeamsPage,
+        hockey_teams_page(),
+        "https://www.scrapethissite.com/pages/forms/",
+    ),
+}
@@ -0,0 +1,60 @@
+"""
+Microbenchmark of the overhead of :py:func:`~manen.finder.find`, measured with a driver which
+answers instantly (no WebDriver command is actually sent).
+
+Usage::
+
+    python benchmarks/find_overhead.py
+"""
+
+from functools import partial
+from timeit import repeat
+
+from selenium.webdriver.common.by import By
+
+from manen.finder import Selector, _parse_selector_string, find
+
+NUMBER = 20_000
+
+
+class NoOpDriver:
+    def find_element(self, by, value):
+        return self
+
+    def find_elements(self, by, value):
+        return [self]
+
+
+CASES = {
+    "string selector": "css:div.article",
+    "inferred selector": "div.article",
+    "parsed selector": Selector(By.CSS_SELECTOR, "div.article"),
+    "5 fallback selectors (last matches)": [f"xpath://div[{i}]" for i in range(5)],
+}
+
+
+class MissUntilLastDriver(NoOpDriver):
+    def find_elements(self, by, value):
+        return [self] if value == "//div[4]" else []
+
+
+def main():
+    driver, fallback_driver = NoOpDriver(), MissUntilLastDriver()
+    print(f"{'case':>40} | {'cold cache (µs)':>15} | {'warm cache (µs)':>15}")
+    print(f"{'-' * 40}-+-{'-' * 15}-+-{'-' * 15}")
+    for name, selector in CASES.items():
+        scope = fallback_driver if isinstance(selector, list) else driver
+
+        run = partial(find, selector, inside=scope, many=True)
+
+        def run_cold(run=run):
+            _parse_selector_string.cache_clear()
+            run()
+
+        cold = min(repeat(run_cold, number=NUMBER, repeat=3)) / NUMBER * 1e6
+        warm = min(repeat(run, number=NUMBER, repeat=3)) / NUMBER * 1e6
+        print(f"{name:>40} | {cold:>15.2f} | {warm:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Benchmark of the hot paths of :py:mod:`manen` (finding elements, reading values, dumping the
+page objects of the examples...), run against a :py:class:`~manen.testing.FakeWebDriver`. For each
+case, it reports the number of WebDriver commands and the wall time, without latency and with a
+simulated latency for each command (which is what dominates with a real browser).
+
+The number of commands does not depend on the machine, so it can be compared to a baseline stored
+in ``benchmarks/baseline.json`` to detect regressions in the number of round trips.
+
+Usage::
+
+    python benchmarks/hot_paths.py                      # Print the results
+    python benchmarks/hot_paths.py --check              # Fail if a case sends more commands
+    python benchmarks/hot_paths.py --update-baseline    # Save the current number of commands
+"""
+
+import argparse
+import json
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+from typing import Annotated
+
+from example_pages import (
+    EXAMPLE_PAGES,
+    BooksToScrapePage,
+    QuotesToScrapePage,
+    ScrapeThisSiteHockeyTeamsPage,
+)
+
+from manen.finder import find
+from manen.page_object_model.component import Component
+from manen.page_object_model.config import CSS
+from manen.snapshot import DevToolsSnapshot
+from manen.testing import FakeWebDriver
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+Case = Callable[[FakeWebDriver], Callable[[], object]]
+
+
+class BookTitles(Component):
+    titles: Annotated[list[str], CSS("h3 a")]
+    heading: Annotated[str, CSS("h1")]
+
+
+def find_single(driver):
+    return lambda: find("css:h1", inside=driver)
+
+
+def find_many(driver):
+    return lambda: find("css:article.product_pod", inside=driver, many=True)
+
+
+def find_list_scopes(driver):
+    articles = find("css:article.product_pod", inside=driver, many=True)
+    return lambda: find("css:h3 a", inside=articles)
+
+
+def find_list_scopes_concurrent(driver):
+    articles = find("css:article.product_pod", inside=driver, many=True)
+    return lambda: find("css:h3 a", inside=articles, max_workers=8)
+
+
+def find_wait(driver):
+    return lambda: find(["css:h1.loaded", "css:h1"], inside=driver, wait=1)
+
+
+def find_fallbacks_with_js(driver):
+    return lambda: find(["css:h1.loaded", "css:h1"], inside=driver, with_js=True)
+
+
+def dom_value(driver):
+    return lambda: BookTitles(driver).heading
+
+
+def dom_values(driver):
+    return lambda: BookTitles(driver).titles
+
+
+def sibling_dom_values(driver):
+    return lambda: [book.title for book in BooksToScrapePage(driver).books]
+
+
+def len_dom_sections(driver):
+    return lambda: len(ScrapeThisSiteHockeyTeamsPage(driver).teams)
+
+
+def nested_dom_sections(driver):
+    return lambda: [quote.tags for quote in QuotesToScrapePage(driver).quotes]
+
+
+def model_dump(page_class, with_js=False):
+    def case(driver):
+        return lambda: page_class(driver).model_dump(with_js=with_js)
+
+    return case
+
+
+def model_dump_dom_snapshot(page_class):
+    def case(driver):
+        return lambda: page_class(DevToolsSnapshot.capture(driver)).model_dump()
+
+    return case
+
+
+def model_iter(with_js=False):
+    def case(driver):
+        return lambda: list(BooksToScrapePage(driver).model_iter("books", with_js=with_js))
+
+    return case
+
+
+def model_columns(driver):
+    return lambda: BooksToScrapePage(driver).model_columns("books", pack="array")
+
+
+def component_instantiation(driver):
+    return lambda: BooksToScrapePage(driver)
+
+
+CASES: dict[str, tuple[str, Case]] = {
+    "find: single element": ("books", find_single),
+    "find: many elements": ("books", find_many),
+    "find: list of 20 scopes": ("books", find_list_scopes),
+    "find: list of 20 scopes, 8 workers": ("books", find_list_scopes_concurrent),
+    "find: 2 selectors, wait=1": ("books", find_wait),
+    "find: 2 selectors, with_js": ("books", find_fallbacks_with_js),
+    "DOMValue": ("books", dom_value),
+    "DOMValues": ("books", dom_values),
+    "DOMValue in 20 sections": ("books", sibling_dom_values),
+    "len(DOMSections)": ("hockey teams", len_dom_sections),
+    "nested DOMSections (quotes > tags)": ("quotes", nested_dom_sections),
+    "Component instantiation": ("books", component_instantiation),
+    "model_iter: books": ("books", model_iter()),
+    "model_iter: books, with_js": ("books", model_iter(with_js=True)),
+    "model_columns: books": ("books", model_columns),
+}
+for _name, (_page_class, _, _) in EXAMPLE_PAGES.items():
+    CASES[f"model_dump: {_name}"] = (_name, model_dump(_page_class))
+    CASES[f"model_dump: {_name}, with_js"] = (_name, model_dump(_page_class, with_js=True))
+    CASES[f"model_dump: {_name}, DOMSnapshot"] = (_name, model_dump_dom_snapshot(_page_class))
+
+
+def run_case(page: str, case: Case, latency: float, number: int) -> tuple[int, float]:
+    """Run a benchmark case.
+
+    Returns:
+        tuple[int, float]: number of WebDriver commands sent by one run, and minimal wall time
+        of one run (in seconds)
+    """
+    _, source, url = EXAMPLE_PAGES[page]
+    driver = FakeWebDriver(source, url=url, latency=latency)
+    run = case(driver)
+    driver.reset_commands()
+    timings = []
+    for _ in range(number):
+        start = perf_counter()
+        run()
+        timings.append(perf_counter() - start)
+    return driver.reset_commands().total() // number, min(timings)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--latency", type=float, default=1.0, help="latency per command (ms)")
+    parser.add_argument("--number", type=int, default=5, help="number of runs per case")
+    parser.add_argument("--check", action="store_true", help="compare with the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="save the baseline")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    results, regressions = {}, []
+    latency_header = f"{args.latency:g}ms latency (ms)"
+    print(f"{'case':>40} | {'commands':>8} | {'no latency (ms)':>15} | {latency_header:>24}")
+    print(f"{'-' * 40}-+-{'-' * 8}-+-{'-' * 15}-+-{'-' * 24}")
+    for name, (page, case) in CASES.items():
+        commands, fast = run_case(page, case, 0, args.number)
+        _, slow = run_case(page, case, args.latency / 1000, 1)
+        results[name] = commands
+        flag = ""
+        if name in baseline and commands > baseline[name]:
+            regressions.append(name)
+            flag = f"  (baseline: {baseline[name]})"
+        print(f"{name:>40} | {commands:>8} | {fast * 1e3:>15.2f} | {slow * 1e3:>24.2f}{flag}")
+
+    if args.update_baseline:
+        BASELINE.write_text(json.dumps(results, indent=4) + "\n")
+    if args.check and regressions:
+        print(f"\nMore WebDriver commands than in the baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
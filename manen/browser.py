@@ -3,23 +3,43 @@ Classes which inherits from :py:class:`~selenium.webdriver.remote.webdriver.WebD
 useful methods for driver interactions.
 """
 
+import copy
+import json
+import queue
+import threading
 import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext, suppress
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import TYPE_CHECKING, Any, cast
+from functools import partial
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver import Chrome, ChromeOptions, ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.options import PageLoadStrategy
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.switch_to import SwitchTo
 
 from manen.finder import find
-from manen.helpers import PLATFORM, version
-from manen.typing import WebDriverProtocol
+from manen.helpers import PLATFORM, version, wait_until_loaded
+from manen.javascript import NAVIGATE_SCRIPT
+from manen.snapshot import DevToolsSnapshot
+from manen.typing import Cookie, WebDriverProtocol
 
 if TYPE_CHECKING:
+    from typing_extensions import Self
+
     from .typing import DriverOrElement, Version, WebElement
 
 
-__all__ = ("ChromeBrowser",)
+__all__ = ("BrowserPool", "ChromeBrowser", "NetworkStats", "ResourceType", "TabPool")
+
+T = TypeVar("T")
 
 
 class ScrollDirection(str, Enum):
@@ -32,12 +52,195 @@ class HeadlessMode(str, Enum):
     OLD = "old"
 
 
+class ResourceType(str, Enum):
+    IMAGE = "image"
+    FONT = "font"
+    MEDIA = "media"
+    STYLESHEET = "stylesheet"
+
+
+RESOURCE_URL_PATTERNS: dict[ResourceType, tuple[str, ...]] = {
+    ResourceType.IMAGE: (
+        "*.apng", "*.avif", "*.bmp", "*.gif", "*.ico", "*.jpeg", "*.jpg", "*.png", "*.svg",
+        "*.webp",
+    ),
+    ResourceType.FONT: ("*.eot", "*.otf", "*.ttf", "*.woff", "*.woff2"),
+    ResourceType.MEDIA: (
+        "*.avi", "*.flac", "*.m4a", "*.m4v", "*.mov", "*.mp3", "*.mp4", "*.ogg", "*.wav",
+        "*.webm",
+    ),
+    ResourceType.STYLESHEET: ("*.css",),
+}  # fmt: skip
+
+
+def blocked_url_patterns(
+    resources: Iterable[ResourceType | str] = (),
+    urls: Iterable[str] = (),
+) -> list[str]:
+    """Build the list of URL patterns to block, from resource types and URL patterns.
+
+    The resources are identified by the extension of their URL (see
+    ``RESOURCE_URL_PATTERNS``), followed or not by a query string or a fragment
+    (``*.png``, ``*.png?*`` and ``*.png#*``). A resource served from a URL without extension
+    (e.g. ``/image?id=1``) isn't blocked.
+
+    Args:
+        resources (Iterable[ResourceType | str], optional): types of resources to block.
+            Defaults to ().
+        urls (Iterable[str], optional): URL patterns to block, where ``*`` matches any sequence
+            of characters (e.g. ``*google-analytics.com*``). Defaults to ().
+
+    Returns:
+        list[str]: URL patterns, without duplicates
+    """
+    patterns = [
+        f"{pattern}{suffix}"
+        for resource in resources
+        for pattern in RESOURCE_URL_PATTERNS[ResourceType(resource)]
+        for suffix in ("", "?*", "#*")
+    ]
+    return list(dict.fromkeys([*patterns, *urls]))
+
+
+@dataclass
+class NetworkStats:
+    """Statistics of the network requests of a browser, read from its performance log.
+
+    Attributes:
+        requests (int): number of requests sent by the pages (blocked requests included)
+        blocked (int): number of requests blocked by the browser
+        blocked_by_type (Counter[str]): number of blocked requests by resource type (``Image``,
+            ``Font``, ``Script``...)
+        transferred_bytes (int): number of bytes received over the network
+    """
+
+    requests: int = 0
+    blocked: int = 0
+    blocked_by_type: Counter[str] = field(default_factory=Counter)
+    transferred_bytes: int = 0
+
+    @classmethod
+    def from_performance_log(cls, entries: list[dict[str, Any]]) -> "NetworkStats":
+        """Compute the statistics from the entries of a performance log (see
+        :py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.get_log`)."""
+        stats = cls()
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                stats.requests += 1
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                stats.blocked += 1
+                stats.blocked_by_type[params.get("type", "Other")] += 1
+            elif method == "Network.loadingFinished":
+                stats.transferred_bytes += int(params.get("encodedDataLength", 0))
+        return stats
+
+
+def to_devtools_cookie(cookie: Cookie, url: str | None = None) -> dict[str, Any]:
+    """Convert a cookie from the Selenium format to the DevTools format (``CookieParam``).
+
+    Args:
+        cookie (Cookie): cookie, as returned by
+            :py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.get_cookies`
+        url (str, optional): URL the cookie is associated to, if it has no domain. Defaults to
+            None.
+
+    Returns:
+        dict[str, Any]: cookie in the DevTools format
+    """
+    output = {"name": cookie["name"], "value": cookie["value"]}
+    for key in ("domain", "path", "secure", "httpOnly", "sameSite"):
+        if cookie.get(key) is not None:
+            output[key] = cookie[key]
+    if cookie.get("expiry") is not None:
+        output["expires"] = cookie["expiry"]
+    if "domain" not in output and url:
+        output["url"] = url
+    return output
+
+
+def from_devtools_cookie(cookie: dict[str, Any]) -> Cookie:
+    """Convert a cookie from the DevTools format (``Cookie``) to the Selenium format."""
+    output = {key: cookie[key] for key in ("name", "value", "domain", "path") if key in cookie}
+    output["secure"] = cookie.get("secure", False)
+    output["httpOnly"] = cookie.get("httpOnly", False)
+    if cookie.get("sameSite"):
+        output["sameSite"] = cookie["sameSite"]
+    if not cookie.get("session", False) and cookie.get("expires", -1) >= 0:
+        output["expiry"] = int(cookie["expires"])
+    return output
+
+
+class _TabsState:
+    """State shared by a browser and its tabs: the handle of the window the WebDriver session is
+    switched to, and a lock held while a command is sent."""
+
+    __slots__ = ("current", "lock")
+
+    def __init__(self, current: str | None):
+        self.lock = threading.RLock()
+        self.current = current
+
+
 class BrowserMixin(WebDriverProtocol):
     """
     Mixin to enhance :py:class:`~selenium.webdriver.remote.webdriver.WebDriver` with a set of
     features intended to ease the way to work with a WebDriver instance.
     """
 
+    _tabs: _TabsState | None = None
+    _tab_handle: str | None = None
+    _document_scripts: tuple[str, ...] = ()
+
+    def execute(self, driver_command: str, params: dict | None = None):
+        """Send a command to the driver. When the browser has a :py:class:`TabPool`, the command
+        is sent while no other tab can send one, after switching to the window of the tab (if
+        this driver is one of the tabs of the pool)."""
+        tabs = self._tabs
+        if tabs is None:
+            return super().execute(driver_command, params)  # type: ignore[misc]
+        with tabs.lock:
+            handle = self._tab_handle
+            if handle is not None and tabs.current != handle:
+                super().execute(Command.SWITCH_TO_WINDOW, {"handle": handle})  # type: ignore[misc]
+                tabs.current = handle
+            response = super().execute(driver_command, params)  # type: ignore[misc]
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                tabs.current = cast(dict, params)["handle"]
+            elif driver_command == Command.CLOSE:
+                tabs.current = None
+            return response
+
+    def tab(self, handle: str) -> "BrowserMixin":
+        """Driver bound to one window of the browser: it switches to this window before each of
+        its commands, and the elements it finds do the same. It should be used through a
+        :py:class:`TabPool`, which makes the switches safe.
+
+        Args:
+            handle (str): handle of the window
+
+        Returns:
+            BrowserMixin: driver bound to the window, sharing the session of the browser
+        """
+        if self._tabs is None:
+            raise RuntimeError("The tabs of a browser should be managed by a TabPool.")
+        tab = copy.copy(self)
+        tab._tab_handle = handle
+        tab._switch_to = SwitchTo(tab)
+        return tab
+
+    def tab_pool(self, size: int = 4) -> "TabPool":
+        """Pool of tabs of the browser (see :py:class:`TabPool`).
+
+        Args:
+            size (int, optional): number of tabs. Defaults to 4.
+
+        Returns:
+            TabPool: pool of tabs, to open (or to use as a context manager)
+        """
+        return TabPool(self, size)
+
     @property
     def cookies(self):
         """Cookies associated to the current domain"""
@@ -46,19 +249,118 @@ class BrowserMixin(WebDriverProtocol):
     @cookies.setter
     def cookies(self, cookies: list[dict[str, Any]]):
         """
-        Inject some cookies in the current driver.
+        Inject some cookies in the current driver (see :py:meth:`add_cookies`).
 
         Args:
             cookies (list[dict[str, Any]): cookies as a list of dictionaries
         """
-        for cookie in cookies:
-            self.add_cookie(cookie)
+        self.add_cookies(cookies)
 
     @cookies.deleter
     def cookies(self):
         """Delete current cookies inside the driver."""
         self.delete_all_cookies()
 
+    def add_cookies(self, cookies: list[Cookie]):
+        """Inject several cookies at once. With a Chromium-based browser, all the cookies are set
+        with one DevTools command (``Network.setCookies``), whatever their domain: there is no
+        need to visit the domains first. Otherwise, the cookies are added one by one to the
+        current domain.
+
+        Args:
+            cookies (list[Cookie]): cookies, in the format of
+                :py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.get_cookies`
+        """
+        execute_cdp_cmd = getattr(self, "execute_cdp_cmd", None)
+        if execute_cdp_cmd is None:
+            for cookie in cookies:
+                self.add_cookie(cookie)
+            return
+        url = self.current_url if any("domain" not in cookie for cookie in cookies) else None
+        execute_cdp_cmd(
+            "Network.setCookies",
+            {"cookies": [to_devtools_cookie(cookie, url) for cookie in cookies]},
+        )
+
+    def add_document_script(self, source: str) -> str:
+        """Evaluate a script in each page loaded afterwards, before the scripts of the page, with
+        the DevTools command ``Page.addScriptToEvaluateOnNewDocument`` (Chromium-based browsers
+        only). The script is removed by :py:meth:`reset`.
+
+        Args:
+            source (str): JavaScript code to evaluate
+
+        Returns:
+            str: identifier of the script
+        """
+        response = self.execute_cdp_cmd(  # type: ignore[attr-defined]
+            "Page.addScriptToEvaluateOnNewDocument", {"source": source}
+        )
+        self._document_scripts = (*self._document_scripts, response["identifier"])
+        return response["identifier"]
+
+    def remove_document_scripts(self):
+        """Stop evaluating the scripts added with :py:meth:`add_document_script` in the pages
+        loaded afterwards."""
+        if not self._document_scripts:
+            return
+        for identifier in self._document_scripts:
+            self.execute_cdp_cmd(  # type: ignore[attr-defined]
+                "Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier}
+            )
+        self._document_scripts = ()
+
+    def get_all_cookies(self) -> list[Cookie]:
+        """Cookies of all the domains, read with one DevTools command (``Storage.getCookies``)
+        with a Chromium-based browser. Otherwise, only the cookies of the current domain are
+        returned.
+
+        Returns:
+            list[Cookie]: cookies, in the format of
+            :py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.get_cookies`
+        """
+        execute_cdp_cmd = getattr(self, "execute_cdp_cmd", None)
+        if execute_cdp_cmd is None:
+            return self.get_cookies()
+        cookies = execute_cdp_cmd("Storage.getCookies", {})["cookies"]
+        return [from_devtools_cookie(cookie) for cookie in cookies]
+
+    def reset(self):
+        """
+        Reset the state of the browser, so that it can be reused for another job: close all the
+        windows but the first one, remove the scripts evaluated in each new page, delete the
+        cookies, clear the local and session storages and go to a blank page.
+
+        With a Chromium-based browser, the cookies of all the domains are deleted with DevTools
+        (``Network.clearBrowserCookies``), and the data stored by the origin of the current page
+        and by the origins of these cookies is cleared (``Storage.clearDataForOrigin``). With
+        another browser, only the cookies and the storages of the current origin are cleared.
+        """
+        main_window, *other_windows = self.window_handles
+        for window in other_windows:
+            self.switch_to.window(window)
+            self.close()
+        self.switch_to.window(main_window)
+        self.remove_document_scripts()
+        origin = self.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}\n"
+            "return window.location.origin;"
+        )
+        execute_cdp_cmd = getattr(self, "execute_cdp_cmd", None)
+        if execute_cdp_cmd is None:
+            del self.cookies
+        else:
+            origins = {origin} if origin and origin != "null" else set()
+            for cookie in execute_cdp_cmd("Storage.getCookies", {})["cookies"]:
+                domain = cookie["domain"].lstrip(".")
+                origins.update((f"https://{domain}", f"http://{domain}"))
+            execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in sorted(origins):
+                execute_cdp_cmd(
+                    "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}
+                )
+        self.get("about:blank")
+
     def click_with_js(self, element: "WebElement"):
         """
         Click on an element using JavaScript (useful to click on an element outside the current
@@ -86,6 +388,11 @@ class BrowserMixin(WebDriverProtocol):
 
         Raises:
             ValueError: Raised if `direction` is not `UP` or `DOWN`
+
+        .. seealso::
+
+            :py:func:`~manen.page_object_model.pagination.infinite_scroll` to scroll an infinite
+            feed until it stops growing, waiting for the new items instead of a fixed time.
         """
         if direction not in list(ScrollDirection):
             raise ValueError(
@@ -185,6 +492,8 @@ class BrowserMixin(WebDriverProtocol):
 class ChromeBrowser(BrowserMixin, Chrome):
     """Wrapper around Selenium ChromeWebDriver providing methods to improve its operability."""
 
+    _blocked_urls: tuple[str, ...] = ()
+
     @classmethod
     def initialize(
         cls,
@@ -194,6 +503,10 @@ class ChromeBrowser(BrowserMixin, Chrome):
         headless_mode: HeadlessMode | None = None,
         proxy: str | None = None,
         window_size: tuple[int, int] | None = None,
+        page_load_strategy: PageLoadStrategy | str | None = None,
+        blocked_resources: Iterable[ResourceType | str] = (),
+        blocked_urls: Iterable[str] = (),
+        network_stats: bool = False,
     ):
         """
         Launch an enhanced web driver for the browser Chrome.
@@ -201,9 +514,30 @@ class ChromeBrowser(BrowserMixin, Chrome):
         Args:
             options (ChromeOptions, optional): Options to configure the driver. Defaults to None.
             service (ChromeService, optional): Service to configure the driver. Defaults to None.
+            page_load_strategy (PageLoadStrategy | str, optional): when
+                :py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.get` returns: once the
+                page is fully loaded (``normal``), once the DOM is ready (``eager``) or
+                immediately (``none``). Defaults to None (``normal``).
+            blocked_resources (Iterable[ResourceType | str], optional): types of resources
+                (images, fonts, media, stylesheets) the browser should not download, based on
+                the extension of their URL (see :py:func:`blocked_url_patterns`). Defaults to
+                ().
+            blocked_urls (Iterable[str], optional): URL patterns the browser should not
+                download, where ``*`` matches any sequence of characters (e.g.
+                ``*doubleclick.net*``). Defaults to ().
+            network_stats (bool, optional): enable the performance log, so that the requests
+                (and the blocked ones) can be counted with :py:meth:`network_stats`. The log
+                grows with each request until it is consumed. Defaults to False.
 
         Returns:
             WebDriver: An enhanced Chrome driver
+
+        .. note::
+
+            The requests are blocked with the DevTools command ``Network.setBlockedURLs``
+            (see :py:meth:`block_urls`), sent to the first tab and to each tab opened later by
+            the driver (by a :py:class:`TabPool` or with ``switch_to.new_window``). The tabs
+            opened by the pages themselves (e.g. links with ``target="_blank"``) aren't blocked.
         """
         if driver_path and service:
             raise ValueError(
@@ -226,4 +560,408 @@ class ChromeBrowser(BrowserMixin, Chrome):
         if window_size:
             options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
 
-        return cls(options=options, service=service)
+        if page_load_strategy:
+            options.page_load_strategy = PageLoadStrategy(page_load_strategy)
+
+        if network_stats:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+        patterns = blocked_url_patterns(blocked_resources, blocked_urls)
+
+        browser = cls(options=options, service=service)
+        if patterns:
+            browser.block_urls(patterns)
+        return browser
+
+    def execute(self, driver_command: str, params: dict | None = None):
+        """Send a command to the driver; the requests of the windows it opens are blocked like
+        the ones of the current tab (see :py:meth:`block_urls`)."""
+        response = super().execute(driver_command, params)
+        if driver_command == Command.NEW_WINDOW and self._blocked_urls:
+            self._block_window(response["value"]["handle"])
+        return response
+
+    def _block_window(self, handle: str):
+        execute = super(BrowserMixin, self).execute
+        tabs = self._tabs
+        with tabs.lock if tabs is not None else nullcontext():
+            current = execute(Command.W3C_GET_CURRENT_WINDOW_HANDLE)["value"]
+            execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+            try:
+                for cmd, cmd_args in self._block_commands(list(self._blocked_urls)):
+                    execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})
+            finally:
+                execute(Command.SWITCH_TO_WINDOW, {"handle": current})
+
+    @staticmethod
+    def _block_commands(patterns: list[str]) -> list[tuple[str, dict]]:
+        return [("Network.enable", {}), ("Network.setBlockedURLs", {"urls": patterns})]
+
+    def block_urls(self, patterns: list[str]):
+        """Block the requests of the current tab whose URL matches one of the patterns (where
+        ``*`` matches any sequence of characters), and of the tabs opened later by the driver.
+
+        Args:
+            patterns (list[str]): URL patterns to block (see :py:func:`blocked_url_patterns`)
+        """
+        for cmd, cmd_args in self._block_commands(patterns):
+            self.execute_cdp_cmd(cmd, cmd_args)
+        self._blocked_urls = tuple(patterns)
+
+    def network_stats(self) -> NetworkStats:
+        """Statistics of the network requests since the last call (the performance log is
+        consumed), which makes it possible to measure the requests blocked on each page. The
+        performance log must be enabled (with the option ``network_stats`` of
+        :py:meth:`initialize`).
+
+        Returns:
+            NetworkStats: statistics of the network requests
+        """
+        return NetworkStats.from_performance_log(self.get_log("performance"))
+
+    def dom_snapshot(self) -> DevToolsSnapshot:
+        """Capture the current page with one DevTools command, to extract the page objects
+        locally (see :py:class:`~manen.snapshot.DevToolsSnapshot`).
+
+        Returns:
+            DevToolsSnapshot: snapshot of the page, usable as the driver of a
+            :py:class:`~manen.page_object_model.component.Page`
+        """
+        return DevToolsSnapshot.capture(self)
+
+
+@dataclass
+class BrowserPoolStats:
+    """Statistics of a :py:class:`BrowserPool`, since its start."""
+
+    size: int
+    available: int
+    leases: int
+    replacements: int
+    total_wait_time: float
+    max_wait_time: float
+    busy_time: float
+    uptime: float
+
+    @property
+    def mean_wait_time(self) -> float:
+        """Mean time (in seconds) waited to lease a browser."""
+        return self.total_wait_time / self.leases if self.leases else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Share of the time the browsers of the pool have been leased (between 0 and 1)."""
+        return self.busy_time / (self.size * self.uptime) if self.size and self.uptime else 0.0
+
+
+class BrowserPool:
+    """
+    Pool of browsers started in advance and kept warm, to avoid paying the startup time of a
+    browser for each job. A browser is leased with :py:meth:`~BrowserPool.lease`, and is reset
+    (see :py:meth:`BrowserMixin.reset`) when it is given back. Browsers that crashed or can't be
+    reset are replaced by new ones.
+
+    Example::
+
+        >>> with BrowserPool(size=4, headless_mode=HeadlessMode.NEW) as pool:
+        ...     with pool.lease() as browser:
+        ...         browser.get("https://books.toscrape.com/")
+        ...         page = BooksToScrapePage(browser)
+        >>> pool.stats.utilization
+        0.12
+
+    Args:
+        size (int): number of browsers in the pool
+        factory (Callable[[], ChromeBrowser], optional): function creating a new browser. Defaults
+            to :py:meth:`ChromeBrowser.initialize`, called with ``**kwargs``.
+        **kwargs: keyword arguments sent to :py:meth:`ChromeBrowser.initialize`
+    """
+
+    def __init__(
+        self,
+        size: int,
+        factory: "Callable[[], BrowserMixin] | None" = None,
+        **kwargs,
+    ):
+        if size < 1:
+            raise ValueError("The size of a pool should be at least 1.")
+        if factory and kwargs:
+            raise ValueError("You cannot specify both `factory` and `ChromeBrowser` parameters.")
+        self.size = size
+        self.factory = factory or partial(ChromeBrowser.initialize, **kwargs)
+        self._browsers: list[BrowserMixin] = []
+        self._available: queue.Queue[BrowserMixin] = queue.Queue()
+        self._lock = threading.Lock()
+        self._started_at: float | None = None
+        self._leases = 0
+        self._replacements = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._busy_time = 0.0
+
+    def __enter__(self) -> "Self":
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def start(self):
+        """Start all the browsers of the pool, concurrently. If one of them fails to start, the
+        ones already started are quit and the error is raised."""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self.factory) for _ in range(self.size)]
+        browsers, errors = [], []
+        for future in futures:
+            error = future.exception()
+            if error is None:
+                browsers.append(future.result())
+            else:
+                errors.append(error)
+        if errors:
+            for browser in browsers:
+                with suppress(Exception):
+                    browser.quit()
+            raise errors[0]
+        self._browsers.extend(browsers)
+        for browser in browsers:
+            self._available.put(browser)
+        self._started_at = time.monotonic()
+
+    def close(self):
+        """Quit all the browsers of the pool."""
+        for browser in self._browsers:
+            try:
+                browser.quit()
+            except WebDriverException:
+                pass
+        self._browsers.clear()
+
+    def _replace(self, browser: "BrowserMixin") -> "BrowserMixin":
+        with suppress(Exception):
+            browser.quit()
+        new_browser = self.factory()
+        with self._lock:
+            self._browsers[self._browsers.index(browser)] = new_browser
+            self._replacements += 1
+        return new_browser
+
+    @staticmethod
+    def _is_alive(browser: "BrowserMixin") -> bool:
+        # When the driver itself died, the error is not a WebDriverException (connection error)
+        try:
+            _ = browser.window_handles
+        except Exception:  # noqa: BLE001
+            return False
+        return True
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> "Iterator[BrowserMixin]":
+        """
+        Lease a browser of the pool, waiting for one to be available if needed. The browser is
+        given back to the pool (after being reset) when exiting the context manager.
+
+        A browser which crashed is replaced by a new one; if the replacement fails, the crashed
+        browser is kept in the pool and its replacement is tried again on the next lease, so
+        that the pool never loses a slot.
+
+        Args:
+            timeout (float, optional): maximum number of seconds to wait for a browser. Defaults
+                to None (wait indefinitely).
+
+        Raises:
+            TimeoutError: raised if no browser is available after ``timeout`` seconds
+
+        Yields:
+            BrowserMixin: a browser of the pool
+        """
+        if self._started_at is None:
+            raise RuntimeError("The pool should be started before leasing a browser.")
+
+        start = time.monotonic()
+        try:
+            browser = self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No browser available after {timeout} seconds") from None
+        leased_at = time.monotonic()
+
+        with self._lock:
+            self._leases += 1
+            self._total_wait_time += leased_at - start
+            self._max_wait_time = max(self._max_wait_time, leased_at - start)
+
+        try:
+            if not self._is_alive(browser):
+                browser = self._replace(browser)
+        except Exception:
+            self._available.put(browser)
+            raise
+
+        try:
+            yield browser
+        finally:
+            try:
+                browser.reset()
+            except Exception:  # noqa: BLE001
+                # Replaced on the next lease if it fails, without hiding the error of the caller
+                with suppress(Exception):
+                    browser = self._replace(browser)
+            finally:
+                with self._lock:
+                    self._busy_time += time.monotonic() - leased_at
+                self._available.put(browser)
+
+    @property
+    def stats(self) -> BrowserPoolStats:
+        """Statistics on the usage of the pool."""
+        with self._lock:
+            return BrowserPoolStats(
+                size=self.size,
+                available=self._available.qsize(),
+                leases=self._leases,
+                replacements=self._replacements,
+                total_wait_time=self._total_wait_time,
+                max_wait_time=self._max_wait_time,
+                busy_time=self._busy_time,
+                uptime=time.monotonic() - self._started_at if self._started_at else 0.0,
+            )
+
+
+class TabPool:
+    """
+    Pool of tabs of one browser, to work on several pages at once without the memory cost of
+    several browsers. Each tab is a driver bound to one window of the browser (see
+    :py:meth:`BrowserMixin.tab`): the browser is switched to this window before each of its
+    commands and of the commands of its elements, so that the page objects created with a tab
+    always read their own page, even when the tabs are used by several threads. The commands are
+    still sent one at a time.
+
+    With :py:meth:`map`, the pages are loaded in background tabs while the page of the foreground
+    tab is extracted, so that the page loads overlap with the extraction.
+
+    Example::
+
+        >>> with browser.tab_pool(size=4) as tabs:
+        ...     for book in tabs.map(lambda tab: BookPage(tab).model_dump(), urls):
+        ...         print(book["title"])
+
+    Args:
+        browser (BrowserMixin): browser where the tabs are opened; it should not be used directly
+            while the pool is open
+        size (int, optional): number of tabs, including the current window of the browser.
+            Defaults to 4.
+    """
+
+    def __init__(self, browser: BrowserMixin, size: int = 4):
+        if size < 1:
+            raise ValueError("The size of a pool should be at least 1.")
+        self.browser = browser
+        self.size = size
+        self.tabs: list[BrowserMixin] = []
+        self._available: queue.Queue[BrowserMixin] = queue.Queue()
+
+    def __enter__(self) -> "Self":
+        self.open()
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def open(self):
+        """Open the tabs of the pool; the current window of the browser is the first one."""
+        browser = self.browser
+        browser._tabs = _TabsState(browser.current_window_handle)
+        handles = [browser._tabs.current]
+        for _ in range(self.size - 1):
+            response = browser.execute(Command.NEW_WINDOW, {"type": "tab"})
+            handles.append(response["value"]["handle"])
+        self.tabs = [browser.tab(cast(str, handle)) for handle in handles]
+        for tab in self.tabs:
+            self._available.put(tab)
+
+    def close(self):
+        """Close the tabs opened by the pool, and switch the browser back to its first window."""
+        if not self.tabs:
+            return
+        first, *others = self.tabs
+        for tab in others:
+            try:
+                tab.close()
+            except WebDriverException:
+                pass
+        try:
+            self.browser.switch_to.window(cast(str, first._tab_handle))
+        except WebDriverException:
+            pass
+        self.browser._tabs = None
+        self.tabs = []
+        self._available = queue.Queue()
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[BrowserMixin]:
+        """
+        Lease a tab of the pool, waiting for one to be available if needed.
+
+        Args:
+            timeout (float, optional): maximum number of seconds to wait for a tab. Defaults to
+                None (wait indefinitely).
+
+        Raises:
+            TimeoutError: raised if no tab is available after ``timeout`` seconds
+
+        Yields:
+            BrowserMixin: a tab of the pool
+        """
+        if not self.tabs:
+            raise RuntimeError("The pool should be opened before leasing a tab.")
+        try:
+            tab = self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No tab available after {timeout} seconds") from None
+        try:
+            yield tab
+        finally:
+            self._available.put(tab)
+
+    def map(
+        self,
+        function: Callable[[BrowserMixin], T],
+        urls: Iterable[str],
+        *,
+        timeout: float = 30,
+    ) -> Iterator[T]:
+        """Load pages in the tabs of the pool and apply a function to each of them, in the order
+        of the URLs.
+
+        The navigation to an URL is started without waiting for the page, as soon as a tab is
+        free: while the function is applied to the page of a tab, the next pages are loading in
+        the other tabs. All the tabs of the pool are leased during the iteration.
+
+        Args:
+            function (Callable[[BrowserMixin], T]): function called with the tab displaying each
+                page, like ``lambda tab: BookPage(tab).model_dump()``
+            urls (Iterable[str]): URLs of the pages (consumed lazily)
+            timeout (float, optional): maximum number of seconds to wait for a page to be loaded;
+                the function is applied anyway afterwards. Defaults to 30.
+
+        Yields:
+            T: result of the function for each page
+        """
+        urls = iter(urls)
+        pending: deque[BrowserMixin] = deque()
+
+        def load(tab: BrowserMixin):
+            url = next(urls, None)
+            if url is not None:
+                tab.execute_script(NAVIGATE_SCRIPT, url)
+                pending.append(tab)
+
+        with ExitStack() as stack:
+            for _ in range(self.size):
+                load(stack.enter_context(self.lease()))
+            while pending:
+                tab = pending.popleft()
+                wait_until_loaded(tab, timeout)
+                result = function(tab)
+                load(tab)
+                yield result
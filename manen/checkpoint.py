@@ -0,0 +1,148 @@
+"""
+Checkpoints of long crawls, so that a crawl interrupted (or crashed) can be restarted without
+extracting again the pages already done.
+
+A :py:class:`Checkpoint` is an append-only log on the disk (one JSON array per line) of the URLs
+processed, with the outcome of their extraction. When it is opened, the log is loaded in memory,
+so that checking whether an URL has already been done is a set lookup. The new records are
+buffered and appended by batches, so that the checkpoint doesn't slow down the crawl.
+
+.. code-block:: python
+
+    >>> from manen.checkpoint import Checkpoint
+    >>> with Checkpoint("books.checkpoint") as checkpoint:
+    ...     stats = CrawlRunner(BookPage).run(book_urls, "books.jsonl", checkpoint=checkpoint)
+    >>> stats.skipped  # After a restart
+    40000
+
+It is used by :py:meth:`~manen.crawl.CrawlRunner.run` and by
+:py:func:`~manen.page_object_model.pagination.paginate`, but it can be used in any loop:
+
+.. code-block:: python
+
+    >>> with Checkpoint("books.checkpoint") as checkpoint:
+    ...     for url in book_urls:
+    ...         if url in checkpoint:
+    ...             continue
+    ...         ...  # Extract the page
+    ...         checkpoint.record(url)
+
+The URLs whose extraction failed are recorded too (see :py:attr:`Checkpoint.errors`), but they
+are not considered as done, so they are retried when the crawl is restarted.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+__all__ = ("Checkpoint",)
+
+
+class Checkpoint:
+    """
+    Append-only log of the URLs processed by a crawl.
+
+    Args:
+        path (str | Path): path of the log; the records already in the file are loaded
+        batch_size (int, optional): number of records buffered before they are written to the
+            disk. Defaults to 100.
+        flush_interval (float, optional): maximum number of seconds a record stays in the buffer
+            (checked when a new record is added). Defaults to 1.
+    """
+
+    def __init__(self, path: str | Path, batch_size: int = 100, flush_interval: float = 1.0):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.done: set[str] = set()
+        self.errors: dict[str, str] = {}
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+        self._file: IO[str] | None = None
+        self._flushed_at = time.monotonic()
+        self._partial_line = False
+        self._load()
+
+    def __repr__(self):
+        return f"<{type(self).__name__} ({self.path}, {len(self.done)} done)>"
+
+    def __enter__(self) -> "Self":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __contains__(self, url: object) -> bool:
+        return url in self.done
+
+    def __len__(self) -> int:
+        return len(self.done)
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        line = ""
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    url, error = json.loads(line)
+                except ValueError:
+                    # Last line partially written before a crash
+                    continue
+                self._apply(url, error)
+        self._partial_line = bool(line) and not line.endswith("\n")
+
+    def _apply(self, url: str, error: str | None):
+        if error is None:
+            self.done.add(url)
+            self.errors.pop(url, None)
+        elif url not in self.done:
+            self.errors[url] = error
+
+    def record(self, url: str, error: str | None = None):
+        """Record the outcome of the extraction of an URL.
+
+        Args:
+            url (str): URL processed
+            error (str, optional): error raised by the extraction, if it failed. Defaults to None.
+        """
+        with self._lock:
+            self._apply(url, error)
+            self._buffer.append(json.dumps([url, error]) + "\n")
+            if (
+                len(self._buffer) >= self.batch_size
+                or time.monotonic() - self._flushed_at >= self.flush_interval
+            ):
+                self._flush()
+
+    def flush(self):
+        """Write the buffered records to the disk."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        self._flushed_at = time.monotonic()
+        if not self._buffer:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Kept open until close(), the records being appended by batches
+            self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+            if self._partial_line:
+                self._file.write("\n")
+        self._file.write("".join(self._buffer))
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self):
+        """Write the buffered records and close the log."""
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
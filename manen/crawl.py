@@ -0,0 +1,281 @@
+"""
+Crawl runner extracting a :py:class:`~manen.page_object_model.component.Page` from many URLs,
+with a pool of processes each owning its own browser.
+
+The URLs are consumed lazily from any iterable (a list, a generator reading a file, or a queue
+with ``iter(url_queue.get, None)``...), and only a bounded number of them are sent to the workers
+at once. Each result is written to a JSON Lines file as soon as it is available, with the URL,
+the data extracted with :py:meth:`~manen.page_object_model.component.Component.model_dump`, the
+error if the extraction failed, the worker and the duration.
+
+.. code-block:: python
+
+    >>> from manen.crawl import CrawlRunner
+    >>> runner = CrawlRunner(BookPage, workers=4, headless_mode=HeadlessMode.NEW)
+    >>> stats = runner.run(book_urls, "books.jsonl")
+    >>> stats.completed, stats.failed
+    (998, 2)
+    >>> [worker.throughput for worker in stats.workers.values()]
+    [1.92, 1.88, 1.95, 1.90]
+
+The crawl stops gracefully on ``SIGINT`` or ``SIGTERM`` (or when :py:meth:`CrawlRunner.stop` is
+called): no new URL is sent to the workers, the pages being extracted are written, and the
+browsers are quit.
+
+When the browser of a worker (or its driver) crashes, the URL being extracted is recorded as an
+error, and the worker starts a new browser before extracting the next URL.
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import ExitStack, suppress
+from dataclasses import dataclass, field
+from functools import partial
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import IO, Any
+
+from selenium.common.exceptions import InvalidSessionIdException
+from selenium.webdriver.remote.webdriver import WebDriver
+from urllib3.exceptions import MaxRetryError
+
+from manen.browser import ChromeBrowser
+from manen.checkpoint import Checkpoint
+from manen.page_object_model.component import Page
+
+__all__ = ("CrawlRunner", "CrawlStats", "WorkerStats")
+
+#: Errors meaning that the browser of a worker is lost (crashed browser or driver)
+SESSION_LOST_ERRORS = (InvalidSessionIdException, ConnectionError, MaxRetryError)
+
+_driver: WebDriver | None = None
+_factory: Callable[[], WebDriver] | None = None
+
+
+def _quit_driver():
+    global _driver
+    if _driver is not None:
+        with suppress(Exception):
+            _driver.quit()
+        _driver = None
+
+
+def _init_worker(factory: Callable[[], WebDriver]):
+    global _driver, _factory
+    # The interruptions are handled by the main process, which stops the crawl gracefully
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _factory = factory
+    _driver = factory()
+    Finalize(None, _quit_driver, exitpriority=10)
+
+
+def _extract(page_class: type[Page], with_js: bool, url: str) -> dict[str, Any]:
+    global _driver
+    assert _factory is not None
+    start = time.perf_counter()
+    record: dict[str, Any] = {"url": url, "data": None, "error": None}
+    try:
+        if _driver is None:
+            _driver = _factory()
+        _driver.get(url)
+        record["data"] = page_class(_driver).model_dump(with_js=with_js)
+    except Exception as error:  # noqa: BLE001
+        # The error is recorded with the URL, and the crawl goes on
+        record["error"] = f"{type(error).__name__}: {error}"
+        if isinstance(error, SESSION_LOST_ERRORS):
+            # A new browser is started before the next URL
+            _quit_driver()
+    record["worker"] = os.getpid()
+    record["duration"] = time.perf_counter() - start
+    return record
+
+
+@dataclass
+class WorkerStats:
+    """Statistics of one worker of a crawl."""
+
+    pid: int
+    pages: int = 0
+    errors: int = 0
+    busy_time: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Number of pages extracted per second since the start of the crawl."""
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Share of the time spent extracting pages (between 0 and 1)."""
+        return self.busy_time / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class CrawlStats:
+    """Statistics of a crawl."""
+
+    submitted: int = 0
+    skipped: int = 0
+    completed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    interrupted: bool = False
+    workers: dict[int, WorkerStats] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Number of pages extracted per second."""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+
+class CrawlRunner:
+    """
+    Runner extracting a page class from many URLs with a pool of processes, each one owning a
+    browser created when the process starts, and quit when it exits.
+
+    Args:
+        page_class (type[Page]): class describing the pages; it must be importable by the
+            workers (defined at the top level of a module)
+        workers (int, optional): number of processes. Defaults to 4.
+        max_in_flight (int, optional): maximum number of URLs sent to the workers and not
+            written yet. Defaults to twice the number of workers.
+        factory (Callable[[], WebDriver], optional): picklable function creating the browser of
+            a worker. Defaults to :py:meth:`~manen.browser.ChromeBrowser.initialize`, called with
+            ``**kwargs``.
+        with_js (bool, optional): whether the pages are extracted with one JavaScript execution
+            (see :py:meth:`~manen.page_object_model.component.Component.model_dump`). Defaults
+            to False.
+        **kwargs: keyword arguments sent to :py:meth:`~manen.browser.ChromeBrowser.initialize`
+    """
+
+    def __init__(
+        self,
+        page_class: type[Page],
+        *,
+        workers: int = 4,
+        max_in_flight: int | None = None,
+        factory: Callable[[], WebDriver] | None = None,
+        with_js: bool = False,
+        **kwargs,
+    ):
+        if workers < 1:
+            raise ValueError("The number of workers should be at least 1.")
+        if factory and kwargs:
+            raise ValueError("You cannot specify both `factory` and `ChromeBrowser` parameters.")
+        self.page_class = page_class
+        self.workers = workers
+        self.max_in_flight = max(max_in_flight or 2 * workers, 1)
+        self.factory = factory or partial(ChromeBrowser.initialize, **kwargs)
+        self.with_js = with_js
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Stop the crawl gracefully: no new URL is sent to the workers, and the running
+        extractions are written before :py:meth:`run` returns."""
+        self._stop.set()
+
+    def _handle_signals(self, stack: ExitStack):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous = signal.signal(signum, lambda *_: self.stop())
+            stack.callback(signal.signal, signum, previous)
+
+    def run(
+        self,
+        urls: Iterable[str],
+        output: str | Path | IO[str],
+        checkpoint: Checkpoint | None = None,
+    ) -> CrawlStats:
+        """Extract the pages of URLs, and write the results to a JSON Lines file as soon as they
+        are available (in the order of completion).
+
+        Each line is an object with the keys ``url``, ``data`` (result of
+        :py:meth:`~manen.page_object_model.component.Component.model_dump`, or ``null`` if the
+        extraction failed), ``error`` (type and message of the exception, or ``null``),
+        ``worker`` (process ID) and ``duration`` (in seconds).
+
+        With a checkpoint, the URLs already done are skipped, the outcome of each extraction is
+        recorded once its result is written, and the results are appended to the output file, so
+        that an interrupted crawl can be resumed by running it again. As the checkpoint is
+        written by batches, the last pages extracted before a crash may be extracted twice.
+
+        Args:
+            urls (Iterable[str]): URLs of the pages, consumed lazily
+            output (str | Path | IO[str]): path of the file to write (replaced if it exists,
+                unless there is a checkpoint), or text file object
+            checkpoint (Checkpoint, optional): checkpoint of the crawl. Defaults to None.
+
+        Returns:
+            CrawlStats: statistics of the crawl
+        """
+        self._stop.clear()
+        stats = CrawlStats()
+        start = time.monotonic()
+        urls = iter(urls)
+        with ExitStack() as stack:
+            self._handle_signals(stack)
+            if isinstance(output, (str, Path)):
+                mode = "w" if checkpoint is None else "a"
+                file = stack.enter_context(open(output, mode, encoding="utf-8"))
+            else:
+                file = output
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    self.workers, initializer=_init_worker, initargs=(self.factory,)
+                )
+            )
+            extract = partial(_extract, self.page_class, self.with_js)
+            in_flight: set[Future] = set()
+            exhausted = False
+            while True:
+                while (
+                    not exhausted
+                    and not self._stop.is_set()
+                    and len(in_flight) < self.max_in_flight
+                ):
+                    url = next(urls, None)
+                    if url is None:
+                        exhausted = True
+                        break
+                    if checkpoint is not None and url in checkpoint:
+                        stats.skipped += 1
+                        continue
+                    in_flight.add(executor.submit(extract, url))
+                    stats.submitted += 1
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
+                records = [future.result() for future in done]
+                for record in records:
+                    file.write(json.dumps(record, default=str) + "\n")
+                    self._count(stats, record)
+                file.flush()
+                # The results are written before being recorded in the checkpoint
+                if checkpoint is not None:
+                    for record in records:
+                        checkpoint.record(record["url"], record["error"])
+            stats.interrupted = self._stop.is_set() and not exhausted
+            if checkpoint is not None:
+                checkpoint.flush()
+        stats.elapsed = time.monotonic() - start
+        for worker in stats.workers.values():
+            worker.elapsed = stats.elapsed
+        return stats
+
+    @staticmethod
+    def _count(stats: CrawlStats, record: dict[str, Any]):
+        worker = stats.workers.setdefault(record["worker"], WorkerStats(record["worker"]))
+        worker.busy_time += record["duration"]
+        if record["error"] is None:
+            worker.pages += 1
+            stats.completed += 1
+        else:
+            worker.errors += 1
+            stats.failed += 1
@@ -0,0 +1,172 @@
+"""
+Streaming exporters writing rows to JSON Lines or CSV files as they are produced, typically the
+components of a ``list[Component]`` field dumped one by one by
+:py:meth:`~manen.page_object_model.component.Component.model_iter`. Nothing is accumulated, so
+the memory used doesn't depend on the number of rows.
+
+.. code-block:: python
+
+    >>> from manen.export import write_csv
+    >>> page = CataloguePage(browser)
+    >>> write_csv(
+    ...     page.model_iter("books", with_js=True),
+    ...     "books.csv",
+    ...     columns={"title": "title", "author": "author.name", "first_tag": "tags.0"},
+    ... )
+    1000
+
+The nested components are flattened into columns named by their path, the keys being joined
+with dots (``author.name``). By default, the columns are the paths of all the values of the
+first row; ``columns`` selects (and orders) them, either as a list of paths or as a mapping of
+column names to paths. An integer in a path selects an item of a list (``tags.0``); the paths
+that don't exist in a row give empty values. In a CSV file, the lists and the values which are
+not flattened are written as JSON.
+"""
+
+import csv
+import json
+from collections.abc import Iterable, Mapping, Sequence
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, Any
+
+__all__ = ("flatten", "get_path", "write_csv", "write_ndjson")
+
+Columns = Sequence[str] | Mapping[str, str]
+
+
+def get_path(row: Mapping[str, Any], path: str, separator: str = ".") -> Any:
+    """Get a nested value of a row.
+
+    Args:
+        row (Mapping[str, Any]): dumped component
+        path (str): keys (or list indices) separated by ``separator``
+        separator (str, optional): separator of the keys. Defaults to ``"."``.
+
+    Returns:
+        Any: the value, or ``None`` if the path doesn't exist in the row
+    """
+    value: Any = row
+    for key in path.split(separator):
+        if isinstance(value, Mapping):
+            value = value.get(key)
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return None
+    return value
+
+
+def _flatten(row: Mapping[str, Any], prefix: str, separator: str):
+    for key, value in row.items():
+        if isinstance(value, Mapping):
+            yield from _flatten(value, f"{prefix}{key}{separator}", separator)
+        else:
+            yield f"{prefix}{key}", value
+
+
+def flatten(
+    row: Mapping[str, Any],
+    columns: Columns | None = None,
+    separator: str = ".",
+) -> dict[str, Any]:
+    """Flatten the nested components of a row into columns.
+
+    Args:
+        row (Mapping[str, Any]): dumped component
+        columns (Columns, optional): paths of the columns, or mapping of the column names to
+            their paths. Defaults to the paths of all the nested values.
+        separator (str, optional): separator of the keys in the paths. Defaults to ``"."``.
+
+    Returns:
+        dict[str, Any]: values of the row by column
+    """
+    if columns is None:
+        return dict(_flatten(row, "", separator))
+    if not isinstance(columns, Mapping):
+        columns = {path: path for path in columns}
+    return {name: get_path(row, path, separator) for name, path in columns.items()}
+
+
+def _open(stack: ExitStack, output: str | Path | IO[str], **kwargs) -> IO[str]:
+    if isinstance(output, (str, Path)):
+        return stack.enter_context(open(output, "w", encoding="utf-8", **kwargs))
+    return output
+
+
+def write_ndjson(
+    rows: Iterable[Mapping[str, Any]],
+    output: str | Path | IO[str],
+    columns: Columns | None = None,
+    separator: str = ".",
+) -> int:
+    """Write rows to a JSON Lines file, one object per line, as they are produced.
+
+    Args:
+        rows (Iterable[Mapping[str, Any]]): rows to write, consumed lazily
+        output (str | Path | IO[str]): path of the file to write (replaced if it exists), or
+            text file object
+        columns (Columns, optional): columns of the flattened rows (see :py:func:`flatten`).
+            Defaults to None, the rows being written nested.
+        separator (str, optional): separator of the keys in the paths. Defaults to ``"."``.
+
+    Returns:
+        int: number of rows written
+    """
+    count = 0
+    with ExitStack() as stack:
+        file = _open(stack, output)
+        for row in rows:
+            if columns is not None:
+                row = flatten(row, columns, separator)
+            file.write(json.dumps(row, default=str) + "\n")
+            count += 1
+    return count
+
+
+def _cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (list, Mapping)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def write_csv(
+    rows: Iterable[Mapping[str, Any]],
+    output: str | Path | IO[str],
+    columns: Columns | None = None,
+    separator: str = ".",
+    **fmtparams,
+) -> int:
+    """Write rows to a CSV file, with a header, as they are produced. The nested components
+    are flattened (see :py:func:`flatten`).
+
+    Args:
+        rows (Iterable[Mapping[str, Any]]): rows to write, consumed lazily
+        output (str | Path | IO[str]): path of the file to write (replaced if it exists), or
+            text file object opened with ``newline=""``
+        columns (Columns, optional): columns of the file. Defaults to the paths of all the
+            nested values of the first row; the values of the next rows which are not in these
+            columns are ignored.
+        separator (str, optional): separator of the keys in the paths. Defaults to ``"."``.
+        **fmtparams: formatting parameters sent to :py:func:`csv.writer`
+
+    Returns:
+        int: number of rows written
+    """
+    count = 0
+    with ExitStack() as stack:
+        file = _open(stack, output, newline="")
+        writer = None
+        if columns is not None:
+            writer = csv.DictWriter(file, list(columns), **fmtparams)
+            writer.writeheader()
+        for row in rows:
+            flat = flatten(row, columns, separator)
+            if writer is None:
+                writer = csv.DictWriter(file, list(flat), extrasaction="ignore", **fmtparams)
+                writer.writeheader()
+            writer.writerow({name: _cell(value) for name, value in flat.items()})
+            count += 1
+    return count
@@ -3,15 +3,21 @@ Flexible and highly customizable function to find one or several elements inside
 Selenium elements.
 """
 
-from functools import partial
-from typing import Any, Literal, overload
-
-from selenium.common.exceptions import NoSuchElementException
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import lru_cache, partial
+from time import time
+from typing import Any, Literal, NamedTuple, overload
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from manen.exceptions import ElementNotFound, PollTimeoutException
-from manen.helpers import poll
+from manen.helpers import apoll, poll
+from manen.instrumentation import instrumented_find, record
+from manen.javascript import MATCH_SELECTORS_SCRIPT, WAIT_FOR_ELEMENTS_SCRIPT
 from manen.typing import DriverOrElement, WebElement
 
 METHODS_MAPPER = {
@@ -30,42 +36,191 @@ METHODS_MAPPER = {
     "xp": By.XPATH,
     "xpath": By.XPATH,
 }
+PREFIXES = {
+    By.CLASS_NAME: "class",
+    By.CSS_SELECTOR: "css",
+    By.ID: "id",
+    By.LINK_TEXT: "link",
+    By.NAME: "name",
+    By.PARTIAL_LINK_TEXT: "plink",
+    By.TAG_NAME: "tag",
+    By.XPATH: "xpath",
+}
+
+
+class Selector(NamedTuple):
+    """Selector already parsed, in the format expected by Selenium (a selection method and a
+    selector). It can be used anywhere a selector string is accepted, avoiding to parse the same
+    string again and again.
+
+    Example::
+
+        >>> Selector(By.CSS_SELECTOR, "h1.title")
+        Selector(by='css selector', value='h1.title')
+        >>> find(Selector(By.XPATH, "//h1"), inside=driver)
+        <selenium.webdriver.remote.webelement.WebElement (session: "1", element: "a1")>
+    """
+
+    by: str
+    value: str
+
+    def __str__(self):
+        """Selector string parsed back to the same selector (e.g. ``css:h1.title``)."""
+        return f"{PREFIXES.get(self.by, self.by)}:{self.value}"
+
 
+@lru_cache(maxsize=1024)
+def _parse_selector_string(selector: str) -> Selector:
+    selection_method, separator, sel = selector.partition(":")
+    if separator and selection_method in METHODS_MAPPER:
+        return Selector(METHODS_MAPPER[selection_method], sel)
+    if selector.startswith(("/", "./")):
+        return Selector(By.XPATH, selector)
+    return Selector(By.CSS_SELECTOR, selector)
 
-def parse_selector(selector: str) -> tuple[str, str]:
+
+def parse_selector(selector: str | Selector) -> Selector:
     """Parse a selector string in the format
     ``{selection_method}:{selector}``. If no selection method is specified,
     it will be inferred from the selector itself, by using the following rule:
     if ``selector`` starts with ``/`` or ``./`` then it is a XPath selector,
     otherwise, it is a CSS selector.
 
+    The parsed selectors are cached, and a :py:class:`Selector` is returned as is.
+
     .. warning:: :py:mod:`~manen` will only try to guess if this is a XPath
         or CSS selectors, no more.
 
     Example::
 
         >>> parse_selector('css:h1.title')
-        ('css selector', 'h1.title')
+        Selector(by='css selector', value='h1.title')
         >>> parse_selector('a')
-        ('css selector', 'a')
+        Selector(by='css selector', value='a')
         >>> parse_selector('tag:span')
-        ('tag name', 'span')
+        Selector(by='tag name', value='span')
         >>> parse_selector('/div/p/span[@class="r"]')
-        ('xpath', '/div/p/span[@class="r"]')
+        Selector(by='xpath', value='/div/p/span[@class="r"]')
 
     Args:
-        selector (str): selector in the format ``{selection_method}:{selector}``
+        selector (str | Selector): selector in the format ``{selection_method}:{selector}``
 
     Returns:
-        Tuple[str, str]: Selenium selector in the format
-        ``(selection_method, selector)``
+        Selector: Selenium selector in the format ``(selection_method, selector)``
     """
-    if any(selector.startswith(f"{method}:") for method in METHODS_MAPPER):
-        selection_method, sel = selector.split(":", 1)
-        return METHODS_MAPPER[selection_method], sel
-    if selector.startswith("/") or selector.startswith("./"):
-        return By.XPATH, selector
-    return By.CSS_SELECTOR, selector
+    if isinstance(selector, Selector):
+        return selector
+    return _parse_selector_string(selector)
+
+
+class SelectorMatch(NamedTuple):
+    """Element(s) found by :py:func:`match_selectors`, with the selector which matched them."""
+
+    selector: Selector
+    elements: WebElement | list[WebElement]
+
+
+def match_selectors(
+    selectors: list[str | Selector],
+    *,
+    inside: DriverOrElement,
+    many: bool = False,
+) -> SelectorMatch | None:
+    """Evaluate an ordered list of selectors (of any selection method) inside the browser, with
+    one single WebDriver command, and return the element(s) matching the first selector with at
+    least one match. It is equivalent to trying each selector one after the other with
+    ``find_element`` or ``find_elements``, which would require one WebDriver command per
+    selector.
+
+    Example::
+
+        >>> match_selectors(["div.tryClass1", "xpath://div[@class='tryClass2']"], inside=driver)
+        SelectorMatch(selector=Selector(by='xpath', value="//div[@class='tryClass2']"),
+                      elements=<selenium.webdriver.remote.webelement.WebElement (...)>)
+
+    Args:
+        selectors (list[str | Selector]): selectors to try, in order
+        inside (DriverOrElement): where to find the element(s)
+        many (bool, optional): whether to return a single element or all the elements matching
+            the selector. Defaults to False.
+
+    Returns:
+        SelectorMatch | None: the selector which matched with the element(s) found, or ``None``
+        if no selector matched
+    """
+    parsed_selectors = [parse_selector(selector) for selector in selectors]
+    driver = inside if isinstance(inside, WebDriver) else inside.parent
+    match = driver.execute_script(
+        MATCH_SELECTORS_SCRIPT,
+        inside if isinstance(inside, WebElement) else None,
+        parsed_selectors,
+        many,
+    )
+    if match is None:
+        return None
+    index, elements = match
+    return SelectorMatch(parsed_selectors[index], elements if many else elements[0])
+
+
+def _shared_driver(scopes: list[DriverOrElement]) -> WebDriver | None:
+    drivers = [
+        scope if isinstance(scope, WebDriver) else getattr(scope, "parent", None)
+        for scope in scopes
+    ]
+    driver = drivers[0] if drivers else None
+    if isinstance(driver, WebDriver) and all(item is driver for item in drivers):
+        return driver
+    return None
+
+
+def wait_in_browser(
+    inside: DriverOrElement | list[DriverOrElement],
+    selectors: list[Selector],
+    many: bool,
+    timeout: float,
+) -> Any:
+    """Wait, inside the browser, for an element matching one of the selectors to appear. A
+    `MutationObserver <https://developer.mozilla.org/docs/Web/API/MutationObserver>`_ is
+    installed in the page with an asynchronous script, so that the elements are returned as soon
+    as the DOM is updated, with one single WebDriver command.
+
+    As the asynchronous script holds the WebDriver session, several scopes of the same browser
+    are waited for together, with one script: it returns once all the scopes have a match, or
+    after the timeout.
+
+    Args:
+        inside (DriverOrElement | list[DriverOrElement]): where to find the element(s); the
+            scopes of a list should belong to the same browser
+        selectors (list[Selector]): selectors to try, in order
+        many (bool): whether to return a single element or all the elements matching the
+            first selector with a match
+        timeout (float): maximum number of seconds to wait
+
+    Returns:
+        WebElement | list[WebElement] | None: the element(s) found, or ``None`` if no element
+        appeared before the timeout (or a list of them, one per scope, if ``inside`` is a
+        list). ``None`` is also returned if waiting in the browser is not possible (no
+        JavaScript support, script timeout of the driver reached, scopes of several
+        browsers...)
+    """
+    scopes = inside if isinstance(inside, list) else [inside]
+    driver = _shared_driver(scopes)
+    if driver is None:
+        return None
+    try:
+        results = driver.execute_async_script(
+            WAIT_FOR_ELEMENTS_SCRIPT,
+            [scope if isinstance(scope, WebElement) else None for scope in scopes],
+            selectors,
+            many,
+            int(timeout * 1000),
+        )
+    except WebDriverException:
+        return None
+    if not isinstance(results, list) or len(results) != len(scopes):
+        return None
+    found = [(elements if many else elements[0]) if elements else None for elements in results]
+    return found if isinstance(inside, list) else found[0]
 
 
 @overload
@@ -76,60 +231,73 @@ def find(
     many: bool = False,
     default: Any = NotImplemented,
     wait: int = 0,
+    max_workers: int | None = None,
+    with_js: bool = False,
 ) -> partial: ...
 
 
 @overload
 def find(
-    selector: str | list[str],
+    selector: str | Selector | list[str | Selector],
     *,
     inside: DriverOrElement,
     many: Literal[False] = False,
     default: Any = NotImplemented,
     wait: int = 0,
+    max_workers: int | None = None,
+    with_js: bool = False,
 ) -> WebElement: ...
 
 
 @overload
 def find(
-    selector: str | list[str],
+    selector: str | Selector | list[str | Selector],
     *,
     inside: DriverOrElement,
     many: Literal[True] = True,
     default: Any = NotImplemented,
     wait: int = 0,
+    max_workers: int | None = None,
+    with_js: bool = False,
 ) -> list[WebElement]: ...
 
 
 @overload
 def find(
-    selector: str | list[str],
+    selector: str | Selector | list[str | Selector],
     *,
     inside: list[DriverOrElement],
     many: Literal[False] = False,
     default: Any = NotImplemented,
     wait: int = 0,
+    max_workers: int | None = None,
+    with_js: bool = False,
 ) -> list[WebElement]: ...
 
 
 @overload
 def find(
-    selector: str | list[str],
+    selector: str | Selector | list[str | Selector],
     *,
     inside: list[DriverOrElement],
     many: Literal[True] = True,
     default: Any = NotImplemented,
     wait: int = 0,
+    max_workers: int | None = None,
+    with_js: bool = False,
 ) -> list[list[WebElement]]: ...
 
 
+@instrumented_find
 def find(
-    selector: str | list[str] | None = None,
+    selector: str | Selector | list[str | Selector] | None = None,
     *,
     inside: DriverOrElement | list["DriverOrElement"] | None = None,
     many: bool = False,
     default: Any = NotImplemented,
     wait: int = 0,
+    max_workers: int | None = None,
+    with_js: bool = False,
 ):
     """Retrieve DOM elements from Selenium WebElements matching selector.
     The function is highly customizable in order to match the different
@@ -195,14 +363,15 @@ def find(
 
 
     Args:
-        selector (str or List[str], optional): Selectors to be used to find the
-            element(s). If it is a list, it will try each selector until at
-            least one element is found. If it is ``None``, it returns a partial
-            function which can be used later to find the elements. Defaults to
-            ``None``.
+        selector (str, Selector or List[str | Selector], optional): Selectors to be used to
+            find the element(s) (see :py:func:`parse_selector` and :py:class:`Selector`). If it
+            is a list, it will try each selector until at least one element is found. If it is
+            ``None``, it returns a partial function which can be used later to find the
+            elements. Defaults to ``None``.
         wait (int, optional): If ``wait`` > 0 and no element is currently found,
-            the function will retry every 500ms, for ``wait`` seconds maximum.
-            Defaults to 0.
+            the function will wait for ``wait`` seconds maximum that an element appears. The
+            waiting is done inside the browser (see :py:func:`wait_in_browser`) when possible,
+            otherwise the function will retry every 500ms. Defaults to 0.
         default (Any, optional): default value to return if no element is found.
             Specifying this value will prevent the function to raise
             :py:exc:`manen.exceptions.ElementNotFound` if no element matching
@@ -215,6 +384,14 @@ def find(
             ``None``.
         many (bool, optional): Whether to return a single element or all the
             elements matching the selectors. Defaults to ``False``.
+        max_workers (int, optional): If ``inside`` is a list, number of scopes in which the
+            elements are searched concurrently (in threads). The order of the outputs is
+            preserved, and ``wait`` is then a deadline shared by all the scopes instead of a
+            timeout for each scope. If ``None``, the scopes are searched one after the other.
+            Defaults to ``None``.
+        with_js (bool, optional): If several selectors are specified, evaluate all of them in
+            the browser with one WebDriver command (see :py:func:`match_selectors`) instead of
+            one command per selector. Defaults to ``False``.
 
     Raises:
         ValueError: raised if the function is called with ``selector`` but
@@ -241,43 +418,186 @@ def find(
         +--------------------+---------------------+-----------+------------------------------------------------+
     """
     if selector is None:
-        return partial(find, wait=wait, default=default, inside=inside, many=many)
+        return partial(
+            find,
+            wait=wait,
+            default=default,
+            inside=inside,
+            many=many,
+            max_workers=max_workers,
+            with_js=with_js,
+        )
 
     if inside is None:
         raise ValueError("You must specify `inside` if you specify `selector`")
 
+    if isinstance(inside, list) and wait and _shared_driver(inside) is not None:
+        # One wait inside the browser for all the scopes: a wait per scope would hold the
+        # WebDriver session in turn, and take up to ``wait`` seconds for each of them
+        selectors = selector if isinstance(selector, list) else [selector]
+        found = wait_in_browser(
+            inside, [parse_selector(item) for item in selectors], many=many, timeout=wait
+        )
+        if found is not None:
+            # The wait is over for the scopes without a match: a last lookup returns the default
+            # value or raises an error
+            return [
+                find(selector, inside=scope, default=default, many=many, with_js=with_js)  # type: ignore
+                if elements is None
+                else elements
+                for scope, elements in zip(inside, found)
+            ]
+
+    if isinstance(inside, list) and max_workers:
+        deadline = time() + wait
+
+        def find_before_deadline(element):
+            remaining = max(deadline - time(), 0) if wait else 0
+            return find(
+                selector,  # type: ignore
+                inside=element,
+                default=default,
+                wait=remaining,
+                many=many,
+                with_js=with_js,
+            )
+
+        contexts = [copy_context() for _ in inside]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda context, element: context.run(find_before_deadline, element),
+                    contexts,
+                    inside,
+                )
+            )
+
     if isinstance(inside, list):
         return [
-            find(selector, inside=element, default=default, wait=wait, many=many)  # type: ignore
+            find(
+                selector,  # type: ignore
+                inside=element,
+                default=default,
+                wait=wait,
+                many=many,
+                with_js=with_js,
+            )
             for element in inside
         ]
 
     selectors = [selector] if not isinstance(selector, list) else selector
+    parsed_selectors = [parse_selector(selector) for selector in selectors]
     finder = inside.find_elements if many else inside.find_element
 
     def try_several_selectors(selectors, fn_find):
-        for selector in selectors:
-            selenium_selector = parse_selector(selector)
+        if with_js and len(selectors) > 1:
+            match = match_selectors(selectors, inside=inside, many=many)  # type: ignore
+            if match and match.selector != selectors[0]:
+                record("fallback_hits")
+            return match.elements if match else None
+        for index, selenium_selector in enumerate(selectors):
             try:
                 elements = fn_find(*selenium_selector)
             except NoSuchElementException:
                 elements = None
             if elements:
+                if index:
+                    record("fallback_hits")
                 return elements
         return None
 
+    def poll_selectors(selectors, fn_find):
+        record("polls")
+        return try_several_selectors(selectors, fn_find)
+
+    if wait:
+        deadline = time() + wait
+        found_elements = try_several_selectors(parsed_selectors, finder)
+        if not found_elements:
+            found_elements = wait_in_browser(
+                inside, parsed_selectors, many=many, timeout=max(deadline - time(), 0)
+            )
+        if not found_elements:
+            try:
+                found_elements = poll(
+                    poll_selectors,
+                    args=(parsed_selectors, finder),
+                    step=0.5,
+                    timeout=max(deadline - time(), 0),
+                )
+            except PollTimeoutException:
+                found_elements = None
+    else:
+        found_elements = try_several_selectors(parsed_selectors, finder)
+
+    if found_elements:
+        return found_elements
+
+    if default != NotImplemented:
+        record("defaults")
+        return default
+
+    driver = inside if isinstance(inside, WebDriver) else inside.parent
+    raise ElementNotFound(selectors=selectors, driver=driver)
+
+
+async def afind(
+    selector: str | Selector | list[str | Selector] | None = None,
+    *,
+    inside: DriverOrElement | list["DriverOrElement"] | None = None,
+    many: bool = False,
+    default: Any = NotImplemented,
+    wait: int = 0,
+):
+    """Asynchronous version of :py:func:`find`, with the same arguments and outputs.
+
+    The blocking Selenium calls are run in the default executor of the event loop, and the
+    waiting between two attempts doesn't block the event loop, so that a single event loop can
+    drive several browsers concurrently. If ``inside`` is a list, the lookups in each scope are
+    run concurrently.
+
+    .. tip::
+
+        The number of concurrent Selenium calls is limited by the size of the default executor
+        of the event loop. It can be changed with
+        :py:meth:`~asyncio.loop.set_default_executor`.
+
+    Example::
+
+        >>> await asyncio.gather(
+        ...     afind("h1", inside=driver_1, wait=5),
+        ...     afind("h1", inside=driver_2, wait=5),
+        ... )
+        [<selenium.webdriver.remote.webelement.WebElement (session: "1", element: "a1")>,
+         <selenium.webdriver.remote.webelement.WebElement (session: "2", element: "b1")>]
+    """
+    if selector is None:
+        return partial(afind, wait=wait, default=default, inside=inside, many=many)
+
+    if inside is None:
+        raise ValueError("You must specify `inside` if you specify `selector`")
+
+    if isinstance(inside, list):
+        return list(
+            await asyncio.gather(
+                *(
+                    afind(selector, inside=element, default=default, wait=wait, many=many)
+                    for element in inside
+                )
+            )
+        )
+
+    lookup = partial(find, selector, inside=inside, many=many, default=None, wait=0)
+
     if wait:
         try:
-            found_elements = poll(
-                try_several_selectors,
-                args=(selectors, finder),
-                step=0.5,
-                timeout=wait,
+            found_elements = await apoll(
+                asyncio.to_thread, args=(lookup,), step=0.5, timeout=wait
             )
         except PollTimeoutException:
             found_elements = None
     else:
-        found_elements = try_several_selectors(selectors, finder)
+        found_elements = await asyncio.to_thread(lookup)
 
     if found_elements:
         return found_elements
@@ -285,5 +605,6 @@ def find(
     if default != NotImplemented:
         return default
 
+    selectors = [selector] if not isinstance(selector, list) else selector
     driver = inside if isinstance(inside, WebDriver) else inside.parent
-    raise ElementNotFound(selectors=selectors, driver=driver)
+    raise await asyncio.to_thread(ElementNotFound, selectors=selectors, driver=driver)
@@ -1,9 +1,12 @@
+import asyncio
+import inspect
 import platform
 import re
 from time import sleep, time
 from typing import TYPE_CHECKING, Any, Callable
 
 from manen.exceptions import PollTimeoutException
+from manen.javascript import READY_STATE_SCRIPT
 
 if TYPE_CHECKING:
     from .typing import Version
@@ -77,3 +80,52 @@ def poll(
             return ans
         sleep(step)
     raise PollTimeoutException(f"Timeout after {timeout} seconds")
+
+
+def wait_until_loaded(driver, timeout: float = 30) -> bool:
+    """Wait until the current page of a driver is loaded (its ``document.readyState`` is
+    ``complete``), for instance after a navigation started without waiting for the page.
+
+    Args:
+        driver (WebDriver): driver displaying the page
+        timeout (float, optional): maximum number of seconds to wait. Defaults to 30.
+
+    Returns:
+        bool: whether the page has been loaded before the timeout
+    """
+    try:
+        poll(
+            driver.execute_script,
+            args=(READY_STATE_SCRIPT,),
+            timeout=timeout,
+            step=0.1,
+            evaluate_success=lambda state: state == "complete",
+        )
+    except PollTimeoutException:
+        return False
+    return True
+
+
+async def apoll(
+    fn,
+    args: tuple[Any, ...] | None = None,
+    kwargs: dict[str, Any] | None = None,
+    timeout: float = 10,
+    step: float = 0.5,
+    evaluate_success: Callable = lambda x: x is not None,
+):
+    """Asynchronous version of :py:func:`poll`, waiting between two attempts without blocking the
+    event loop. ``fn`` can be a coroutine function or a regular function (note that a regular
+    function is called in the event loop thread, so it should not block).
+    """
+    args = args or ()
+    kwargs = kwargs or {}
+    end_time = time() + timeout
+    while time() < end_time:
+        ans = fn(*args, **kwargs)
+        if inspect.isawaitable(ans):
+            ans = await ans
+        if evaluate_success(ans):
+            return ans
+        await asyncio.sleep(step)
+    raise PollTimeoutException(f"Timeout after {timeout} seconds")
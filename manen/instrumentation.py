@@ -0,0 +1,309 @@
+"""
+Instrumentation of :py:mod:`manen`, to know which fields of the page objects and which calls to
+:py:func:`~manen.finder.find` are slow.
+
+When the instrumentation is enabled, each access to a field of a
+:py:class:`~manen.page_object_model.component.Component` and each call to
+:py:func:`~manen.finder.find` is measured: number of calls, number of WebDriver commands sent,
+wall time, number of poll iterations while waiting for an element, number of times an element was
+found with a fallback selector (any selector but the first one), and number of times the default
+value was returned. The measures of the nested calls (for instance the calls to
+:py:func:`~manen.finder.find` made to read a field) are included in the measures of the caller.
+
+The fields are identified by the qualified name of their component class and their name; the
+calls to :py:func:`~manen.finder.find` are identified by their call site (the first frame outside
+of :py:mod:`manen`).
+
+.. code-block:: python
+
+    >>> from manen.instrumentation import instrument
+    >>> with instrument() as stats:
+    ...     page.model_dump()
+    >>> stats.fields[("BooksToScrapePage", "books")]
+    CallStats(calls=1, commands=3, wall_time=0.0182, polls=0, fallback_hits=0, defaults=0)
+    >>> stats.top(2)
+    [Measurement(kind='field', key=('BooksToScrapePage', 'books'), stats=CallStats(...)),
+     Measurement(kind='field', key=('BooksToScrapePage.Book', 'title'), stats=CallStats(...))]
+
+The measures can also be exported with a callback, called with a :py:class:`Measurement` each
+time a field access or a call to :py:func:`~manen.finder.find` is over:
+
+.. code-block:: python
+
+    >>> with instrument(callback=lambda measurement: logger.info("%s", measurement)):
+    ...     page.model_dump()
+
+When the instrumentation is disabled (the default), the only overhead is a check of a global
+variable.
+"""
+
+import sys
+import threading
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields
+from functools import wraps
+from time import perf_counter
+from typing import Any, Literal, NamedTuple
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+__all__ = (
+    "CallStats",
+    "Measurement",
+    "Stats",
+    "disable",
+    "enable",
+    "instrument",
+    "is_enabled",
+)
+
+Kind = Literal["field", "find"]
+
+
+@dataclass
+class CallStats:
+    """Measures of one or several calls."""
+
+    calls: int = 0
+    commands: int = 0
+    wall_time: float = 0.0
+    polls: int = 0
+    fallback_hits: int = 0
+    defaults: int = 0
+
+    def add(self, other: "CallStats"):
+        """Add the measures of other calls to these measures."""
+        for item in fields(self):
+            setattr(self, item.name, getattr(self, item.name) + getattr(other, item.name))
+
+
+class Measurement(NamedTuple):
+    """Measures of one field access or one call to :py:func:`~manen.finder.find`, sent to the
+    callback of the instrumentation."""
+
+    kind: Kind
+    key: Any
+    stats: CallStats
+
+
+@dataclass
+class Stats:
+    """Measures aggregated since the instrumentation has been enabled.
+
+    Attributes:
+        fields (dict[tuple[str, str], CallStats]): measures by component class and field name
+        finds (dict[str, CallStats]): measures of :py:func:`~manen.finder.find` by call site
+            (``"{filename}:{line}"``)
+    """
+
+    fields: dict[tuple[str, str], CallStats] = field(default_factory=dict)
+    finds: dict[str, CallStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, measurement: Measurement):
+        """Aggregate the measures of one call."""
+        group: dict = self.fields if measurement.kind == "field" else self.finds
+        with self._lock:
+            group.setdefault(measurement.key, CallStats()).add(measurement.stats)
+
+    def top(self, n: int = 10, by: str = "wall_time") -> list[Measurement]:
+        """Fields and call sites with the highest value of a measure.
+
+        Args:
+            n (int, optional): number of items to return. Defaults to 10.
+            by (str, optional): name of the measure used to sort the items (see
+                :py:class:`CallStats`). Defaults to ``"wall_time"``.
+
+        Returns:
+            list[Measurement]: aggregated measures, sorted in descending order
+        """
+        with self._lock:
+            items = [Measurement("field", key, stats) for key, stats in self.fields.items()]
+            items += [Measurement("find", key, stats) for key, stats in self.finds.items()]
+        return sorted(items, key=lambda item: getattr(item.stats, by), reverse=True)[:n]
+
+    def as_records(self) -> list[dict[str, Any]]:
+        """Export the aggregated measures as a list of flat dictionaries (one per field or call
+        site), easy to log or to load in a dataframe."""
+        return [
+            {"kind": kind, "key": key, **vars(stats)}
+            for kind, key, stats in self.top(n=sys.maxsize, by="calls")
+        ]
+
+    def reset(self):
+        """Forget all the measures."""
+        with self._lock:
+            self.fields.clear()
+            self.finds.clear()
+
+
+class _Span:
+    __slots__ = ("key", "kind", "lock", "stats")
+
+    def __init__(self, kind: Kind, key: Any):
+        self.kind = kind
+        self.key = key
+        self.stats = CallStats(calls=1)
+        self.lock = threading.Lock()
+
+
+class _Recorder:
+    def __init__(self, stats: Stats, callback: Callable[[Measurement], Any] | None):
+        self.stats = stats
+        self.callback = callback
+
+
+_recorders: tuple[_Recorder, ...] = ()
+_recorders_lock = threading.Lock()
+_spans: ContextVar[tuple[_Span, ...]] = ContextVar("manen_instrumentation_spans", default=())
+_execute = WebDriver.execute
+
+
+def _counted_execute(self, driver_command: str, params: dict | None = None):
+    count_command()
+    return _execute(self, driver_command, params)
+
+
+def is_enabled() -> bool:
+    """Whether the instrumentation is enabled."""
+    return bool(_recorders)
+
+
+def enable(callback: Callable[[Measurement], Any] | None = None) -> Stats:
+    """Enable the instrumentation. It can be enabled several times (for instance by nested
+    :py:func:`instrument` blocks): the measures are then aggregated in each :py:class:`Stats`,
+    until it is disabled.
+
+    Args:
+        callback (Callable[[Measurement], Any], optional): function called with the measures of
+            each field access and each call to :py:func:`~manen.finder.find`, once it is over.
+            Defaults to None.
+
+    Returns:
+        Stats: object where the measures are aggregated
+    """
+    global _recorders
+    stats = Stats()
+    with _recorders_lock:
+        _recorders = (*_recorders, _Recorder(stats, callback))
+        WebDriver.execute = _counted_execute  # type: ignore[method-assign]
+    return stats
+
+
+def disable(stats: Stats | None = None):
+    """Disable the instrumentation; the WebDriver commands are no longer counted once it is
+    disabled everywhere it has been enabled.
+
+    Args:
+        stats (Stats, optional): object returned by :py:func:`enable`, whose aggregation should
+            stop. Defaults to None (the instrumentation is disabled everywhere).
+    """
+    global _recorders
+    with _recorders_lock:
+        if stats is None:
+            _recorders = ()
+        else:
+            _recorders = tuple(recorder for recorder in _recorders if recorder.stats is not stats)
+        if not _recorders:
+            WebDriver.execute = _execute  # type: ignore[method-assign]
+
+
+@contextmanager
+def instrument(callback: Callable[[Measurement], Any] | None = None):
+    """Context manager enabling the instrumentation, and disabling it on exit. The blocks can
+    be nested, or run concurrently: each one aggregates the measures made while it is open.
+
+    Args:
+        callback (Callable[[Measurement], Any], optional): see :py:func:`enable`
+
+    Yields:
+        Stats: object where the measures are aggregated
+    """
+    stats = enable(callback)
+    try:
+        yield stats
+    finally:
+        disable(stats)
+
+
+def record(measure: str, value: int = 1):
+    """Add a value to a measure of the current call (no-op if the instrumentation is disabled
+    or if there is no current call)."""
+    if not _recorders:
+        return
+    spans = _spans.get()
+    if spans:
+        span = spans[-1]
+        with span.lock:
+            setattr(span.stats, measure, getattr(span.stats, measure) + value)
+
+
+def count_command():
+    """Count a WebDriver command in the current call."""
+    record("commands")
+
+
+@contextmanager
+def _measure(recorders: tuple[_Recorder, ...], kind: Kind, key: Any):
+    span = _Span(kind, key)
+    spans = _spans.get()
+    token = _spans.set((*spans, span))
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        span.stats.wall_time = perf_counter() - start
+        _spans.reset(token)
+        if spans:
+            parent = spans[-1]
+            with parent.lock:
+                for name in ("commands", "polls", "fallback_hits", "defaults"):
+                    value = getattr(parent.stats, name) + getattr(span.stats, name)
+                    setattr(parent.stats, name, value)
+        measurement = Measurement(kind, key, span.stats)
+        for recorder in recorders:
+            recorder.stats.add(measurement)
+            if recorder.callback is not None:
+                recorder.callback(measurement)
+
+
+def _call_site() -> str:
+    frame = sys._getframe(2)
+    while frame.f_back is not None and frame.f_globals.get("__name__", "").startswith("manen."):
+        frame = frame.f_back
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+
+def instrumented_field(get: Callable) -> Callable:
+    """Decorator of the ``__get__`` method of a descriptor of a component field, measuring the
+    field accesses."""
+
+    @wraps(get)
+    def wrapper(self, component, component_class):
+        recorders = _recorders
+        if not recorders or component is None:
+            return get(self, component, component_class)
+        with _measure(recorders, "field", (component_class.__qualname__, self.config.name)):
+            return get(self, component, component_class)
+
+    return wrapper
+
+
+def instrumented_find(find: Callable) -> Callable:
+    """Decorator of :py:func:`~manen.finder.find`, measuring the calls by call site. The calls
+    made by another call (for instance for each scope of a list) are not measured separately."""
+
+    @wraps(find)
+    def wrapper(selector=None, **kwargs):
+        recorders = _recorders
+        if not recorders or selector is None:
+            return find(selector, **kwargs)
+        spans = _spans.get()
+        if spans and spans[-1].kind == "find":
+            return find(selector, **kwargs)
+        with _measure(recorders, "find", _call_site()):
+            return find(selector, **kwargs)
+
+    return wrapper
@@ -0,0 +1,508 @@
+"""
+JavaScript snippets executed inside the browser by :py:mod:`manen`. They are used to perform in a
+single WebDriver command what would otherwise require one command per element (finding elements,
+reading their text or attributes...).
+
+:py:data:`QUERY_FUNCTIONS`, :py:data:`TEXT_FUNCTIONS` and :py:data:`ATTRIBUTE_FUNCTIONS` only
+define functions; they are meant to be concatenated with a script body before being sent to
+:py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.execute_script`. The constants suffixed
+by ``_SCRIPT`` are complete scripts, each one embedding only the functions it needs, as the whole
+script is sent with every command.
+
+Attributes are read with the same JavaScript atom as
+:py:meth:`~selenium.webdriver.remote.webelement.WebElement.get_attribute`. The text of an element
+is read with a port of the ``getVisibleText`` atom of Selenium, which the drivers use to implement
+:py:attr:`~selenium.webdriver.remote.webelement.WebElement.text`: the text of hidden elements is
+excluded, blocks are separated by line breaks, whitespaces are collapsed according to the
+``white-space`` style, and non-breaking spaces are replaced by regular spaces.
+"""
+
+import pkgutil
+
+
+def _selenium_atom(filename: str) -> str:
+    data = pkgutil.get_data("selenium.webdriver.remote", filename)
+    return data.decode("utf8") if data else "null"
+
+
+QUERY_FUNCTIONS = """
+function manenQuery(scope, by, value) {
+    const root = scope.ownerDocument || scope;
+    switch (by) {
+        case "xpath": {
+            const snapshot = root.evaluate(
+                value, scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            const elements = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) {
+                const node = snapshot.snapshotItem(i);
+                if (node.nodeType === Node.ELEMENT_NODE) {
+                    elements.push(node);
+                }
+            }
+            return elements;
+        }
+        case "class name":
+            return Array.from(scope.querySelectorAll("." + CSS.escape(value)));
+        case "id":
+            return Array.from(scope.querySelectorAll("#" + CSS.escape(value)));
+        case "name":
+            return Array.from(scope.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case "link text":
+            return Array.from(scope.querySelectorAll("a")).filter(
+                (a) => manenLinkText(a) === value.trim()
+            );
+        case "partial link text":
+            return Array.from(scope.querySelectorAll("a")).filter(
+                (a) => manenLinkText(a).includes(value)
+            );
+        default:
+            return Array.from(scope.querySelectorAll(value));
+    }
+}
+
+// Same text as WebElement.text when the script embeds TEXT_FUNCTIONS
+function manenLinkText(a) {
+    return typeof manenReadText === "function" ? manenReadText(a) : a.innerText.trim();
+}
+
+function manenFind(scope, selectors, many) {
+    for (const [by, value] of selectors) {
+        const elements = manenQuery(scope, by, value);
+        if (elements.length > 0) {
+            return many ? elements : [elements[0]];
+        }
+    }
+    return null;
+}
+"""
+
+VISIBLE_TEXT_FUNCTIONS = r"""
+// Port of bot.dom.getVisibleText, the atom behind WebElement.text
+const MANEN_INLINE_DISPLAYS = [
+    "inline", "inline-block", "inline-table", "none", "table-cell", "table-column",
+    "table-column-group",
+];
+
+function manenAppendTextNode(node, lines, whitespace, textTransform) {
+    let text = node.nodeValue.replace(/[\u200b\u200e\u200f]/g, "");
+    text = text.replace(/\r\n|\r/g, "\n");
+    if (whitespace === "normal" || whitespace === "nowrap") {
+        text = text.replace(/\n/g, " ");
+    }
+    if (whitespace === "pre" || whitespace === "pre-wrap") {
+        text = text.replace(/[\u0020\f\t\v\u2028\u2029]/g, "\xa0");
+    } else {
+        text = text.replace(/[\u0020\f\t\v\u2028\u2029]+/g, " ");
+    }
+    if (textTransform === "capitalize") {
+        text = text.replace(/(^|\s)(\S)/g, (_, space, char) => space + char.toUpperCase());
+    } else if (textTransform === "uppercase") {
+        text = text.toUpperCase();
+    } else if (textTransform === "lowercase") {
+        text = text.toLowerCase();
+    }
+    const line = lines.pop() || "";
+    if (line.endsWith(" ") && text.startsWith(" ")) {
+        text = text.substring(1);
+    }
+    lines.push(line + text);
+}
+
+function manenAppendElement(element, lines) {
+    const currentLine = () => lines[lines.length - 1] || "";
+    const isBlank = (text) => /^[^\S\xa0]*$/.test(text);
+    if (element.tagName === "BR") {
+        lines.push("");
+        return;
+    }
+    const style = window.getComputedStyle(element);
+    const isCell = element.tagName === "TD";
+    const display = style.display;
+    const isBlock = !isCell && !MANEN_INLINE_DISPLAYS.includes(display);
+    const previous = element.previousElementSibling;
+    const previousDisplay = previous ? window.getComputedStyle(previous).display : "";
+    const runIntoThis = previousDisplay === "run-in" && style.cssFloat === "none";
+    if (isBlock && !runIntoThis && !isBlank(currentLine())) {
+        lines.push("");
+    }
+    // Text nodes of an hidden element are excluded, but its children may be shown
+    const shown = manenIsDisplayed(element);
+    const whitespace = shown ? style.whiteSpace : null;
+    const textTransform = shown ? style.textTransform : null;
+    for (const child of element.childNodes) {
+        if (child.nodeType === Node.TEXT_NODE && shown) {
+            manenAppendTextNode(child, lines, whitespace, textTransform);
+        } else if (child.nodeType === Node.ELEMENT_NODE) {
+            manenAppendElement(child, lines);
+        }
+    }
+    const line = currentLine();
+    // Table cells are separated by a space
+    if ((isCell || display === "table-cell") && line && !line.endsWith(" ")) {
+        lines[lines.length - 1] += " ";
+    }
+    if (isBlock && display !== "run-in" && !isBlank(line)) {
+        lines.push("");
+    }
+}
+
+function manenReadText(element) {
+    const lines = [];
+    manenAppendElement(element, lines);
+    const trim = (text) => text.replace(/^[^\S\xa0]+|[^\S\xa0]+$/g, "");
+    return trim(lines.map(trim).join("\n")).replace(/\xa0/g, " ");
+}
+"""
+
+TEXT_FUNCTIONS = (
+    "const manenIsDisplayed = ("
+    + _selenium_atom("isDisplayed.js")
+    + ");\n"
+    + VISIBLE_TEXT_FUNCTIONS
+)
+
+ATTRIBUTE_FUNCTIONS = (
+    "const manenGetAttribute = ("
+    + _selenium_atom("getAttribute.js")
+    + """);
+
+function manenReadAttribute(element, name) {
+    return manenGetAttribute(element, name);
+}
+"""
+)
+
+READ_TEXTS_SCRIPT = (
+    QUERY_FUNCTIONS
+    + TEXT_FUNCTIONS
+    + """
+const [scopes, selectors, many] = arguments;
+return scopes.map((scope) => {
+    const elements = manenFind(scope || document, selectors, many);
+    return elements === null ? null : elements.map(manenReadText);
+});
+"""
+)
+
+READ_ATTRIBUTES_SCRIPT = (
+    QUERY_FUNCTIONS
+    + ATTRIBUTE_FUNCTIONS
+    + """
+const [scopes, selectors, many, attribute] = arguments;
+return scopes.map((scope) => {
+    const elements = manenFind(scope || document, selectors, many);
+    return elements === null
+        ? null
+        : elements.map((element) => manenReadAttribute(element, attribute));
+});
+"""
+)
+
+MATCH_SELECTORS_SCRIPT = (
+    QUERY_FUNCTIONS
+    + """
+const [scope, selectors, many] = arguments;
+const root = scope || document;
+for (let index = 0; index < selectors.length; index++) {
+    const [by, value] = selectors[index];
+    const elements = manenQuery(root, by, value);
+    if (elements.length > 0) {
+        return [index, many ? elements : [elements[0]]];
+    }
+}
+return null;
+"""
+)
+
+EXTRACT_FUNCTIONS = (
+    QUERY_FUNCTIONS
+    + TEXT_FUNCTIONS
+    + ATTRIBUTE_FUNCTIONS
+    + """
+// 53-bit hash of the HTML code of an element (cyrb53)
+function manenFingerprint(element) {
+    const html = element.outerHTML;
+    let h1 = 0xdeadbeef;
+    let h2 = 0x41c6ce57;
+    for (let i = 0; i < html.length; i++) {
+        const char = html.charCodeAt(i);
+        h1 = Math.imul(h1 ^ char, 2654435761);
+        h2 = Math.imul(h2 ^ char, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    return 4294967296 * (2097151 & h2) + (h1 >>> 0);
+}
+
+function manenExtractSection(element, field) {
+    if (field.known === null) {
+        return manenExtract(element, field.fields);
+    }
+    // Sections whose fingerprint is known (keys of an object) are not read again
+    const fingerprint = manenFingerprint(element);
+    if (fingerprint in field.known) {
+        return {fingerprint: fingerprint};
+    }
+    return Object.assign(manenExtract(element, field.fields), {fingerprint: fingerprint});
+}
+
+function manenExtract(scope, fields) {
+    const values = {};
+    const missing = [];
+    for (const field of fields) {
+        const elements = manenFind(scope, field.selectors, field.many);
+        if (elements === null) {
+            missing.push(field.name);
+            continue;
+        }
+        let read;
+        if (field.fields !== null) {
+            read = (element) => manenExtractSection(element, field);
+        } else if (field.attribute !== null) {
+            read = (element) => manenReadAttribute(element, field.attribute);
+        } else {
+            read = manenReadText;
+        }
+        values[field.name] = field.many ? elements.map(read) : read(elements[0]);
+    }
+    const isDocument = scope.nodeType === Node.DOCUMENT_NODE;
+    const needScope = missing.length > 0 && !isDocument;
+    return {values: values, missing: missing, scope: needScope ? scope : null};
+}
+"""
+)
+
+EXTRACT_SCRIPT = (
+    EXTRACT_FUNCTIONS + "return manenExtract(arguments[0] || document, arguments[1]);"
+)
+
+EXTRACT_ROWS_SCRIPT = (
+    EXTRACT_FUNCTIONS
+    + """
+const [scope, selectors, start, stop, fields] = arguments;
+const elements = manenFind(scope || document, selectors, true);
+if (elements === null) {
+    return null;
+}
+return elements.slice(start, stop).map((element) => manenExtract(element, fields));
+"""
+)
+
+EXTRACT_COLUMNS_SCRIPT = (
+    EXTRACT_FUNCTIONS
+    + """
+// Values of the fields of several elements by column; the elements can be null (section not
+// found in its parent), and the indices of the elements where a field is not found are listed
+function manenExtractColumns(elements, fields) {
+    const columns = {};
+    const missing = {};
+    let incomplete = false;
+    for (const field of fields) {
+        const found = elements.map(
+            (element) => element === null ? null : manenFind(element, field.selectors, field.many)
+        );
+        const rows = [];
+        found.forEach((match, index) => {
+            if (match === null && elements[index] !== null) {
+                rows.push(index);
+            }
+        });
+        if (rows.length > 0) {
+            missing[field.name] = rows;
+            incomplete = true;
+        }
+        if (field.fields !== null && !field.many) {
+            const section = manenExtractColumns(
+                found.map((match) => match === null ? null : match[0]), field.fields
+            );
+            incomplete = incomplete || section.incomplete;
+            columns[field.name] = section;
+            continue;
+        }
+        let read;
+        if (field.fields !== null) {
+            read = (element) => manenExtract(element, field.fields);
+        } else if (field.attribute !== null) {
+            read = (element) => manenReadAttribute(element, field.attribute);
+        } else {
+            read = manenReadText;
+        }
+        columns[field.name] = found.map(
+            (match) => match === null ? null : field.many ? match.map(read) : read(match[0])
+        );
+    }
+    return {columns: columns, missing: missing, incomplete: incomplete};
+}
+
+const [scope, selectors, fields] = arguments;
+const elements = manenFind(scope || document, selectors, true);
+if (elements === null) {
+    return null;
+}
+const result = manenExtractColumns(elements, fields);
+return [elements.length, result, result.incomplete ? elements : null];
+"""
+)
+
+COUNT_ELEMENTS_SCRIPT = (
+    QUERY_FUNCTIONS
+    + """
+const [scope, selectors, limit] = arguments;
+const root = scope || document;
+for (let index = 0; index < selectors.length; index++) {
+    const [by, value] = selectors[index];
+    const elements = manenQuery(root, by, value);
+    if (elements.length > 0) {
+        return [index, elements.length, elements.slice(0, limit)];
+    }
+}
+return null;
+"""
+)
+
+SLICE_ELEMENTS_SCRIPT = (
+    QUERY_FUNCTIONS
+    + """
+const [scope, by, value, start, stop] = arguments;
+return manenQuery(scope || document, by, value).slice(start, stop);
+"""
+)
+
+WAIT_FOR_ELEMENTS_SCRIPT = (
+    QUERY_FUNCTIONS
+    + """
+const [scopes, selectors, many, timeout] = arguments;
+const done = arguments[arguments.length - 1];
+const results = scopes.map(() => null);
+
+// Search the scopes without a match yet; true once all of them have one
+function search() {
+    let complete = true;
+    scopes.forEach((scope, index) => {
+        if (results[index] === null) {
+            results[index] = manenFind(scope || document, selectors, many);
+            complete = complete && results[index] !== null;
+        }
+    });
+    return complete;
+}
+
+if (search()) {
+    done(results);
+    return;
+}
+
+let timer = null;
+const observer = new MutationObserver(() => {
+    if (search()) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(results);
+    }
+});
+observer.observe(
+    document.documentElement,
+    {attributes: true, characterData: true, childList: true, subtree: true}
+);
+timer = setTimeout(() => {
+    observer.disconnect();
+    done(results);
+}, timeout);
+"""
+)
+
+SCROLL_FOR_ITEMS_SCRIPT = (
+    QUERY_FUNCTIONS
+    + """
+const [scope, selectors, token, timeout, scroll] = arguments;
+const done = arguments[arguments.length - 1];
+const root = scope || document;
+
+function freshItems() {
+    const elements = manenFind(root, selectors, true) || [];
+    return elements.filter((element) => element[token] !== true);
+}
+
+function finish(elements, scrolled) {
+    for (const element of elements) {
+        element[token] = true;
+    }
+    done([elements, scrolled]);
+}
+
+const found = freshItems();
+if (found.length > 0 || !scroll) {
+    finish(found, false);
+    return;
+}
+
+const items = manenFind(root, selectors, true);
+if (items !== null) {
+    items[items.length - 1].scrollIntoView({block: "end"});
+}
+window.scrollTo(0, document.documentElement.scrollHeight);
+
+let timer = null;
+const observer = new MutationObserver(() => {
+    const elements = freshItems();
+    if (elements.length > 0) {
+        observer.disconnect();
+        clearTimeout(timer);
+        finish(elements, true);
+    }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true});
+timer = setTimeout(() => {
+    observer.disconnect();
+    finish([], true);
+}, timeout);
+"""
+)
+
+# The document being left is flagged, so that its ready state is not mistaken for the one of the
+# next page while the navigation is not committed yet
+NAVIGATE_SCRIPT = "document.manenNavigating = true; window.location.assign(arguments[0]);"
+
+READY_STATE_SCRIPT = "return document.manenNavigating ? 'loading' : document.readyState;"
+
+READ_STORAGE_SCRIPT = """
+function manenReadStorage(storage) {
+    const items = {};
+    for (let i = 0; i < storage.length; i++) {
+        const key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+}
+try {
+    return [
+        window.location.origin,
+        manenReadStorage(window.localStorage),
+        manenReadStorage(window.sessionStorage),
+    ];
+} catch (e) {
+    return [window.location.origin, {}, {}];
+}
+"""
+
+RESTORE_STORAGE_FUNCTION = """
+function manenRestoreStorage(storage) {
+    const items = storage[window.location.origin];
+    if (!items) {
+        return;
+    }
+    try {
+        for (const [key, value] of Object.entries(items.local || {})) {
+            if (window.localStorage.getItem(key) === null) {
+                window.localStorage.setItem(key, value);
+            }
+        }
+        for (const [key, value] of Object.entries(items.session || {})) {
+            if (window.sessionStorage.getItem(key) === null) {
+                window.sessionStorage.setItem(key, value);
+            }
+        }
+    } catch (e) {}
+}
+"""
@@ -1,53 +1,196 @@
-from typing import cast
+import asyncio
+from collections.abc import Iterator
+from typing import Any, ClassVar, cast
 
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
 from manen.page_object_model import dom_value as dom
 from manen.page_object_model.config import Config
+from manen.page_object_model.extraction import (
+    ExtractionCache,
+    Pack,
+    extract,
+    extract_columns,
+    extract_rows,
+)
 
 
-class Component:
+class ComponentMeta(type):
+    """Metaclass of :py:class:`Component`, declaring empty ``__slots__`` in the subclasses
+    created with ``slots=True`` (and which don't define their own). Components are usually
+    instantiated in large numbers (one per element matched by a ``list[Component]`` field), so
+    that they can be lighter without a ``__dict__``, at the cost of not storing any additional
+    attribute.
+
+    .. code-block:: python
+
+        class Book(Component, slots=True):
+            title: Annotated[str, CSS("h3")]
+
+    Like ``__slots__``, the option applies to the class only, not to its subclasses.
+    """
+
+    def __new__(mcs, name, bases, namespace, slots: bool = False, **kwargs):
+        if slots:
+            namespace.setdefault("__slots__", ())
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+class Component(metaclass=ComponentMeta):
+    __slots__ = ("_driver", "_scope", "_siblings")
+
+    _config: ClassVar[dict[str, Config]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._config = cls._compile_config()
+        for field, config in cls._config.items():
+            setattr(cls, field, cls._descriptor_class(config)(config))
+
     def __init__(self, /, scope: WebDriver | WebElement):
         self._scope = scope
         self._driver = scope.parent if isinstance(scope, WebElement) else scope
-        self._config: dict[str, Config] = {}
-
-        for field in self.__annotations__:
-            config = Config.from_annotation_item(field, self.__annotations__[field])
-            self._config[field] = config
-
-            if self.is_component(config.element_type):
-                fn = dom.DOMSections if config.many else dom.DOMSection
-            elif config.is_input:
-                fn = dom.InputDOMValue
-            elif config.is_checkbox:
-                fn = dom.CheckboxDOMValue
-            else:
-                fn = dom.DOMValues if config.many else dom.DOMValue
-
-            setattr(
-                self.__class__,
-                field,
-                fn(config),
-            )
+        self._siblings: tuple[dom.SiblingGroup, int] | None = None
+
+    @classmethod
+    def _compile_config(cls) -> dict[str, Config]:
+        return {
+            field: Config.from_annotation_item(field, annotation)
+            for field, annotation in cls.__annotations__.items()
+        }
+
+    @classmethod
+    def _descriptor_class(cls, config: Config) -> type:
+        if cls.is_component(config.element_type):
+            return dom.DOMSections if config.many else dom.DOMSection
+        if config.is_input:
+            return dom.InputDOMValue
+        if config.is_checkbox:
+            return dom.CheckboxDOMValue
+        return dom.DOMValues if config.many else dom.DOMValue
 
     @staticmethod
     def is_component(element_type):
         return issubclass(element_type, Component)
 
-    def model_dump(self):
+    @classmethod
+    def dump_item(cls, config: Config, item):
+        """Convert the value of a field into its representation in
+        :py:meth:`~Component.model_dump`."""
+        if item is None:
+            return None
+        if cls.is_component(config.element_type) and config.many:
+            return [el.model_dump() for el in cast(list[Component], item)]
+        if cls.is_component(config.element_type) and not config.many:
+            return cast(Component, item).model_dump()
+        return item
+
+    def model_dump(self, with_js: bool = False, cache: ExtractionCache | None = None):
+        """Dump the values of all the fields of the component (nested components included) in a
+        dictionary. Fields holding a :py:class:`~selenium.webdriver.remote.webelement.WebElement`
+        are not part of the output.
+
+        Args:
+            with_js (bool, optional): compile the whole component tree into a single JavaScript
+                script, so that all the values are read with one WebDriver command instead of
+                one or several commands per field. The values are still converted in Python.
+                Defaults to False.
+            cache (ExtractionCache, optional): cache of the previous extractions of the
+                component, to extract it incrementally: the sections (``Component`` and
+                ``list[Component]`` fields) whose HTML code didn't change are neither read nor
+                converted again. It implies ``with_js=True``. Defaults to None.
+
+        Returns:
+            dict[str, Any]: values of the fields of the component
+        """
+        if with_js or cache is not None:
+            return extract(self, cache)
         dump = {}
         for field, config in self._config.items():
-            item = getattr(self, field)
-            if self.is_component(config.element_type) and config.many:
-                dump[field] = [el.model_dump() for el in cast(list[Component], item)]
-            elif self.is_component(config.element_type) and not config.many:
-                dump[field] = cast(Component, item).model_dump()
-            elif config.element_type != WebElement:
-                dump[field] = item
+            if config.element_type != WebElement:
+                dump[field] = self.dump_item(config, getattr(self, field))
         return dump
 
+    def model_iter(self, field: str, with_js: bool = False) -> Iterator[dict[str, Any]]:
+        """Dump the components of a ``list[Component]`` field one by one, as they are read, so
+        that they can be written (see :py:mod:`manen.export`) before the whole field is
+        extracted, in constant memory.
+
+        Args:
+            field (str): name of the ``list[Component]`` field
+            with_js (bool, optional): read the values of each chunk of components with one
+                JavaScript script (see :py:meth:`~Component.model_dump`). Defaults to False.
+
+        Raises:
+            ValueError: if the field is not a ``list[Component]`` field
+
+        Yields:
+            dict[str, Any]: values of the fields of each component, as returned by
+            :py:meth:`~Component.model_dump`
+        """
+        config = self._config[field]
+        if not (self.is_component(config.element_type) and config.many):
+            raise ValueError(f"The field {field!r} is not a list of components.")
+        if with_js:
+            yield from extract_rows(self, field)
+            return
+        sections = getattr(self, field)
+        if isinstance(sections, dom.ComponentSequence):
+            sections = sections.stream()
+        for section in sections or ():
+            yield section.model_dump()
+
+    def model_columns(self, field: str, pack: Pack | None = None) -> dict[str, Any] | None:
+        """Dump the components of a ``list[Component]`` field by columns (struct of arrays)
+        instead of by rows, with a single JavaScript script: no component nor dictionary is
+        created per row.
+
+        .. code-block:: python
+
+            >>> columns = page.model_columns("books", pack="numpy")
+            >>> columns["price"].mean()
+            35.07
+            >>> columns["author"]["name"][:2]
+            ['Author 0', 'Author 1']
+
+        Args:
+            field (str): name of the ``list[Component]`` field
+            pack (Pack, optional): pack the ``int`` and ``float`` columns (see
+                :py:data:`~manen.page_object_model.dom_value.GET_TRANSFORMERS`) into an
+                :py:class:`array.array` (``"array"``) or a NumPy array (``"numpy"``), unless
+                they contain ``None``. Defaults to None, the columns being lists.
+
+        Raises:
+            ValueError: if the field is not a ``list[Component]`` field
+
+        Returns:
+            dict[str, Any] | None: columns by field (nested components being nested mappings of
+            columns), or ``None`` if the field is not found and its default value is ``None``
+        """
+        config = self._config[field]
+        if not (self.is_component(config.element_type) and config.many):
+            raise ValueError(f"The field {field!r} is not a list of components.")
+        return extract_columns(self, field, pack)
+
+    async def aget(self, field: str) -> Any:
+        """Get the value of a field without blocking the event loop: the Selenium calls are run
+        in the default executor of the event loop.
+
+        Args:
+            field (str): name of the field
+
+        Returns:
+            Any: value of the field
+        """
+        return await asyncio.to_thread(getattr, self, field)
+
+    async def amodel_dump(self, with_js: bool = False, cache: ExtractionCache | None = None):
+        """Asynchronous version of :py:meth:`~Component.model_dump`, run in the default executor
+        of the event loop so that several components (from different browsers) can be dumped
+        concurrently."""
+        return await asyncio.to_thread(self.model_dump, with_js, cache)
+
 
 class Form(Component):
     def submit(self):
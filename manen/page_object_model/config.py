@@ -2,6 +2,9 @@ from dataclasses import dataclass
 from types import NoneType, UnionType
 from typing import Any, get_origin
 
+from selenium.webdriver.common.by import By
+
+from manen.finder import Selector
 from manen.page_object_model.exceptions import SelectorConfigError
 from manen.page_object_model.types import Attribute, Flag
 from manen.page_object_model.utils import resolve_args
@@ -56,7 +59,7 @@ class DateFormat:
 class Config:
     name: str
     element_type: type
-    selectors: list[str]
+    selectors: list[Selector]
     wait: int
     default: Any = NotImplemented
     many: bool = False
@@ -81,13 +84,13 @@ class Config:
                 wait = config.wait
                 default = config.default
             elif isinstance(config, XPath):
-                selectors.append(f"xpath:{config.selector}")
+                selectors.append(Selector(By.XPATH, config.selector))
             elif isinstance(config, CSS):
-                selectors.append(f"css:{config.selector}")
+                selectors.append(Selector(By.CSS_SELECTOR, config.selector))
             elif isinstance(config, LinkText):
-                selectors.append(f"link_text:{config.selector}")
+                selectors.append(Selector(By.LINK_TEXT, config.selector))
             elif isinstance(config, PartialLinkText):
-                selectors.append(f"partial_link_text:{config.selector}")
+                selectors.append(Selector(By.PARTIAL_LINK_TEXT, config.selector))
             elif isinstance(config, Wait):
                 wait = config.seconds
             elif isinstance(config, Default):
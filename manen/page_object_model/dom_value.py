@@ -1,10 +1,21 @@
+from collections.abc import Iterator, Sequence
 from datetime import date, datetime
-from typing import TYPE_CHECKING, Callable, TypeVar, cast
+from typing import TYPE_CHECKING, Callable, TypeVar, cast, overload
 
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
-from manen.finder import find
+from manen.finder import Selector, find
+from manen.instrumentation import instrumented_field
+from manen.javascript import (
+    COUNT_ELEMENTS_SCRIPT,
+    READ_ATTRIBUTES_SCRIPT,
+    READ_TEXTS_SCRIPT,
+    SLICE_ELEMENTS_SCRIPT,
+)
 from manen.page_object_model.config import Config
+from manen.typing import DriverOrElement
 
 if TYPE_CHECKING:
     from manen.page_object_model.component import Component
@@ -28,6 +39,202 @@ GET_TRANSFORMERS: TTransformers = {
 }
 
 
+_CONSUMED = object()
+
+
+def read_values(
+    driver,
+    scopes: list[DriverOrElement],
+    config: Config,
+) -> list[list[str | None] | None]:
+    """Find the elements matching a configuration inside several scopes, and read their text or
+    attribute, with one single WebDriver command.
+
+    Args:
+        driver (WebDriver): driver used to execute the script
+        scopes (list[DriverOrElement]): scopes where to search the elements
+        config (Config): configuration of the field to read
+
+    Returns:
+        list[list[str | None] | None]: for each scope, the raw values of the elements found,
+        or ``None`` if no element matches the selectors or if the values can't be read in the
+        browser (the elements are then found again with :py:func:`~manen.finder.find`)
+    """
+    try:
+        return driver.execute_script(
+            READ_TEXTS_SCRIPT if config.attribute is None else READ_ATTRIBUTES_SCRIPT,
+            [scope if isinstance(scope, WebElement) else None for scope in scopes],
+            config.selectors,
+            config.many,
+            config.attribute,
+        )
+    except WebDriverException:
+        return [None] * len(scopes)
+
+
+class SiblingGroup:
+    """Components created by the same access to a ``list[Component]`` field. When a field is
+    read on one of them, it is read for all of them with one WebDriver command; the values of
+    the other siblings are kept until they read this field."""
+
+    __slots__ = ("driver", "scopes", "values")
+
+    def __init__(self, driver, scopes: list[WebElement]):
+        self.driver = driver
+        self.scopes = scopes
+        self.values: dict[str, list] = {}
+
+    def read(self, config: Config, index: int) -> list[str | None] | None:
+        values = self.values.get(config.name)
+        if values is None or values[index] is _CONSUMED:
+            values = self.values[config.name] = read_values(self.driver, self.scopes, config)
+        value, values[index] = values[index], _CONSUMED
+        return value
+
+
+def read_raw_values(component: "Component", config: Config) -> list[str | None] | None:
+    """Read the raw values of a field of a component, using the siblings of the component if
+    any. Returns ``None`` if no element matches the selectors of the field."""
+    if component._siblings is not None:
+        group, index = component._siblings
+        return group.read(config, index)
+    return read_values(component._driver, [component._scope], config)[0]
+
+
+def count_elements(
+    driver: WebDriver,
+    scope: DriverOrElement,
+    config: Config,
+    limit: int,
+) -> tuple[Selector, int, list[WebElement]] | None:
+    """Count the elements matching the first selector (of a configuration) with a match, and
+    fetch the first ones, with one WebDriver command.
+
+    Args:
+        driver (WebDriver): driver used to execute the script
+        scope (DriverOrElement): where to search the elements
+        config (Config): configuration of the field
+        limit (int): maximum number of elements to fetch
+
+    Returns:
+        tuple[Selector, int, list[WebElement]] | None: the selector which matched, the number
+        of elements and the first elements, or ``None`` if no element matches or if the elements
+        can't be counted in the browser
+    """
+    try:
+        match = driver.execute_script(
+            COUNT_ELEMENTS_SCRIPT,
+            scope if isinstance(scope, WebElement) else None,
+            config.selectors,
+            limit,
+        )
+    except WebDriverException:
+        return None
+    if not match:
+        return None
+    index, count, elements = match
+    return config.selectors[index], count, elements
+
+
+class ComponentSequence(Sequence):
+    """Lazy sequence of the components of a ``list[Component]`` field.
+
+    The elements are counted when the field is accessed (along with the first chunk of elements),
+    so that :py:func:`len` doesn't send any WebDriver command. The other elements are fetched by
+    chunks of :py:attr:`chunk_size`, only when an item of the chunk is accessed. The components
+    are created only when their chunk is accessed, and their fields are read for the whole chunk
+    at once (see :py:class:`SiblingGroup`). Slicing returns a list of components.
+
+    The components are kept once created, so that they can be accessed again; use
+    :py:meth:`stream` to iterate over a long sequence in constant memory.
+    """
+
+    chunk_size: int = 50
+
+    def __init__(
+        self,
+        driver: WebDriver,
+        scope: DriverOrElement,
+        config: Config,
+        selector: Selector,
+        length: int,
+        first_elements: list[WebElement],
+    ):
+        self._driver = driver
+        self._scope = scope
+        self._config = config
+        self._selector = selector
+        self._length = length
+        self._elements = {0: first_elements}
+        self._chunks: dict[int, list[Component]] = {}
+
+    def __repr__(self):
+        return f"<{type(self).__name__} ({self._config.element_type.__name__} x {self._length})>"
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> "Component": ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list["Component"]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("component index out of range")
+        return self._chunk(index // self.chunk_size)[index % self.chunk_size]
+
+    def __iter__(self):
+        for chunk_index in range(-(-self._length // self.chunk_size)):
+            yield from self._chunk(chunk_index)
+
+    def stream(self) -> Iterator["Component"]:
+        """Iterate over the components without keeping them: each chunk is released once its
+        components are consumed, so the memory used doesn't depend on the length of the
+        sequence."""
+        for chunk_index in range(-(-self._length // self.chunk_size)):
+            chunk = self._chunks.get(chunk_index)
+            yield from chunk if chunk is not None else self._fetch(chunk_index)
+
+    def _chunk(self, chunk_index: int) -> list["Component"]:
+        if chunk_index not in self._chunks:
+            self._chunks[chunk_index] = self._fetch(chunk_index)
+        return self._chunks[chunk_index]
+
+    def _fetch(self, chunk_index: int) -> list["Component"]:
+        elements = self._elements.pop(chunk_index, None)
+        if elements is None:
+            start = chunk_index * self.chunk_size
+            elements = self._driver.execute_script(
+                SLICE_ELEMENTS_SCRIPT,
+                self._scope if isinstance(self._scope, WebElement) else None,
+                *self._selector,
+                start,
+                min(start + self.chunk_size, self._length),
+            )
+        return sections(self._driver, self._config.element_type, elements)
+
+
+def sections(
+    driver,
+    component_class: type["Component"],
+    elements: list[WebElement],
+) -> list["Component"]:
+    """Create the components of a ``list[Component]`` field, sharing the reads of their
+    fields."""
+    components = [component_class(element) for element in elements]
+    if components:
+        siblings = SiblingGroup(driver, elements)
+        for index, child in enumerate(components):
+            child._siblings = (siblings, index)
+    return components
+
+
 class ConfigurableDOM:
     def __init__(self, config: Config):
         self.config = config
@@ -42,7 +249,14 @@ class ImmutableDOMValueMixin:
 
 
 class DOMValue(ImmutableDOMValueMixin, ConfigurableDOM):
+    @instrumented_field
     def __get__(self, component: "Component", component_class: type["Component"]):
+        # Outside of a group of siblings, the script reading the value would be sent for one
+        # element only: finding the element and reading its value is cheaper
+        if self.config.element_type != WebElement and component._siblings is not None:
+            values = read_raw_values(component, self.config)
+            if values is not None:
+                return GET_TRANSFORMERS[self.config.element_type](values[0] or "", self.config)
         element = find(
             selector=self.config.selectors,
             inside=component._scope,
@@ -63,7 +277,15 @@ class DOMValue(ImmutableDOMValueMixin, ConfigurableDOM):
 
 
 class DOMValues(ImmutableDOMValueMixin, ConfigurableDOM):
+    @instrumented_field
     def __get__(self, component: "Component", component_class: type["Component"]):
+        if self.config.element_type != WebElement:
+            values = read_raw_values(component, self.config)
+            if values is not None:
+                return [
+                    GET_TRANSFORMERS[self.config.element_type](value or "", self.config)
+                    for value in values
+                ]
         elements = find(
             selector=self.config.selectors,
             inside=component._scope,
@@ -95,6 +317,7 @@ class InputDOMValue:
             raise ValueError("Cannot use InputElement with many=True")
         self.config = config
 
+    @instrumented_field
     def __get__(self, component: "Component", component_class: type["Component"]):
         element = find(
             selector=self.config.selectors,
@@ -121,6 +344,7 @@ class CheckboxDOMValue:
     def __init__(self, config: Config):
         self.config = config
 
+    @instrumented_field
     def __get__(self, component: "Component", component_class: type["Component"]):
         element = find(
             selector=self.config.selectors,
@@ -144,6 +368,7 @@ class CheckboxDOMValue:
 
 
 class DOMSection(ImmutableDOMValueMixin, ConfigurableDOM):
+    @instrumented_field
     def __get__(
         self,
         component: "Component",
@@ -156,16 +381,23 @@ class DOMSection(ImmutableDOMValueMixin, ConfigurableDOM):
             default=self.config.default,
             wait=self.config.wait,
         )
-        cls = type(
-            self.config.element_type.__qualname__,
-            self.config.element_type.__bases__,
-            {**self.config.element_type.__dict__},
-        )
-        return cast("Component", cls(element))
+        if element == self.config.default:
+            return element
+        return cast("Component", self.config.element_type(element))
 
 
 class DOMSections(ImmutableDOMValueMixin, ConfigurableDOM):
+    @instrumented_field
     def __get__(self, component: "Component", component_class: type["Component"]):
+        if isinstance(component._driver, WebDriver):
+            match = count_elements(
+                component._driver,
+                component._scope,
+                self.config,
+                ComponentSequence.chunk_size,
+            )
+            if match is not None:
+                return ComponentSequence(component._driver, component._scope, self.config, *match)
         elements = find(
             selector=self.config.selectors,
             inside=component._scope,
@@ -173,9 +405,6 @@ class DOMSections(ImmutableDOMValueMixin, ConfigurableDOM):
             default=self.config.default,
             wait=self.config.wait,
         )
-        cls = type(
-            self.config.element_type.__qualname__,
-            self.config.element_type.__bases__,
-            {**self.config.element_type.__dict__},
-        )
-        return [cls(element) for element in elements]
+        if elements == self.config.default:
+            return elements
+        return sections(component._driver, self.config.element_type, elements)
@@ -0,0 +1,554 @@
+"""
+Extraction of a whole :py:class:`~manen.page_object_model.component.Component` tree in a single
+WebDriver command.
+
+The configurations of a component (and of all its nested components) are compiled into a
+JSON-serializable specification, which is evaluated in the browser by a JavaScript script. The
+script returns the raw text and attribute values of all the fields at once; they are then
+converted on the Python side with the usual
+:py:data:`~manen.page_object_model.dom_value.GET_TRANSFORMERS`.
+
+Fields that can't be resolved in the browser (no element found, at the time of the script
+execution) are read again through the usual descriptors, so that the ``Wait`` and ``Default``
+configurations, as well as the errors raised, stay the same as with the regular extraction.
+
+With an :py:class:`ExtractionCache`, the extraction is incremental: the script computes a
+fingerprint of the HTML code of each section (``Component`` and ``list[Component]`` fields), and
+the sections whose fingerprint didn't change since the previous extraction are neither read in
+the browser nor converted again; their previous values are reused.
+
+The rows of a ``list[Component]`` field can also be extracted by chunks (see
+:py:func:`extract_rows`), one WebDriver command per chunk, to stream them without holding the
+whole field in memory, or by columns (see :py:func:`extract_columns`), without creating any
+object per row.
+"""
+
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache, partial
+from typing import TYPE_CHECKING, Any, Literal
+
+from selenium.webdriver.remote.webelement import WebElement
+
+from manen.javascript import EXTRACT_COLUMNS_SCRIPT, EXTRACT_ROWS_SCRIPT, EXTRACT_SCRIPT
+from manen.page_object_model.config import Config
+from manen.page_object_model.dom_value import GET_TRANSFORMERS, ComponentSequence
+from manen.typing import DriverOrElement
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+if TYPE_CHECKING:
+    from manen.page_object_model.component import Component
+
+
+Path = tuple[str, ...]
+SectionKey = tuple[type["Component"], Path]
+
+
+class ExtractionCache:
+    """Values of the sections of the last extraction of a component, by class and path of
+    their component and by fingerprint of their HTML code, used to extract the component again
+    incrementally (see :py:meth:`~manen.page_object_model.component.Component.model_dump`).
+
+    The values of the unchanged sections are the same objects as in the previous output, so
+    they should not be modified. The sections containing input or checkbox fields (whose values
+    are not part of the HTML code) are always read again.
+
+    Attributes:
+        reused (int): number of sections reused by the last extraction
+        extracted (int): number of sections read and converted by the last extraction
+    """
+
+    def __init__(self):
+        self._sections: dict[SectionKey, dict[int, dict[str, Any]]] = {}
+        self._current: dict[SectionKey, dict[int, dict[str, Any]]] = {}
+        self.reused = 0
+        self.extracted = 0
+
+    def fingerprints(self, component_class: type["Component"], path: Path) -> Iterable[int]:
+        """Fingerprints of the sections of a field (identified by the class of its components
+        and its path from the extracted component) known by the cache."""
+        return self._sections.get((component_class, path), {}).keys()
+
+    def begin(self):
+        """Start a new extraction."""
+        self._current = {}
+        self.reused = self.extracted = 0
+
+    def commit(self):
+        """End an extraction: the sections seen replace all the previous ones."""
+        self._sections = self._current
+        self._current = {}
+
+    def section(
+        self,
+        component_class: type["Component"],
+        path: Path,
+        result: dict[str, Any],
+        convert: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Get the values of a section returned by the extraction script, reusing the previous
+        values if the section didn't change.
+
+        Args:
+            component_class (type[Component]): class of the component of the section
+            path (Path): path of the field of the section
+            result (dict[str, Any]): output of the extraction script for the section
+            convert (Callable[[], dict[str, Any]]): function converting the output, if the
+                section changed
+
+        Returns:
+            dict[str, Any]: values of the section
+        """
+        key = (component_class, path)
+        fingerprint = result["fingerprint"]
+        if "values" in result:
+            dump = convert()
+            self.extracted += 1
+            # Sections read again with the descriptors may depend on more than their HTML code
+            cacheable = not result["missing"]
+        else:
+            dump = self._sections[key][fingerprint]
+            self.reused += 1
+            cacheable = True
+        if cacheable:
+            self._current.setdefault(key, {})[fingerprint] = dump
+        return dump
+
+    def clear(self):
+        """Forget all the sections."""
+        self._sections.clear()
+
+
+@cache
+def is_cacheable(component_class: type["Component"]) -> bool:
+    """Whether the values of a component only depend on its HTML code (no input or checkbox
+    field, whose current value is not part of the HTML code)."""
+    return not any(
+        config.is_input
+        or config.is_checkbox
+        or (
+            component_class.is_component(config.element_type)
+            and not is_cacheable(config.element_type)
+        )
+        for config in component_class._config.values()
+    )
+
+
+def compile_spec(
+    configs: dict[str, Config],
+    cache: ExtractionCache | None = None,
+    path: Path = (),
+) -> list[dict[str, Any]]:
+    """Compile the configurations of a component into a specification understandable by
+    the extraction script. Fields holding a
+    :py:class:`~selenium.webdriver.remote.webelement.WebElement` are skipped, as they are
+    not part of the output of
+    :py:meth:`~manen.page_object_model.component.Component.model_dump`.
+
+    Args:
+        configs (dict[str, Config]): configurations of the fields of a component
+        cache (ExtractionCache, optional): cache of an incremental extraction, whose known
+            fingerprints are sent to the script. Defaults to None.
+        path (Path, optional): path of the component from the extracted component. Defaults
+            to ``()``.
+
+    Returns:
+        list[dict[str, Any]]: specification of the fields, nested components included
+    """
+    from manen.page_object_model.component import Component
+
+    spec = []
+    for field, config in configs.items():
+        if config.element_type == WebElement:
+            continue
+        attribute = config.attribute
+        if config.is_input:
+            attribute = "value"
+        elif config.is_checkbox:
+            attribute = "checked"
+        is_component = Component.is_component(config.element_type)
+        known = None
+        if is_component and cache is not None and is_cacheable(config.element_type):
+            fingerprints = cache.fingerprints(config.element_type, (*path, field))
+            known = dict.fromkeys(map(str, fingerprints), True)
+        spec.append(
+            {
+                "name": field,
+                "selectors": config.selectors,
+                "many": config.many,
+                "attribute": attribute,
+                "fields": (
+                    compile_spec(config.element_type._config, cache, (*path, field))
+                    if is_component
+                    else None
+                ),
+                "known": known,
+            }
+        )
+    return spec
+
+
+def convert_value(config: Config, value: str | None) -> Any:
+    """Convert a raw value read in the browser, the same way the descriptors of
+    :py:mod:`~manen.page_object_model.dom_value` would do it."""
+    if config.is_input:
+        return value
+    if config.is_checkbox:
+        return value == "true"
+    return GET_TRANSFORMERS[config.element_type](value or "", config)
+
+
+def convert_section(
+    component_class: type["Component"],
+    scope: DriverOrElement,
+    result: dict[str, Any],
+    cache: ExtractionCache | None,
+    path: Path,
+) -> dict[str, Any]:
+    """Convert the output of the extraction script for a section, reusing its previous values
+    if it didn't change (see :py:class:`ExtractionCache`)."""
+    if cache is None or "fingerprint" not in result:
+        return convert_result(component_class, scope, result, cache, path)
+    return cache.section(
+        component_class,
+        path,
+        result,
+        lambda: convert_result(component_class, scope, result, cache, path),
+    )
+
+
+def convert_result(
+    component_class: type["Component"],
+    scope: DriverOrElement,
+    result: dict[str, Any],
+    cache: ExtractionCache | None = None,
+    path: Path = (),
+) -> dict[str, Any]:
+    """Convert the output of the extraction script into the output of
+    :py:meth:`~manen.page_object_model.component.Component.model_dump`.
+
+    Args:
+        component_class (type[Component]): class of the extracted component
+        scope (DriverOrElement): scope of the extracted component
+        result (dict[str, Any]): output of the extraction script for this component
+        cache (ExtractionCache, optional): cache of an incremental extraction. Defaults to None.
+        path (Path, optional): path of the component from the extracted component. Defaults
+            to ``()``.
+
+    Returns:
+        dict[str, Any]: the dumped component
+    """
+    dump = {}
+    for field, config in component_class._config.items():
+        if config.element_type == WebElement:
+            continue
+        if field in result["missing"]:
+            component = component_class(result["scope"] or scope)
+            dump[field] = component.dump_item(config, getattr(component, field))
+            continue
+        value = result["values"][field]
+        if component_class.is_component(config.element_type):
+            section_path = (*path, field)
+            dump[field] = (
+                [
+                    convert_section(config.element_type, scope, item, cache, section_path)
+                    for item in value
+                ]
+                if config.many
+                else convert_section(config.element_type, scope, value, cache, section_path)
+            )
+        elif config.many:
+            dump[field] = [convert_value(config, item) for item in value]
+        else:
+            dump[field] = convert_value(config, value)
+    return dump
+
+
+def extract(component: "Component", cache: ExtractionCache | None = None) -> dict[str, Any]:
+    """Dump a component using a single call to
+    :py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.execute_script`.
+
+    Args:
+        component (Component): component to be dumped
+        cache (ExtractionCache, optional): cache of the previous extractions of the component,
+            to extract it incrementally. Defaults to None.
+
+    Returns:
+        dict[str, Any]: the dumped component, as returned by
+        :py:meth:`~manen.page_object_model.component.Component.model_dump`
+    """
+    scope = component._scope if isinstance(component._scope, WebElement) else None
+    if cache is not None:
+        cache.begin()
+    result = component._driver.execute_script(
+        EXTRACT_SCRIPT,
+        scope,
+        compile_spec(component._config, cache),
+    )
+    dump = convert_result(type(component), component._scope, result, cache)
+    if cache is not None:
+        cache.commit()
+    return dump
+
+
+def extract_rows(
+    component: "Component",
+    field: str,
+    chunk_size: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Dump the components of a ``list[Component]`` field one by one, reading them by chunks
+    with one call to
+    :py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.execute_script` per chunk.
+
+    If no element matches the field when the extraction starts, the field is read through its
+    descriptor, so that the ``Wait`` and ``Default`` configurations apply.
+
+    Args:
+        component (Component): component owning the field
+        field (str): name of the ``list[Component]`` field
+        chunk_size (int, optional): number of rows read per command. Defaults to
+            :py:attr:`~manen.page_object_model.dom_value.ComponentSequence.chunk_size`.
+
+    Yields:
+        dict[str, Any]: the dumped components, as returned by
+        :py:meth:`~manen.page_object_model.component.Component.model_dump`
+    """
+    config = component._config[field]
+    chunk_size = chunk_size or ComponentSequence.chunk_size
+    scope = component._scope if isinstance(component._scope, WebElement) else None
+    spec = compile_spec(config.element_type._config)
+    start = 0
+    while True:
+        rows = component._driver.execute_script(
+            EXTRACT_ROWS_SCRIPT,
+            scope,
+            config.selectors,
+            start,
+            start + chunk_size,
+            spec,
+        )
+        if rows is None:
+            if start == 0:
+                for section in getattr(component, field) or ():
+                    yield section.model_dump()
+            return
+        for row in rows:
+            yield convert_result(config.element_type, component._scope, row)
+        if len(rows) < chunk_size:
+            return
+        start += chunk_size
+
+
+Pack = Literal["array", "numpy"]
+
+#: Type codes of the :py:class:`array.array` (and NumPy data types) of the numeric columns
+NUMERIC_TYPECODES: dict[type, str] = {int: "q", float: "d"}
+
+
+def is_numeric(config: Config) -> bool:
+    """Whether the column of a field can be packed into a numeric buffer."""
+    return config.element_type in NUMERIC_TYPECODES and not config.many
+
+
+def pack_column(config: Config, values: Iterable[Any], length: int, pack: Pack) -> Any:
+    """Pack the values of a numeric column into an :py:class:`array.array` or a NumPy array.
+
+    Args:
+        config (Config): configuration of the field (``int`` or ``float``)
+        values (Iterable[Any]): values of the column, without ``None``
+        length (int): number of values
+        pack (Pack): ``"array"`` or ``"numpy"``
+
+    Returns:
+        array | numpy.ndarray: the packed column
+    """
+    typecode = NUMERIC_TYPECODES[config.element_type]
+    if pack == "array":
+        return array(typecode, values)
+    if numpy is None:
+        raise ImportError(
+            "NumPy is required to pack the columns into NumPy arrays. "
+            "Install it with `pip install manen[numpy]`."
+        )
+    return numpy.fromiter(values, dtype=numpy.dtype(typecode), count=length)
+
+
+def pack_columns(
+    component_class: type["Component"],
+    columns: dict[str, Any],
+    length: int,
+    pack: Pack,
+):
+    """Pack (in place) the numeric columns which are still lists, unless they contain
+    ``None``."""
+    for field, column in columns.items():
+        config = component_class._config[field]
+        if isinstance(column, dict):
+            pack_columns(config.element_type, column, length, pack)
+        elif is_numeric(config) and isinstance(column, list) and None not in column:
+            columns[field] = pack_column(config, column, length, pack)
+
+
+def fill_columns(columns: dict[str, Any], index: int, dump: dict[str, Any] | None):
+    """Set the values of one row of columns from a dumped component."""
+    for field, column in columns.items():
+        value = dump.get(field) if dump else None
+        if isinstance(column, dict):
+            fill_columns(column, index, value)
+        else:
+            column[index] = value
+
+
+def convert_columns(
+    component_class: type["Component"],
+    scope: DriverOrElement,
+    result: dict[str, Any],
+    length: int,
+    section: Callable[[int], "Component"],
+    skip: frozenset[int] = frozenset(),
+    pack: Pack | None = None,
+) -> dict[str, Any]:
+    """Convert the output of the columnar extraction script into columns.
+
+    Args:
+        component_class (type[Component]): class of the extracted components
+        scope (DriverOrElement): scope of the component owning the field
+        result (dict[str, Any]): output of the script for these components
+        length (int): number of components
+        section (Callable[[int], Component]): function creating the component of a row, used
+            to read again the fields not found by the script
+        skip (frozenset[int], optional): rows whose component was not found in its parent.
+            Defaults to an empty set.
+        pack (Pack, optional): how to pack the numeric columns. Defaults to None.
+
+    Returns:
+        dict[str, Any]: columns by field, nested components being nested mappings of columns
+    """
+    columns: dict[str, Any] = {}
+    for field, config in component_class._config.items():
+        if config.element_type == WebElement:
+            continue
+        raw = result["columns"][field]
+        missing = result["missing"].get(field, [])
+        rows = skip.union(missing)
+
+        def read(index: int, field: str = field) -> Any:
+            return getattr(section(index), field)
+
+        if component_class.is_component(config.element_type) and not config.many:
+            column = convert_columns(config.element_type, scope, raw, length, read, rows, pack)
+            for index in missing:
+                fill_columns(column, index, component_class.dump_item(config, read(index)))
+            if missing and pack:
+                pack_columns(config.element_type, column, length, pack)
+            columns[field] = column
+            continue
+
+        if component_class.is_component(config.element_type):
+
+            def convert(value, config=config):
+                return [convert_result(config.element_type, scope, item) for item in value]
+
+        elif config.many:
+
+            def convert(value, config=config):
+                return [convert_value(config, item) for item in value]
+
+        else:
+            convert = partial(convert_value, config)
+        if pack and not rows and is_numeric(config):
+            columns[field] = pack_column(config, map(convert, raw), length, pack)
+            continue
+        column = [None if index in rows else convert(value) for index, value in enumerate(raw)]
+        for index in missing:
+            column[index] = component_class.dump_item(config, read(index))
+        if pack and is_numeric(config) and None not in column:
+            column = pack_column(config, column, length, pack)
+        columns[field] = column
+    return columns
+
+
+def columns_from_dumps(
+    component_class: type["Component"],
+    dumps: Iterable[dict[str, Any]],
+) -> dict[str, Any]:
+    """Build columns from dumped components (used when the script can't find the elements)."""
+    columns = {
+        field: (
+            columns_from_dumps(config.element_type, [])
+            if component_class.is_component(config.element_type) and not config.many
+            else []
+        )
+        for field, config in component_class._config.items()
+        if config.element_type != WebElement
+    }
+    for dump in dumps:
+        append_row(columns, dump)
+    return columns
+
+
+def append_row(columns: dict[str, Any], dump: dict[str, Any] | None):
+    """Append a dumped component to columns."""
+    for field, column in columns.items():
+        value = dump.get(field) if dump else None
+        if isinstance(column, dict):
+            append_row(column, value)
+        else:
+            column.append(value)
+
+
+def extract_columns(
+    component: "Component",
+    field: str,
+    pack: Pack | None = None,
+) -> dict[str, Any] | None:
+    """Extract the components of a ``list[Component]`` field by columns, using a single call to
+    :py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.execute_script`. Neither a
+    component nor a dictionary is created per row, except to read again the fields not found by
+    the script (through their descriptors).
+
+    If no element matches the field, the field is read through its descriptor, so that the
+    ``Wait`` and ``Default`` configurations apply (``None`` is returned if the default value
+    is ``None``).
+
+    Args:
+        component (Component): component owning the field
+        field (str): name of the ``list[Component]`` field
+        pack (Pack, optional): pack the ``int`` and ``float`` columns into an
+            :py:class:`array.array` (``"array"``) or a NumPy array (``"numpy"``), unless they
+            contain ``None``. Defaults to None, the columns being lists.
+
+    Returns:
+        dict[str, Any] | None: columns by field, the fields of nested components being nested
+        mappings of columns
+    """
+    config = component._config[field]
+    row_class = config.element_type
+    scope = component._scope if isinstance(component._scope, WebElement) else None
+    output = component._driver.execute_script(
+        EXTRACT_COLUMNS_SCRIPT,
+        scope,
+        config.selectors,
+        compile_spec(row_class._config),
+    )
+    if output is None:
+        sections = getattr(component, field)
+        if sections is None:
+            return None
+        columns = columns_from_dumps(row_class, (section.model_dump() for section in sections))
+        if pack:
+            pack_columns(row_class, columns, len(sections), pack)
+        return columns
+    length, result, elements = output
+    return convert_columns(
+        row_class,
+        component._scope,
+        result,
+        length,
+        lambda index: row_class(elements[index]),
+        pack=pack,
+    )
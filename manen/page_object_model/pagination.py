@@ -0,0 +1,211 @@
+"""
+Iteration over the results of a paginated website, page after page, or over the items of an
+infinite scroll feed.
+
+.. code-block:: python
+
+    >>> from manen.page_object_model.pagination import infinite_scroll, paginate
+    >>> driver.get("https://books.toscrape.com/catalogue/category/books_1/index.html")
+    >>> for book in paginate(driver, BooksToScrapePage, "css:li.next a", items="books"):
+    ...     print(book.title)
+    A Light in the Attic
+    Tipping the Velvet
+    ...
+    >>> driver.get("https://quotes.toscrape.com/scroll")
+    >>> for quote in infinite_scroll(driver, QuotesToScrapePage.Quote, "css:div.quote"):
+    ...     print(quote.author)
+    Albert Einstein
+    J.K. Rowling
+    ...
+"""
+
+from collections.abc import Callable, Iterator
+from typing import Any
+from uuid import uuid4
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from manen.checkpoint import Checkpoint
+from manen.finder import Selector, find, parse_selector
+from manen.helpers import wait_until_loaded
+from manen.javascript import NAVIGATE_SCRIPT, SCROLL_FOR_ITEMS_SCRIPT
+from manen.page_object_model.component import Component, Page
+from manen.page_object_model.dom_value import sections
+from manen.typing import DriverOrElement
+
+__all__ = ("infinite_scroll", "next_page_url", "paginate")
+
+
+def next_page_url(page: Page, next_page: str | Callable[[Page], str | None]) -> str | None:
+    """Get the URL of the page following a page.
+
+    Args:
+        page (Page): current page
+        next_page (str | Callable[[Page], str | None]): name of the field of the page holding
+            the link to the next page (an URL or an element), selector of the link to the next
+            page, or function returning the URL of the next page
+
+    Returns:
+        str | None: URL of the next page, or ``None`` if there is no next page
+    """
+    if callable(next_page):
+        return next_page(page)
+    if next_page in page._config:
+        link = getattr(page, next_page)
+    else:
+        link = find(next_page, inside=page._scope, default=None)
+    if isinstance(link, WebElement):
+        link = link.get_attribute("href")
+    return link or None
+
+
+def paginate(
+    driver: WebDriver,
+    page_class: type[Page],
+    next_page: str | Callable[[Page], str | None],
+    *,
+    items: str | None = None,
+    max_pages: int | None = None,
+    prefetch: bool = False,
+    timeout: float = 30,
+    checkpoint: Checkpoint | None = None,
+) -> Iterator[Any]:
+    """Iterate over the pages of a paginated website, starting from the current page of the
+    driver, and yield the pages or the components of one of their fields.
+
+    The iteration stops when there is no next page, when the next page has already been visited
+    (cycle in the pagination) or when ``max_pages`` pages have been visited.
+
+    With ``prefetch=True``, the next page is loaded in a new tab while the components of the
+    current page are consumed, so that the browser doesn't stay idle; the tab of the current page
+    is closed once it has been consumed, so the iteration ends in the tab of the last page.
+
+    With a checkpoint, each page is recorded once it has been consumed, and the pages already
+    recorded are not yielded (the iteration still goes through them to find the next pages), so
+    that an interrupted iteration can be resumed without extracting them again.
+
+    Args:
+        driver (WebDriver): driver displaying the first page
+        page_class (type[Page]): class describing the pages
+        next_page (str | Callable[[Page], str | None]): how to get the URL of the next page (see
+            :py:func:`next_page_url`)
+        items (str, optional): name of the field of the pages whose components are yielded (a
+            page where the field is ``None`` yields nothing). If ``None``, the pages are
+            yielded. Defaults to None.
+        max_pages (int, optional): maximum number of pages to visit. Defaults to None.
+        prefetch (bool, optional): whether to load the next page in a new tab while the current
+            page is consumed. Defaults to False.
+        timeout (float, optional): maximum number of seconds to wait for a prefetched page to be
+            loaded, when the iteration reaches it. Defaults to 30.
+        checkpoint (Checkpoint, optional): checkpoint where the pages consumed are recorded, by
+            URL. Defaults to None.
+
+    Yields:
+        Page | Component: the pages, or the components of the field ``items`` of each page
+    """
+    current_url = driver.current_url
+    visited = {current_url}
+    nb_pages = 0
+    while True:
+        nb_pages += 1
+        page = page_class(driver)
+        url = next_page_url(page, next_page)
+        if url in visited or (max_pages is not None and nb_pages >= max_pages):
+            url = None
+        prefetched_window = None
+        if url and prefetch:
+            current_window = driver.current_window_handle
+            driver.switch_to.new_window("tab")
+            driver.execute_script(NAVIGATE_SCRIPT, url)
+            prefetched_window = driver.current_window_handle
+            driver.switch_to.window(current_window)
+
+        try:
+            if checkpoint is None or current_url not in checkpoint:
+                if items is None:
+                    yield page
+                else:
+                    yield from getattr(page, items) or ()
+        except GeneratorExit:
+            if prefetched_window is not None:
+                current_window = driver.current_window_handle
+                driver.switch_to.window(prefetched_window)
+                driver.close()
+                driver.switch_to.window(current_window)
+            raise
+        if checkpoint is not None:
+            checkpoint.record(current_url)
+
+        if not url:
+            return
+        if prefetched_window is not None:
+            driver.close()
+            driver.switch_to.window(prefetched_window)
+            wait_until_loaded(driver, timeout)
+        else:
+            driver.get(url)
+        current_url = url
+        visited.update((url, driver.current_url))
+
+
+def infinite_scroll(
+    driver: WebDriver,
+    component_class: type[Component],
+    selector: str | Selector | list[str | Selector],
+    *,
+    inside: DriverOrElement | None = None,
+    max_scrolls: int | None = None,
+    max_items: int | None = None,
+    timeout: float = 5,
+) -> Iterator[Component]:
+    """Iterate over the items of an infinite scroll feed, scrolling down until no new item
+    appears.
+
+    At each step, the items which haven't been yielded yet are returned if there are some;
+    otherwise the page is scrolled down (to the last item and to the bottom of the page), and
+    the new items are returned as soon as they are added to the DOM (a ``MutationObserver`` is
+    used, instead of waiting a fixed amount of time). The iteration stops when no new item
+    appeared ``timeout`` seconds after a scroll, or when a budget is reached.
+
+    The items already yielded are marked inside the browser, so that each element is yielded
+    only once (even if the feed removes or reorders the previous items) without keeping them in
+    Python.
+
+    Args:
+        driver (WebDriver): driver displaying the feed
+        component_class (type[Component]): class describing an item of the feed
+        selector (str | Selector | list[str | Selector]): selector(s) of the items
+        inside (DriverOrElement, optional): element containing the items. Defaults to None.
+        max_scrolls (int, optional): maximum number of scrolls. Defaults to None.
+        max_items (int, optional): maximum number of items to yield. Defaults to None.
+        timeout (float, optional): number of seconds to wait for new items after a scroll. The
+            wait also ends when the script timeout of the driver is reached, which is considered
+            as no new item. Defaults to 5.
+
+    Yields:
+        Component: the items of the feed, in the order they appear
+    """
+    selectors = [
+        parse_selector(item) for item in (selector if isinstance(selector, list) else [selector])
+    ]
+    scope = inside if isinstance(inside, WebElement) else None
+    token = f"manen_{uuid4().hex}"
+    nb_scrolls = nb_items = 0
+    while max_items is None or nb_items < max_items:
+        # Once the scroll budget is spent, the items already loaded are still returned
+        scroll = max_scrolls is None or nb_scrolls < max_scrolls
+        try:
+            elements, scrolled = driver.execute_async_script(
+                SCROLL_FOR_ITEMS_SCRIPT, scope, selectors, token, int(timeout * 1000), scroll
+            )
+        except TimeoutException:
+            return
+        nb_scrolls += scrolled
+        if not elements:
+            return
+        if max_items is not None:
+            elements = elements[: max_items - nb_items]
+        nb_items += len(elements)
+        yield from sections(driver, component_class, elements)
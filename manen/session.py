@@ -0,0 +1,190 @@
+"""
+Sessions of a browser (cookies, local storage and session storage) saved to and restored from
+the disk, so that several browsers (for instance the workers of a crawl) can start already
+authenticated, without replaying the login flow.
+
+.. code-block:: python
+
+    >>> from manen.session import SessionStore
+    >>> store = SessionStore("~/.cache/my-crawler/sessions")
+    >>> browser.get("https://example.com/login")
+    >>> ...  # log in once
+    >>> store.save(browser, "example")
+    >>> # Later, in each worker
+    >>> if not store.restore(worker, "example"):
+    ...     login(worker)
+    >>> worker.get("https://example.com/account")
+
+With a Chromium-based browser, the cookies of all the domains are read and injected with one
+DevTools command each way, and the storage is restored before any script of the pages is
+executed, whatever the current page. With another browser, only the cookies and the storage of
+the current page are saved and restored.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from manen.javascript import READ_STORAGE_SCRIPT, RESTORE_STORAGE_FUNCTION
+from manen.typing import Cookie
+
+__all__ = ("Session", "SessionStore")
+
+Storage = dict[str, dict[str, dict[str, str]]]
+
+
+@dataclass
+class Session:
+    """State of a browser needed to resume a session.
+
+    Attributes:
+        cookies (list[Cookie]): cookies of all the domains, in the format of
+            :py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.get_cookies`
+        storage (dict[str, dict[str, dict[str, str]]]): items of the local storage
+            (``"local"``) and of the session storage (``"session"``), by origin
+    """
+
+    cookies: list[Cookie] = field(default_factory=list)
+    storage: Storage = field(default_factory=dict)
+
+    @classmethod
+    def capture(cls, driver: WebDriver) -> "Session":
+        """Capture the session of a browser (see :py:meth:`update`)."""
+        session = cls()
+        session.update(driver)
+        return session
+
+    def update(self, driver: WebDriver):
+        """Update the session with the current state of a browser: all its cookies are read, and
+        the storage of the current page replaces the storage saved for the same origin (the
+        storage of the other origins is kept).
+
+        Args:
+            driver (WebDriver): browser whose state is captured
+        """
+        get_all_cookies = getattr(driver, "get_all_cookies", driver.get_cookies)
+        self.cookies = get_all_cookies()
+        origin, local, session = driver.execute_script(READ_STORAGE_SCRIPT)
+        if origin and origin != "null" and (local or session):
+            self.storage[origin] = {"local": local, "session": session}
+
+    def apply(self, driver: WebDriver):
+        """Restore the session in a browser.
+
+        With a Chromium-based browser, the cookies are injected with one DevTools command, and
+        the storage is restored in each page loaded afterwards, before its own scripts; the items
+        already present in the storage are not overwritten. This script is removed by
+        :py:meth:`~manen.browser.BrowserMixin.reset`. With another browser, the cookies and the
+        storage are only restored for the domain of the current page.
+
+        Args:
+            driver (WebDriver): browser where the session is restored
+        """
+        add_cookies = getattr(driver, "add_cookies", None)
+        if add_cookies is not None:
+            add_cookies(self.cookies)
+        else:
+            for cookie in self.cookies:
+                driver.add_cookie(cookie)
+        if not self.storage:
+            return
+        script = f"{RESTORE_STORAGE_FUNCTION}\nmanenRestoreStorage({json.dumps(self.storage)});"
+        add_document_script = getattr(driver, "add_document_script", None)
+        execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+        if add_document_script is not None and execute_cdp_cmd is not None:
+            add_document_script(script)
+        elif execute_cdp_cmd is not None:
+            execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})
+        driver.execute_script(script)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Export the session as a JSON-serializable dictionary."""
+        return {"cookies": self.cookies, "storage": self.storage}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Session":
+        """Create a session from a dictionary exported with :py:meth:`as_dict`."""
+        return cls(cookies=data.get("cookies", []), storage=data.get("storage", {}))
+
+
+class SessionStore:
+    """Sessions saved as JSON files in a directory, one file per session name. The files are
+    written atomically, so that a worker never reads a partially written session, and can only
+    be read by their owner since they contain credentials.
+
+    Args:
+        directory (str | Path): directory where the sessions are saved; it is created if needed
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} ({self.directory})>"
+
+    def path(self, name: str) -> Path:
+        """Path of the file of a session."""
+        return self.directory / f"{name}.json"
+
+    def names(self) -> list[str]:
+        """Names of the saved sessions."""
+        return sorted(path.stem for path in self.directory.glob("*.json"))
+
+    def load(self, name: str) -> Session | None:
+        """Load a session, or return ``None`` if there is no session with this name."""
+        try:
+            data = json.loads(self.path(name).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        return Session.from_dict(data)
+
+    def dump(self, name: str, session: Session):
+        """Write a session to the disk, replacing the previous session with the same name."""
+        path = self.path(name)
+        temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporary_path.unlink(missing_ok=True)
+        fd = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with open(fd, "w", encoding="utf-8") as file:
+            json.dump(session.as_dict(), file)
+        os.replace(temporary_path, path)
+
+    def save(self, driver: WebDriver, name: str) -> Session:
+        """Capture the session of a browser and save it. The storage previously saved for other
+        origins is kept (see :py:meth:`Session.update`).
+
+        Args:
+            driver (WebDriver): browser whose session is saved
+            name (str): name of the session
+
+        Returns:
+            Session: session saved
+        """
+        session = self.load(name) or Session()
+        session.update(driver)
+        self.dump(name, session)
+        return session
+
+    def restore(self, driver: WebDriver, name: str) -> bool:
+        """Restore a saved session in a browser (see :py:meth:`Session.apply`).
+
+        Args:
+            driver (WebDriver): browser where the session is restored
+            name (str): name of the session
+
+        Returns:
+            bool: whether a session with this name has been found and restored
+        """
+        session = self.load(name)
+        if session is None:
+            return False
+        session.apply(driver)
+        return True
+
+    def delete(self, name: str):
+        """Delete a saved session, if it exists."""
+        self.path(name).unlink(missing_ok=True)
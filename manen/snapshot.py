@@ -0,0 +1,626 @@
+"""
+Offline evaluation of a HTML page. A :py:class:`Snapshot` is built from one capture of the HTML
+source code of a page (or from archived HTML) and behaves like a read-only
+:py:class:`~selenium.webdriver.remote.webdriver.WebDriver`: the selectors are resolved and the
+text and attributes are read locally, with an in-process parser, without any command sent to a
+browser.
+
+It means that :py:func:`~manen.finder.find`, as well as all the
+:py:class:`~manen.page_object_model.component.Page` and
+:py:class:`~manen.page_object_model.component.Component` classes, work unchanged with a snapshot.
+
+.. code-block:: python
+
+    >>> from manen.snapshot import Snapshot
+    >>> snapshot = Snapshot.capture(driver)  # One single WebDriver command
+    >>> page = BooksToScrapePage(snapshot)
+    >>> page.model_dump()
+    {'categories': [...], 'current_category': 'Books', ...}
+
+The parsing relies on the optional dependencies `lxml <https://lxml.de/>`_ and
+`cssselect <https://cssselect.readthedocs.io/>`_, which can be installed with
+``pip install manen[snapshot]``.
+
+.. note::
+
+    A snapshot has no layout engine. An element is considered as hidden only if it (or one of
+    its ancestors) is explicitly hidden in the HTML source code (``hidden`` attribute, inline
+    ``display: none`` or ``visibility: hidden`` style, hidden input, ``<head>``, ``<script>``...).
+
+With a Chromium-based browser, a :py:class:`DevToolsSnapshot` is built instead from the DevTools
+command ``DOMSnapshot.captureSnapshot``: the document is transferred as flat tables of strings,
+which is much faster to serialize than the HTML source code of a large page, and the visibility
+of the elements is the one computed by the layout engine of the browser. The current values of
+the form fields are captured as well.
+
+.. code-block:: python
+
+    >>> from manen.snapshot import DevToolsSnapshot
+    >>> snapshot = DevToolsSnapshot.capture(browser)  # One single DevTools command
+    >>> BooksToScrapePage(snapshot).model_dump()
+    {'categories': [...], 'current_category': 'Books', ...}
+"""
+
+import re
+from collections.abc import Callable
+from functools import cached_property, lru_cache, partial
+from hashlib import blake2b
+from typing import Any
+from urllib.parse import urljoin
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from manen.javascript import (
+    COUNT_ELEMENTS_SCRIPT,
+    EXTRACT_COLUMNS_SCRIPT,
+    EXTRACT_ROWS_SCRIPT,
+    EXTRACT_SCRIPT,
+    MATCH_SELECTORS_SCRIPT,
+    READ_ATTRIBUTES_SCRIPT,
+    READ_TEXTS_SCRIPT,
+    READY_STATE_SCRIPT,
+    SCROLL_FOR_ITEMS_SCRIPT,
+    SLICE_ELEMENTS_SCRIPT,
+    WAIT_FOR_ELEMENTS_SCRIPT,
+)
+
+try:
+    from cssselect import GenericTranslator
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover
+    GenericTranslator = etree = lxml_html = None
+
+__all__ = ("DevToolsSnapshot", "Snapshot", "SnapshotElement")
+
+CAPTURE_SCRIPT = "return [document.documentElement.outerHTML, document.URL];"
+
+HIDDEN_TAGS = {"head", "noscript", "script", "style", "template", "title"}
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "caption", "dd", "details", "dialog", "div",
+    "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "hr", "legend", "li", "main", "nav", "ol", "option", "p", "pre",
+    "section", "summary", "table", "tbody", "tfoot", "thead", "tr", "ul",
+}  # fmt: skip
+CELL_TAGS = {"td", "th"}
+BOOLEAN_ATTRIBUTES = {
+    "allowfullscreen", "async", "autofocus", "autoplay", "checked", "controls", "default",
+    "defer", "disabled", "formnovalidate", "hidden", "ismap", "itemscope", "loop", "multiple",
+    "muted", "nomodule", "novalidate", "open", "playsinline", "readonly", "required",
+    "reversed", "selected",
+}  # fmt: skip
+HIDDEN_STYLE = re.compile(r"(display\s*:\s*none|visibility\s*:\s*hidden)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def css_to_xpath(selector: str, prefix: str) -> str:
+    """Translate a CSS selector into a XPath expression (cached)."""
+    return GenericTranslator().css_to_xpath(selector, prefix=prefix)
+
+
+def is_hidden(node) -> bool:
+    """Whether a node is explicitly hidden in the HTML source code (ancestors not included)."""
+    if node.tag in HIDDEN_TAGS or node.get("hidden") is not None:
+        return True
+    if node.tag == "input" and (node.get("type") or "").lower() == "hidden":
+        return True
+    return bool(HIDDEN_STYLE.search(node.get("style") or ""))
+
+
+def is_displayed(node, hidden: Callable[[Any], bool] = is_hidden) -> bool:
+    """Whether a node and all its ancestors are displayed."""
+    return not hidden(node) and not any(hidden(parent) for parent in node.iterancestors())
+
+
+def visible_text(node, hidden: Callable[[Any], bool] = is_hidden) -> str:
+    """Text of a node, as it would be rendered: text of hidden descendants is excluded, block
+    elements are separated by line breaks and whitespaces are collapsed."""
+    parts = []
+
+    def walk(current):
+        if current.tag == "br":
+            parts.append("\n")
+            return
+        block = current.tag in BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if current.text:
+            parts.append(current.text)
+        for child in current:
+            if isinstance(child.tag, str) and not hidden(child):
+                walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append("\n")
+        elif current.tag in CELL_TAGS:
+            parts.append(" ")
+
+    walk(node)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def check_dependencies():
+    """Raise an :py:exc:`ImportError` if the dependencies of the snapshots are missing."""
+    if lxml_html is None:
+        raise ImportError(
+            "lxml and cssselect are required to use a Snapshot. "
+            "Install them with `pip install manen[snapshot]`."
+        )
+
+
+class SnapshotElement(WebElement):
+    """Element of a :py:class:`Snapshot`, compatible with
+    :py:class:`~selenium.webdriver.remote.webelement.WebElement`. All the interactions (click,
+    keys...) raise a :py:exc:`~selenium.common.exceptions.WebDriverException`."""
+
+    def __init__(self, parent: "Snapshot", node, id_: str):
+        super().__init__(parent, id_)
+        self.node = node
+
+    def __repr__(self):
+        return f'<{type(self).__name__} (tag: "{self.node.tag}", element: "{self.id}")>'
+
+    @property
+    def tag_name(self) -> str:
+        return self.node.tag
+
+    @property
+    def text(self) -> str:
+        hidden = self.parent.is_hidden_node
+        return visible_text(self.node, hidden) if is_displayed(self.node, hidden) else ""
+
+    def is_displayed(self) -> bool:
+        return is_displayed(self.node, self.parent.is_hidden_node)
+
+    def get_dom_attribute(self, name: str) -> str | None:
+        return self.node.get(name)
+
+    def get_property(self, name: str) -> Any:
+        return self.get_attribute(name)
+
+    def get_attribute(self, name: str) -> str | None:
+        node = self.node
+        name_lower = name.lower()
+        if name_lower in BOOLEAN_ATTRIBUTES:
+            return "true" if node.get(name_lower) is not None else None
+        if (node.tag, name_lower) in {("a", "href"), ("img", "src")}:
+            value = node.get(name_lower)
+            return urljoin(self.parent.current_url, value) if value else value
+        if name in ("class", "className"):
+            return node.get("class")
+        if name == "innerHTML":
+            return (node.text or "") + "".join(
+                etree.tostring(child, encoding="unicode", method="html") for child in node
+            )
+        if name == "outerHTML":
+            return etree.tostring(node, encoding="unicode", method="html", with_tail=False)
+        if name == "textContent":
+            return node.text_content()
+        if name == "innerText":
+            return visible_text(node, self.parent.is_hidden_node)
+        if name == "value" and node.tag == "textarea":
+            return node.text or ""
+        if name == "value" and node.tag == "select":
+            return node.value or ""
+        if name == "value" and node.tag == "option":
+            return node.get("value", node.text_content())
+        if name == "value" and node.tag in ("input", "button"):
+            return node.get("value", "")
+        return node.get(name)
+
+    def find_element(self, by=By.ID, value=None) -> WebElement:
+        return self.parent._find_element(self.node, by, value)
+
+    def find_elements(self, by=By.ID, value=None) -> list[WebElement]:
+        return self.parent._find_elements(self.node, by, value)
+
+
+class Snapshot(WebDriver):
+    """Read-only :py:class:`~selenium.webdriver.remote.webdriver.WebDriver` evaluating a HTML
+    page locally.
+
+    Args:
+        source (str): HTML source code of the page
+        url (str, optional): URL of the page, used to resolve the relative links. Defaults to
+            ``about:blank``.
+    """
+
+    element_class: type[SnapshotElement] = SnapshotElement
+
+    def __init__(self, source: str, url: str = "about:blank"):
+        check_dependencies()
+        self.source = source
+        self.url = url
+        self.root = lxml_html.document_fromstring(source)
+        self._elements: dict[Any, SnapshotElement] = {}
+        self._marks: dict[str, set] = {}
+
+    def __repr__(self):
+        return f'<{type(self).__module__}.{type(self).__name__} (url="{self.url}")>'
+
+    @classmethod
+    def capture(cls, driver: WebDriver) -> "Snapshot":
+        """Capture the current page of a driver, with one single WebDriver command.
+
+        Args:
+            driver (WebDriver): driver whose current page should be captured
+
+        Returns:
+            Snapshot: snapshot of the page
+        """
+        source, url = driver.execute_script(CAPTURE_SCRIPT)
+        return cls(source, url=url)
+
+    @property
+    def title(self) -> str:
+        title = self.root.find(".//title")
+        return title.text_content().strip() if title is not None else ""
+
+    @property
+    def current_url(self) -> str:
+        return self.url
+
+    @property
+    def page_source(self) -> str:
+        return self.source
+
+    def execute(self, driver_command: str, params: dict | None = None):
+        raise WebDriverException(
+            f"The command `{driver_command}` can not be performed on a snapshot of a page."
+        )
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+    def is_hidden_node(self, node) -> bool:
+        """Whether a node of the parsed document is hidden (ancestors not included)."""
+        return is_hidden(node)
+
+    def element(self, node) -> SnapshotElement:
+        """Wrap a node of the parsed document in a :py:class:`SnapshotElement` (always the same
+        instance for a given node)."""
+        if node not in self._elements:
+            id_ = f"snapshot-{len(self._elements)}"
+            self._elements[node] = self.element_class(self, node, id_)
+        return self._elements[node]
+
+    def query(self, node, by: str, value: str) -> list:
+        """Find the nodes matching a Selenium selector, inside a node of the parsed document.
+
+        Args:
+            node (HtmlElement | None): node where to search (the whole document if ``None``)
+            by (str): Selenium selection method
+            value (str): selector
+
+        Returns:
+            list[HtmlElement]: nodes matching the selector, in document order
+        """
+        prefix = "descendant::" if node is not None else "descendant-or-self::"
+        node = self.root if node is None else node
+        if by == By.XPATH:
+            return [
+                item for item in node.xpath(value) if isinstance(getattr(item, "tag", None), str)
+            ]
+        if by == By.ID:
+            return node.xpath(f"{prefix}*[@id=$value]", value=value)
+        if by == By.NAME:
+            return node.xpath(f"{prefix}*[@name=$value]", value=value)
+        if by == By.CLASS_NAME:
+            return node.xpath(
+                f"{prefix}*[contains(concat(' ', normalize-space(@class), ' '), $value)]",
+                value=f" {value} ",
+            )
+        if by == By.LINK_TEXT:
+            return [
+                a
+                for a in node.xpath(f"{prefix}a")
+                if visible_text(a, self.is_hidden_node) == value.strip()
+            ]
+        if by == By.PARTIAL_LINK_TEXT:
+            return [
+                a
+                for a in node.xpath(f"{prefix}a")
+                if value in visible_text(a, self.is_hidden_node)
+            ]
+        return node.xpath(css_to_xpath(value, prefix))
+
+    def _find_elements(self, node, by, value) -> list[WebElement]:
+        return [self.element(item) for item in self.query(node, by, value)]
+
+    def _find_element(self, node, by, value) -> WebElement:
+        nodes = self.query(node, by, value)
+        if not nodes:
+            raise NoSuchElementException(f"No element matching {by}={value!r}")
+        return self.element(nodes[0])
+
+    def find_element(self, by=By.ID, value=None) -> WebElement:
+        return self._find_element(None, by, value)
+
+    def find_elements(self, by=By.ID, value=None) -> list[WebElement]:
+        return self._find_elements(None, by, value)
+
+    def execute_script(self, script: str, *args) -> Any:
+        """Evaluate locally the scripts sent by :py:mod:`manen` and Selenium to read values.
+        Any other script raises a :py:exc:`~selenium.common.exceptions.WebDriverException`."""
+        if script.startswith("/* getAttribute */"):
+            return args[0].get_attribute(args[1])
+        if script.startswith("/* isDisplayed */"):
+            return args[0].is_displayed()
+        if script in (READ_TEXTS_SCRIPT, READ_ATTRIBUTES_SCRIPT):
+            return self._read_values(*args)
+        if script == MATCH_SELECTORS_SCRIPT:
+            return self._match(*args)
+        if script == EXTRACT_SCRIPT:
+            return self._extract(args[0], args[1])
+        if script == EXTRACT_ROWS_SCRIPT:
+            scope, selectors, start, stop, fields = args
+            elements = self._first(scope, selectors, True)
+            if elements is None:
+                return None
+            return [self._extract(element, fields) for element in elements[start:stop]]
+        if script == EXTRACT_COLUMNS_SCRIPT:
+            scope, selectors, fields = args
+            elements = self._first(scope, selectors, True)
+            if elements is None:
+                return None
+            result = self._extract_columns(elements, fields)
+            return [len(elements), result, elements if result["incomplete"] else None]
+        if script == COUNT_ELEMENTS_SCRIPT:
+            match = self._match(args[0], args[1], True)
+            return [match[0], len(match[1]), match[1][: args[2]]] if match else None
+        if script == SLICE_ELEMENTS_SCRIPT:
+            scope, by, value, start, stop = args
+            node = scope.node if scope is not None else None
+            return self._find_elements(node, by, value)[start:stop]
+        if script == CAPTURE_SCRIPT:
+            return [self.source, self.url]
+        if script == READY_STATE_SCRIPT:
+            return "complete"
+        raise WebDriverException("Arbitrary JavaScript can not be executed on a snapshot.")
+
+    def execute_async_script(self, script: str, *args) -> Any:
+        """Evaluate locally the scripts used to wait for elements. As a snapshot never changes,
+        they return immediately (for instance ``None`` if the elements are not in the page)."""
+        if script == WAIT_FOR_ELEMENTS_SCRIPT:
+            scopes, selectors, many = args[:3]
+            return [self._first(scope, selectors, many) for scope in scopes]
+        if script == SCROLL_FOR_ITEMS_SCRIPT:
+            scope, selectors, token, _, scroll = args[:5]
+            marked = self._marks.setdefault(token, set())
+            elements = [
+                element
+                for element in self._first(scope, selectors, True) or []
+                if element.node not in marked
+            ]
+            marked.update(element.node for element in elements)
+            return [elements, scroll and not elements]
+        raise WebDriverException("Arbitrary JavaScript can not be executed on a snapshot.")
+
+    def _match(self, scope, selectors, many) -> tuple[int, list[SnapshotElement]] | None:
+        node = scope.node if scope is not None else None
+        for index, (by, value) in enumerate(selectors):
+            elements = self._find_elements(node, by, value)
+            if elements:
+                return index, elements if many else elements[:1]
+        return None
+
+    def _first(self, scope, selectors, many) -> list[SnapshotElement] | None:
+        match = self._match(scope, selectors, many)
+        return match[1] if match else None
+
+    @staticmethod
+    def _read(element: SnapshotElement, attribute: str | None) -> str | None:
+        return element.text if attribute is None else element.get_attribute(attribute)
+
+    def _read_values(self, scopes, selectors, many, attribute):
+        output = []
+        for scope in scopes:
+            elements = self._first(scope, selectors, many)
+            output.append(
+                None if elements is None else [self._read(el, attribute) for el in elements]
+            )
+        return output
+
+    def _extract_section(self, element: SnapshotElement, field):
+        if field.get("known") is None:
+            return self._extract(element, field["fields"])
+        fingerprint = int.from_bytes(
+            blake2b(etree.tostring(element.node, with_tail=False), digest_size=6).digest()
+        )
+        if str(fingerprint) in field["known"]:
+            return {"fingerprint": fingerprint}
+        return {**self._extract(element, field["fields"]), "fingerprint": fingerprint}
+
+    def _extract(self, scope, fields):
+        values, missing = {}, []
+        for field in fields:
+            elements = self._first(scope, field["selectors"], field["many"])
+            if elements is None:
+                missing.append(field["name"])
+                continue
+            if field["fields"] is not None:
+                items = [self._extract_section(el, field) for el in elements]
+            else:
+                items = [self._read(el, field["attribute"]) for el in elements]
+            values[field["name"]] = items if field["many"] else items[0]
+        return {"values": values, "missing": missing, "scope": scope if missing else None}
+
+    def _extract_columns(self, elements, fields):
+        columns, missing, incomplete = {}, {}, False
+        for field in fields:
+            found = [
+                None if el is None else self._first(el, field["selectors"], field["many"])
+                for el in elements
+            ]
+            rows = [
+                index
+                for index, match in enumerate(found)
+                if match is None and elements[index] is not None
+            ]
+            if rows:
+                missing[field["name"]] = rows
+                incomplete = True
+            if field["fields"] is not None and not field["many"]:
+                section = self._extract_columns(
+                    [None if match is None else match[0] for match in found], field["fields"]
+                )
+                incomplete = incomplete or section["incomplete"]
+                columns[field["name"]] = section
+                continue
+            if field["fields"] is not None:
+                read = partial(self._extract, fields=field["fields"])
+            else:
+                read = partial(self._read, attribute=field["attribute"])
+            columns[field["name"]] = [
+                None
+                if match is None
+                else [read(el) for el in match]
+                if field["many"]
+                else read(match[0])
+                for match in found
+            ]
+        return {"columns": columns, "missing": missing, "incomplete": incomplete}
+
+
+ELEMENT_NODE, TEXT_NODE, DOCUMENT_NODE = 1, 3, 9
+DOM_SNAPSHOT_STYLES = ("visibility",)
+ALWAYS_RENDERED_TAGS = {"optgroup", "option"}
+
+
+def parse_dom_snapshot(data: dict[str, Any]) -> tuple[Any, set, str]:
+    """Build a HTML document from the result of the DevTools command
+    ``DOMSnapshot.captureSnapshot`` (main frame only; shadow roots and frames are ignored).
+
+    Args:
+        data (dict[str, Any]): result of the command, called with the computed styles
+            :py:data:`DOM_SNAPSHOT_STYLES`
+
+    Returns:
+        tuple[HtmlElement, set[HtmlElement], str]: root of the document, elements which are not
+        rendered by the browser, and URL of the document
+    """
+    strings = data["strings"]
+    document = data["documents"][0]
+    nodes, layout = document["nodes"], document["layout"]
+
+    def string(index: int | None) -> str | None:
+        return strings[index] if index is not None and index >= 0 else None
+
+    def rare_strings(name: str) -> dict[int, str | None]:
+        rare = nodes.get(name) or {"index": [], "value": []}
+        return {index: string(value) for index, value in zip(rare["index"], rare["value"])}
+
+    parents, types = nodes["parentIndex"], nodes["nodeType"]
+    names, values, attributes = nodes["nodeName"], nodes["nodeValue"], nodes["attributes"]
+    input_values, text_values = rare_strings("inputValue"), rare_strings("textValue")
+    checked = set((nodes.get("inputChecked") or {"index": []})["index"])
+    selected = set((nodes.get("optionSelected") or {"index": []})["index"])
+
+    # A node is rendered if it has a layout object, or if one of its descendants has one (for
+    # instance with ``display: contents``)
+    invisible = set()
+    rendered = set()
+    for position, index in enumerate(layout["nodeIndex"]):
+        styles = layout["styles"][position] if layout.get("styles") else []
+        if styles and string(styles[0]) in ("hidden", "collapse"):
+            invisible.add(index)
+        while index >= 0 and index not in rendered:
+            rendered.add(index)
+            index = parents[index]
+
+    root, built, hidden = None, {}, set()
+    for index, node_type in enumerate(types):
+        parent = built.get(parents[index])
+        if node_type == TEXT_NODE and parent is not None:
+            text = string(values[index]) or ""
+            if len(parent):
+                parent[-1].tail = (parent[-1].tail or "") + text
+            elif parent.tag != "textarea" or index not in text_values:
+                parent.text = (parent.text or "") + text
+            continue
+        if node_type != ELEMENT_NODE:
+            continue
+        tag = (string(names[index]) or "").lower()
+        try:
+            if parent is not None:
+                element = etree.SubElement(parent, tag)
+            elif root is None and types[parents[index]] == DOCUMENT_NODE:
+                element = root = lxml_html.Element(tag)
+            else:
+                continue
+        except ValueError:
+            continue
+        items = attributes[index]
+        for position in range(0, len(items), 2):
+            try:
+                element.set(string(items[position]), string(items[position + 1]) or "")
+            except (TypeError, ValueError):
+                pass
+        if index in input_values:
+            element.set("value", input_values[index] or "")
+        if index in text_values:
+            element.text = text_values[index]
+        if tag == "input" and (element.get("type") or "").lower() in ("checkbox", "radio"):
+            element.attrib.pop("checked", None)
+            if index in checked:
+                element.set("checked", "")
+        if tag == "option":
+            element.attrib.pop("selected", None)
+            if index in selected:
+                element.set("selected", "")
+        if tag not in ALWAYS_RENDERED_TAGS and (index not in rendered or index in invisible):
+            hidden.add(element)
+        built[index] = element
+
+    if root is None:
+        root = lxml_html.Element("html")
+    return root, hidden, string(document.get("documentURL")) or "about:blank"
+
+
+class DevToolsSnapshot(Snapshot):
+    """:py:class:`Snapshot` built from the result of the DevTools command
+    ``DOMSnapshot.captureSnapshot``, where the elements are hidden if they are not rendered by the
+    browser.
+
+    Args:
+        data (dict[str, Any]): result of the command, called with the computed styles
+            :py:data:`DOM_SNAPSHOT_STYLES` (see :py:meth:`capture`)
+    """
+
+    def __init__(self, data: dict[str, Any]):
+        check_dependencies()
+        self.root, self.hidden_nodes, self.url = parse_dom_snapshot(data)
+        self._elements = {}
+        self._marks = {}
+
+    @cached_property
+    def source(self) -> str:  # type: ignore[override]
+        return etree.tostring(self.root, encoding="unicode", method="html")
+
+    @classmethod
+    def capture(cls, driver: WebDriver) -> "DevToolsSnapshot":
+        """Capture the current page of a Chromium-based driver, with one single DevTools
+        command.
+
+        Args:
+            driver (WebDriver): driver whose current page should be captured (it must have an
+                ``execute_cdp_cmd`` method, like :py:class:`~manen.browser.ChromeBrowser`)
+
+        Returns:
+            DevToolsSnapshot: snapshot of the page
+        """
+        data = driver.execute_cdp_cmd(  # type: ignore[attr-defined]
+            "DOMSnapshot.captureSnapshot", {"computedStyles": list(DOM_SNAPSHOT_STYLES)}
+        )
+        return cls(data)
+
+    def is_hidden_node(self, node) -> bool:
+        return node in self.hidden_nodes
@@ -0,0 +1,305 @@
+"""
+Fake WebDriver to test and benchmark code relying on :py:mod:`manen` without a browser.
+
+A :py:class:`FakeWebDriver` evaluates a static HTML page like a
+:py:class:`~manen.snapshot.Snapshot`, but every call that would be a WebDriver command with a
+real browser (finding elements, reading a text, executing a script...) is counted and can be
+delayed by a configurable latency. It makes it possible to measure the number of round trips
+performed by a page object, and how it behaves when each command is slow.
+
+.. code-block:: python
+
+    >>> from manen.testing import FakeWebDriver
+    >>> driver = FakeWebDriver(html, latency=0.002)
+    >>> BooksToScrapePage(driver).model_dump()
+    {...}
+    >>> driver.command_count
+    17
+    >>> driver.commands.most_common(2)
+    [('executeScript', 12), ('findElements', 2)]
+
+Like :py:class:`~manen.snapshot.Snapshot`, it requires the optional dependencies installed with
+``pip install manen[snapshot]``.
+"""
+
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from contextlib import contextmanager
+from typing import Any
+
+from selenium.common.exceptions import NoSuchWindowException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.switch_to import SwitchTo
+from selenium.webdriver.remote.webelement import WebElement
+
+from manen.instrumentation import count_command
+from manen.javascript import NAVIGATE_SCRIPT
+from manen.snapshot import Snapshot, SnapshotElement
+
+__all__ = ("FakeWebDriver", "FakeWebElement")
+
+
+class FakeWebElement(SnapshotElement):
+    """Element of a :py:class:`FakeWebDriver`. Each method sending a WebDriver command with a
+    real browser is counted by the driver."""
+
+    parent: "FakeWebDriver"
+
+    @property
+    def tag_name(self) -> str:
+        with self.parent.command("getElementTagName"):
+            return super().tag_name
+
+    @property
+    def text(self) -> str:
+        with self.parent.command("getElementText"):
+            return super().text
+
+    def is_displayed(self) -> bool:
+        with self.parent.command("executeScript"):
+            return super().is_displayed()
+
+    def get_dom_attribute(self, name: str) -> str | None:
+        with self.parent.command("getElementAttribute"):
+            return super().get_dom_attribute(name)
+
+    def get_property(self, name: str) -> Any:
+        with self.parent.command("getElementProperty"):
+            return super().get_property(name)
+
+    def get_attribute(self, name: str) -> str | None:
+        with self.parent.command("executeScript"):
+            return super().get_attribute(name)
+
+    def find_element(self, by=By.ID, value=None) -> WebElement:
+        with self.parent.command("findChildElement"):
+            return super().find_element(by, value)
+
+    def find_elements(self, by=By.ID, value=None) -> list[WebElement]:
+        with self.parent.command("findChildElements"):
+            return super().find_elements(by, value)
+
+
+def _capture_dom_snapshot(root, url: str, hidden: Callable[[Any], bool]) -> dict[str, Any]:
+    strings: dict[str, int] = {}
+    nodes: dict[str, list] = {
+        "parentIndex": [],
+        "nodeType": [],
+        "nodeName": [],
+        "nodeValue": [],
+        "attributes": [],
+        "inputChecked": {"index": []},
+        "optionSelected": {"index": []},
+    }
+    layout: dict[str, list] = {"nodeIndex": [], "styles": []}
+
+    def string(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+
+    def add(parent: int, node_type: int, name: str, value: str | None, rendered: bool, attrs=()):
+        index = len(nodes["parentIndex"])
+        nodes["parentIndex"].append(parent)
+        nodes["nodeType"].append(node_type)
+        nodes["nodeName"].append(string(name))
+        nodes["nodeValue"].append(-1 if value is None else string(value))
+        nodes["attributes"].append([string(item) for pair in attrs for item in pair])
+        if rendered:
+            layout["nodeIndex"].append(index)
+            layout["styles"].append([string("visible")])
+        return index
+
+    def walk(element, parent: int, rendered: bool):
+        rendered = rendered and not hidden(element)
+        index = add(parent, 1, element.tag.upper(), None, rendered, element.attrib.items())
+        if element.tag == "input" and element.get("checked") is not None:
+            nodes["inputChecked"]["index"].append(index)
+        if element.tag == "option" and element.get("selected") is not None:
+            nodes["optionSelected"]["index"].append(index)
+        if element.text:
+            add(index, 3, "#text", element.text, rendered)
+        for child in element:
+            if isinstance(child.tag, str):
+                walk(child, index, rendered)
+            if child.tail:
+                add(index, 3, "#text", child.tail, rendered)
+
+    walk(root, add(-1, 9, "#document", None, True), True)
+    document = {"documentURL": string(url), "nodes": nodes, "layout": layout}
+    return {"documents": [document], "strings": list(strings)}
+
+
+class FakeWebDriver(Snapshot):
+    """Read-only :py:class:`~selenium.webdriver.remote.webdriver.WebDriver` evaluating a static
+    HTML page, counting the WebDriver commands and simulating their latency.
+
+    The commands are named after the Selenium commands (see
+    :py:class:`~selenium.webdriver.remote.command.Command`), like ``findElement`` or
+    ``getElementText``; the scripts are counted as ``executeScript`` and
+    ``executeAsyncScript``. The commands sent while another command is
+    evaluated (for instance the elements read by a script) are not counted, as they would be
+    performed inside the browser.
+
+    The driver can also navigate between several static pages (with
+    :py:meth:`~selenium.webdriver.remote.webdriver.WebDriver.get`) and open, switch to and close
+    tabs, to test scripts going through several pages.
+
+    Args:
+        source (str): HTML source code of the page
+        url (str, optional): URL of the page. Defaults to ``about:blank``.
+        latency (float, optional): number of seconds each command takes. Defaults to 0.
+        pages (dict[str, str], optional): HTML source code of the other pages which can be
+            opened, by URL. Defaults to None.
+    """
+
+    element_class = FakeWebElement
+
+    def __init__(
+        self,
+        source: str,
+        url: str = "about:blank",
+        latency: float = 0.0,
+        pages: dict[str, str] | None = None,
+    ):
+        super().__init__(source, url=url)
+        self.latency = latency
+        self.pages = {"about:blank": "<html></html>", url: source, **(pages or {})}
+        self.commands: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._switch_to = SwitchTo(self)
+        self._handle: str | None = "window-0"
+        self._windows = {"window-0": self._state()}
+        self._nb_windows = 1
+
+    @property
+    def command_count(self) -> int:
+        """Total number of commands sent to the driver."""
+        return self.commands.total()
+
+    def reset_commands(self) -> Counter[str]:
+        """Reset the command counters.
+
+        Returns:
+            Counter[str]: number of commands sent since the last reset, by command name
+        """
+        with self._lock:
+            commands, self.commands = self.commands, Counter()
+        return commands
+
+    @contextmanager
+    def command(self, name: str):
+        """Context manager wrapping the evaluation of a WebDriver command: the command is counted
+        and delayed by the latency of the driver, unless it is nested in another command."""
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            with self._lock:
+                self.commands[name] += 1
+            count_command()
+            if self.latency:
+                time.sleep(self.latency)
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+
+    @property
+    def title(self) -> str:
+        with self.command("getTitle"):
+            return super().title
+
+    @property
+    def current_url(self) -> str:
+        with self.command("getCurrentUrl"):
+            return super().current_url
+
+    @property
+    def page_source(self) -> str:
+        with self.command("getPageSource"):
+            return super().page_source
+
+    def find_element(self, by=By.ID, value=None) -> WebElement:
+        with self.command("findElement"):
+            return super().find_element(by, value)
+
+    def find_elements(self, by=By.ID, value=None) -> list[WebElement]:
+        with self.command("findElements"):
+            return super().find_elements(by, value)
+
+    def execute_script(self, script: str, *args) -> Any:
+        with self.command("executeScript"):
+            if script == NAVIGATE_SCRIPT:
+                return self._navigate(args[0])
+            return super().execute_script(script, *args)
+
+    def execute_async_script(self, script: str, *args) -> Any:
+        with self.command("executeAsyncScript"):
+            return super().execute_async_script(script, *args)
+
+    def close(self):
+        self.execute(Command.CLOSE)
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict) -> Any:
+        """Evaluate locally the DevTools command ``DOMSnapshot.captureSnapshot`` (see
+        :py:class:`~manen.snapshot.DevToolsSnapshot`); the elements explicitly hidden in the HTML
+        source code are not rendered. Any other command raises a
+        :py:exc:`~selenium.common.exceptions.WebDriverException`."""
+        with self.command("executeCdpCommand"):
+            if cmd == "DOMSnapshot.captureSnapshot":
+                return _capture_dom_snapshot(self.root, self.url, self.is_hidden_node)
+            raise WebDriverException(f"The DevTools command `{cmd}` is not supported.")
+
+    def execute(self, driver_command: str, params: dict | None = None):
+        """Evaluate locally the commands used to navigate between pages and windows. Any other
+        command raises a :py:exc:`~selenium.common.exceptions.WebDriverException`."""
+        handler = {
+            Command.GET: self._get,
+            Command.NEW_WINDOW: self._new_window,
+            Command.SWITCH_TO_WINDOW: self._switch_to_window,
+            Command.CLOSE: self._close,
+            Command.W3C_GET_CURRENT_WINDOW_HANDLE: self._current_window_handle,
+            Command.W3C_GET_WINDOW_HANDLES: lambda params: list(self._windows),
+        }.get(driver_command)
+        if handler is None:
+            return super().execute(driver_command, params)
+        with self.command(driver_command):
+            return {"value": handler(params or {})}
+
+    def _state(self) -> tuple:
+        return self.source, self.url, self.root, self._elements, self._marks
+
+    def _navigate(self, url: str):
+        if url not in self.pages:
+            raise WebDriverException(f"No page available at {url}")
+        Snapshot.__init__(self, self.pages[url], url=url)
+        self._windows[self._current_window_handle({})] = self._state()
+
+    def _get(self, params: dict):
+        self._navigate(params["url"])
+
+    def _new_window(self, params: dict) -> dict:
+        handle = f"window-{self._nb_windows}"
+        self._nb_windows += 1
+        Snapshot.__init__(self, self.pages["about:blank"])
+        self._windows[handle] = self._state()
+        self._handle = handle
+        return {"handle": handle, "type": params.get("type") or "tab"}
+
+    def _switch_to_window(self, params: dict):
+        if params["handle"] not in self._windows:
+            raise NoSuchWindowException(f"No window with the handle {params['handle']}")
+        self._handle = params["handle"]
+        state = self._windows[self._handle]
+        self.source, self.url, self.root, self._elements, self._marks = state
+
+    def _close(self, params: dict):
+        del self._windows[self._current_window_handle(params)]
+        self._handle = None
+
+    def _current_window_handle(self, params: dict) -> str:
+        if self._handle is None:
+            raise NoSuchWindowException("The current window has been closed")
+        return self._handle
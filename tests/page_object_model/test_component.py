@@ -0,0 +1,70 @@
+from typing import Annotated
+
+from manen.page_object_model import dom_value as dom
+from manen.page_object_model.component import Component
+from manen.page_object_model.config import CSS
+from manen.page_object_model.types import checkbox, input_value
+
+
+def test_config_compiled_at_class_creation():
+    class Section(Component):
+        title: Annotated[str, CSS("h1")]
+        tags: Annotated[list[str], CSS("span.tag")]
+        query: Annotated[input_value, CSS("input")]
+        accept: Annotated[checkbox, CSS("input.accept")]
+
+    class Page(Component):
+        section: Annotated[Section, CSS("section")]
+        sections: Annotated[list[Section], CSS("section")]
+
+    assert list(Section._config) == ["title", "tags", "query", "accept"]
+    assert isinstance(Section.__dict__["title"], dom.DOMValue)
+    assert isinstance(Section.__dict__["tags"], dom.DOMValues)
+    assert isinstance(Section.__dict__["query"], dom.InputDOMValue)
+    assert isinstance(Section.__dict__["accept"], dom.CheckboxDOMValue)
+    assert isinstance(Page.__dict__["section"], dom.DOMSection)
+    assert isinstance(Page.__dict__["sections"], dom.DOMSections)
+
+
+def test_config_shared_by_instances():
+    class Section(Component):
+        title: Annotated[str, CSS("h1")]
+
+    descriptor = Section.__dict__["title"]
+    first, second = Section(object()), Section(object())  # type: ignore
+    assert first._config is second._config is Section._config
+    assert Section.__dict__["title"] is descriptor
+
+
+class StubScope:
+    def find_element(self, by, value):
+        return StubScope()
+
+    def find_elements(self, by, value):
+        return [StubScope(), StubScope()]
+
+
+def test_sections_are_instances_of_declared_class():
+    class Section(Component):
+        title: Annotated[str, CSS("h1")]
+
+    class Page(Component):
+        section: Annotated[Section, CSS("section")]
+        sections: Annotated[list[Section], CSS("section")]
+
+    page = Page(StubScope())  # type: ignore
+    assert type(page.section) is Section
+    assert all(type(section) is Section for section in page.sections)
+
+
+def test_components_slots_are_opt_in():
+    class Section(Component):
+        title: Annotated[str, CSS("h1")]
+
+    class SlottedSection(Component, slots=True):
+        title: Annotated[str, CSS("h1")]
+
+    section = Section(StubScope())  # type: ignore
+    section.extra = 1
+    assert section.extra == 1
+    assert not hasattr(SlottedSection(StubScope()), "__dict__")  # type: ignore
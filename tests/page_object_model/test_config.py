@@ -2,8 +2,10 @@ from datetime import date, datetime
 from typing import Annotated
 
 import pytest
+from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
+from manen.finder import Selector
 from manen.page_object_model.component import Component
 from manen.page_object_model.config import (
     CSS,
@@ -66,9 +68,9 @@ def test_config_type(type_):
 @pytest.mark.parametrize(
     "selector,expected",
     [
-        (CSS("a"), ["css:a"]),
-        (XPath("//b"), ["xpath://b"]),
-        (LinkText("c"), ["link_text:c"]),
+        (CSS("a"), [Selector(By.CSS_SELECTOR, "a")]),
+        (XPath("//b"), [Selector(By.XPATH, "//b")]),
+        (LinkText("c"), [Selector(By.LINK_TEXT, "c")]),
     ],
 )
 def test_config_selector(selector, expected):
@@ -121,7 +123,7 @@ def test_config_with_component():
     assert config.name == "section"
     assert config.element_type == PageSection
     assert config.many
-    assert config.selectors == ["css:section"]
+    assert config.selectors == [Selector(By.CSS_SELECTOR, "section")]
 
 
 @pytest.mark.parametrize(
@@ -137,7 +139,7 @@ def test_config_with_component():
             Config(
                 name="field",
                 element_type=datetime,
-                selectors=["css:span.package-snippet__created time"],
+                selectors=[Selector(By.CSS_SELECTOR, "span.package-snippet__created time")],
                 many=False,
                 attribute="datetime",
                 format="%Y-%m-%dT%H:%M:%S%z",
@@ -149,7 +151,7 @@ def test_config_with_component():
             Config(
                 name="field",
                 element_type=bool,
-                selectors=["css:input"],
+                selectors=[Selector(By.CSS_SELECTOR, "input")],
                 many=False,
                 wait=0,
                 is_checkbox=True,
@@ -160,7 +162,7 @@ def test_config_with_component():
             Config(
                 name="field",
                 element_type=WebElement,
-                selectors=["css:label"],
+                selectors=[Selector(By.CSS_SELECTOR, "label")],
                 many=False,
                 wait=0,
             ),
@@ -170,7 +172,7 @@ def test_config_with_component():
             Config(
                 name="field",
                 element_type=float,
-                selectors=["css:span.country-area"],
+                selectors=[Selector(By.CSS_SELECTOR, "span.country-area")],
                 many=False,
                 wait=0,
             ),
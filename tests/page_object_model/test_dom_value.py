@@ -0,0 +1,56 @@
+from typing import Annotated
+
+from selenium.webdriver.remote.webelement import WebElement
+
+from manen.javascript import READ_TEXTS_SCRIPT
+from manen.page_object_model.component import Component, Page
+from manen.page_object_model.config import CSS, Default
+
+
+class ListingPage(Page):
+    class Row(Component):
+        name: Annotated[str, CSS("td.name")]
+        wins: Annotated[list[int], CSS("td.wins")]
+
+    rows: Annotated[list[Row], CSS("tr")]
+    tags: Annotated[list[str], CSS("span.tag")]
+    missing: Annotated[list[str], CSS("span.missing"), Default([])]
+
+
+class ReadValuesDriver:
+    def __init__(self, nb_rows):
+        self.rows = [WebElement(self, f"row-{i}") for i in range(nb_rows)]
+        self.scripts = []
+
+    def find_elements(self, by, value):
+        return self.rows if value == "tr" else []
+
+    def execute_script(self, script, scopes, selectors, many, attribute):
+        assert script == READ_TEXTS_SCRIPT
+        self.scripts.append(selectors)
+        (_, selector), *_ = selectors
+        if selector == "span.missing":
+            return [None]
+        if scopes == [None]:
+            return [["a", "b"]]
+        if selector == "td.wins":
+            return [["3", "4"] for _ in scopes]
+        return [[f"{selector} {scope.id}"] for scope in scopes]
+
+
+def test_dom_values_read_in_one_command():
+    driver = ReadValuesDriver(nb_rows=0)
+    page = ListingPage(driver)  # type: ignore
+    assert page.tags == ["a", "b"]
+    assert page.missing == []
+    assert len(driver.scripts) == 2
+
+
+def test_siblings_read_in_one_command():
+    driver = ReadValuesDriver(nb_rows=50)
+    rows = ListingPage(driver).rows  # type: ignore
+    assert [row.name for row in rows] == [f"td.name row-{i}" for i in range(50)]
+    assert [row.wins for row in rows] == [[3, 4]] * 50
+    assert len(driver.scripts) == 2
+    assert rows[3].name == "td.name row-3"
+    assert len(driver.scripts) == 3
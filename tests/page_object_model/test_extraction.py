@@ -0,0 +1,216 @@
+from array import array
+from typing import Annotated
+
+import pytest
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+from manen.finder import Selector
+from manen.page_object_model.component import Component, Page
+from manen.page_object_model.config import CSS, Attribute, Default, XPath
+from manen.page_object_model.extraction import compile_spec
+from manen.page_object_model.types import checkbox, href
+from manen.testing import FakeWebDriver
+
+
+class BookPage(Page):
+    class Book(Component):
+        title: Annotated[str, Attribute("title"), CSS("h3 a")]
+        price: Annotated[float, CSS("p.price")]
+        link: Annotated[WebElement, CSS("h3 a")]
+
+    heading: Annotated[str, CSS("h1"), XPath("//h2")]
+    links: Annotated[list[href], CSS("a")]
+    accept: Annotated[checkbox, CSS("input.accept")]
+    books: Annotated[list[Book], CSS("article")]
+
+
+class ScriptDriver:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        return self.result
+
+
+def test_compile_spec():
+    spec = compile_spec(BookPage._config)
+    assert spec == [
+        {
+            "name": "heading",
+            "selectors": [Selector(By.CSS_SELECTOR, "h1"), Selector(By.XPATH, "//h2")],
+            "many": False,
+            "attribute": None,
+            "fields": None,
+            "known": None,
+        },
+        {
+            "name": "links",
+            "selectors": [Selector(By.CSS_SELECTOR, "a")],
+            "many": True,
+            "attribute": "href",
+            "fields": None,
+            "known": None,
+        },
+        {
+            "name": "accept",
+            "selectors": [Selector(By.CSS_SELECTOR, "input.accept")],
+            "many": False,
+            "attribute": "checked",
+            "fields": None,
+            "known": None,
+        },
+        {
+            "name": "books",
+            "selectors": [Selector(By.CSS_SELECTOR, "article")],
+            "many": True,
+            "attribute": None,
+            "fields": [
+                {
+                    "name": "title",
+                    "selectors": [Selector(By.CSS_SELECTOR, "h3 a")],
+                    "many": False,
+                    "attribute": "title",
+                    "fields": None,
+                    "known": None,
+                },
+                {
+                    "name": "price",
+                    "selectors": [Selector(By.CSS_SELECTOR, "p.price")],
+                    "many": False,
+                    "attribute": None,
+                    "fields": None,
+                    "known": None,
+                },
+            ],
+            "known": None,
+        },
+    ]
+
+
+def test_model_dump_with_js():
+    book = {"values": {"title": "A book", "price": "12.5"}, "missing": [], "scope": None}
+    driver = ScriptDriver(
+        {
+            "values": {
+                "heading": "Books",
+                "links": ["https://a.com", None],
+                "accept": "true",
+                "books": [book, book],
+            },
+            "missing": [],
+            "scope": None,
+        }
+    )
+    dump = BookPage(driver).model_dump(with_js=True)  # type: ignore
+    assert driver.calls == 1
+    assert dump == {
+        "heading": "Books",
+        "links": ["https://a.com", ""],
+        "accept": True,
+        "books": [{"title": "A book", "price": 12.5}, {"title": "A book", "price": 12.5}],
+    }
+
+
+class CataloguePage(Page):
+    class Book(Component):
+        class Author(Component):
+            name: Annotated[str, CSS("span.name")]
+            born: Annotated[int, Attribute("data-born"), CSS("span.name")]
+
+        title: Annotated[str, CSS("h3")]
+        price: Annotated[float, CSS("p.price")]
+        author: Annotated[Author, CSS("p.author")]
+        tags: Annotated[list[str], CSS("span.tag")]
+
+    books: Annotated[list[Book], CSS("li.book")]
+    reviews: Annotated[list[Book], CSS("li.review"), Default([])]
+
+
+HTML = "<html><body><ol>{}</ol></body></html>".format(
+    "".join(
+        f"<li class='book'><h3>Book {i}</h3><p class='price'>{i}.5</p>"
+        f"<p class='author'><span class='name' data-born='{1900 + i}'>Author {i}</span></p>"
+        f"<span class='tag'>tag {i}</span><span class='tag'>other</span></li>"
+        for i in range(120)
+    )
+)
+
+
+def fake_driver(html):
+    pytest.importorskip("lxml")
+    pytest.importorskip("cssselect")
+    return FakeWebDriver(html)
+
+
+@pytest.fixture
+def driver():
+    return fake_driver(HTML)
+
+
+def transpose(rows, fields):
+    columns = {field: [row and row[field] for row in rows] for field in fields}
+    return {
+        field: (
+            transpose(column, list(column[0]))
+            if column and isinstance(column[0], dict)
+            else column
+        )
+        for field, column in columns.items()
+    }
+
+
+def test_model_columns(driver):
+    columns = CataloguePage(driver).model_columns("books")
+    assert driver.commands == {"executeScript": 1}
+    rows = CataloguePage(driver).model_dump()["books"]
+    assert columns == transpose(rows, ["title", "price", "author", "tags"])
+    assert CataloguePage(driver).model_columns("reviews") == {
+        "title": [],
+        "price": [],
+        "author": {"name": [], "born": []},
+        "tags": [],
+    }
+
+
+def test_model_columns_packed(driver):
+    columns = CataloguePage(driver).model_columns("books", pack="array")
+    assert columns["price"] == array("d", [i + 0.5 for i in range(120)])
+    assert columns["author"]["born"] == array("q", range(1900, 2020))
+    assert columns["title"][:2] == ["Book 0", "Book 1"]
+
+    numpy = pytest.importorskip("numpy")
+    columns = CataloguePage(driver).model_columns("books", pack="numpy")
+    assert columns["price"].dtype == numpy.float64
+    assert columns["author"]["born"].sum() == sum(range(1900, 2020))
+
+
+class PartialPage(Page):
+    class Book(Component):
+        class Author(Component):
+            name: Annotated[str, CSS("span.name")]
+            born: Annotated[int | None, CSS("span.born"), Default(None)]
+
+        price: Annotated[float | None, CSS("p.price"), Default(None)]
+        author: Annotated[Author | None, CSS("p.author"), Default(None)]
+
+    books: Annotated[list[Book], CSS("li.book")]
+
+
+def test_model_columns_missing_fields():
+    driver = fake_driver(
+        "<ol>"
+        "<li class='book'><p class='price'>1.5</p>"
+        "<p class='author'><span class='name'>A</span><span class='born'>1900</span></p></li>"
+        "<li class='book'><p class='author'><span class='name'>B</span></p></li>"
+        "<li class='book'><p class='price'>3.5</p></li>"
+        "</ol>"
+    )
+    columns = PartialPage(driver).model_columns("books", pack="array")
+    assert columns == {
+        "price": [1.5, None, 3.5],
+        "author": {"name": ["A", "B", None], "born": [1900, None, None]},
+    }
+    assert columns == transpose(PartialPage(driver).model_dump()["books"], ["price", "author"])
@@ -0,0 +1,136 @@
+from typing import Annotated
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from manen.checkpoint import Checkpoint
+from manen.javascript import SCROLL_FOR_ITEMS_SCRIPT
+from manen.page_object_model.component import Component, Page
+from manen.page_object_model.config import CSS, Default, XPath
+from manen.page_object_model.pagination import infinite_scroll, paginate
+from manen.page_object_model.types import href
+
+pytest.importorskip("lxml")
+pytest.importorskip("cssselect")
+
+from manen.testing import FakeWebDriver
+
+
+def listing(page: int, next_page: int) -> str:
+    items = "".join(f'<li class="item">{page}.{i}</li>' for i in range(3))
+    return f'<html><ul>{items}</ul><a class="next" href="/page/{next_page}">next</a></html>'
+
+
+class ListingPage(Page):
+    items: Annotated[list[str], CSS("li.item")]
+    next_url: Annotated[href | None, CSS("a.next")]
+
+
+@pytest.fixture
+def driver():
+    # The last page links to the first one
+    pages = {f"https://site.com/page/{i}": listing(i, i % 3 + 1) for i in range(1, 4)}
+    return FakeWebDriver(pages["https://site.com/page/1"], "https://site.com/page/1", pages=pages)
+
+
+def test_paginate_stops_on_cycle(driver):
+    pages = paginate(driver, ListingPage, "next_url")
+    assert [page.items[0] for page in pages] == ["1.0", "2.0", "3.0"]
+
+
+def test_paginate_items_with_selector(driver):
+    items = list(paginate(driver, ListingPage, "css:a.next", items="items", max_pages=2))
+    assert items == ["1.0", "1.1", "1.2", "2.0", "2.1", "2.2"]
+    assert driver.commands["get"] == 1
+
+
+class EmptyListingPage(ListingPage):
+    items: Annotated[list[str] | None, CSS("li.missing"), Default(None)]
+
+
+def test_paginate_items_default_none(driver):
+    assert list(paginate(driver, EmptyListingPage, "next_url", items="items")) == []
+
+
+def test_paginate_with_prefetch(driver):
+    items = list(paginate(driver, ListingPage, "next_url", items="items", prefetch=True))
+    assert len(items) == 9
+    assert "get" not in driver.commands
+    assert driver.commands["newWindow"] == 2
+    assert driver.window_handles == ["window-2"]
+    assert driver.current_url == "https://site.com/page/3"
+
+
+def test_prefetched_tab_closed_when_stopped(driver):
+    items = paginate(driver, ListingPage, "next_url", items="items", prefetch=True)
+    assert next(items) == "1.0"
+    items.close()
+    assert driver.window_handles == ["window-0"]
+
+
+def test_paginate_resumed_from_checkpoint(driver, tmp_path):
+    with Checkpoint(tmp_path / "listing.checkpoint") as checkpoint:
+        items = paginate(driver, ListingPage, "next_url", items="items", checkpoint=checkpoint)
+        assert [next(items) for _ in range(4)] == ["1.0", "1.1", "1.2", "2.0"]
+        items.close()
+    assert len(Checkpoint(tmp_path / "listing.checkpoint")) == 1
+
+    driver.get("https://site.com/page/1")
+    with Checkpoint(tmp_path / "listing.checkpoint") as checkpoint:
+        items = paginate(driver, ListingPage, "next_url", items="items", checkpoint=checkpoint)
+        assert list(items)[:1] == ["2.0"]
+        assert len(checkpoint) == 3
+
+
+class FeedDriver(FakeWebDriver):
+    """Driver adding a batch of items to the feed each time the page is scrolled."""
+
+    def __init__(self, nb_batches: int):
+        super().__init__('<html><ul class="feed"><li>0</li><li>1</li></ul></html>')
+        self.nb_batches = nb_batches
+
+    def execute_async_script(self, script, *args):
+        with self.command("executeAsyncScript"):
+            elements, scrolled = super().execute_async_script(script, *args)
+            if script == SCROLL_FOR_ITEMS_SCRIPT and scrolled and self.nb_batches:
+                self.nb_batches -= 1
+                feed = self.root.find(".//ul")
+                for _ in range(2):
+                    item = feed.makeelement("li")
+                    item.text = str(len(feed))
+                    feed.append(item)
+                elements, _ = super().execute_async_script(script, *args)
+            return elements, scrolled
+
+
+class FeedItem(Component):
+    text: Annotated[str, XPath(".")]
+
+
+def test_infinite_scroll_until_stable():
+    driver = FeedDriver(nb_batches=3)
+    items = infinite_scroll(driver, FeedItem, "css:ul.feed li", timeout=0.1)
+    assert [item.text for item in items] == [str(i) for i in range(8)]
+    assert driver.commands["executeAsyncScript"] == 5
+
+
+class SlowFeedDriver(FeedDriver):
+    """Driver whose script timeout is reached when no item appears after a scroll."""
+
+    def execute_async_script(self, script, *args):
+        elements, scrolled = super().execute_async_script(script, *args)
+        if not elements:
+            raise TimeoutException("script timeout")
+        return elements, scrolled
+
+
+def test_infinite_scroll_script_timeout():
+    items = infinite_scroll(SlowFeedDriver(nb_batches=1), FeedItem, "css:li", timeout=60)
+    assert [item.text for item in items] == ["0", "1", "2", "3"]
+
+
+def test_infinite_scroll_budgets():
+    items = infinite_scroll(FeedDriver(nb_batches=3), FeedItem, "css:li", max_scrolls=1)
+    assert len(list(items)) == 4
+    items = infinite_scroll(FeedDriver(nb_batches=3), FeedItem, "css:li", max_items=5)
+    assert len(list(items)) == 5
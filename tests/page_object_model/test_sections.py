@@ -0,0 +1,56 @@
+from typing import Annotated
+
+import pytest
+
+from manen.page_object_model.component import Component, Page
+from manen.page_object_model.config import CSS, Default
+from manen.page_object_model.dom_value import ComponentSequence
+
+pytest.importorskip("lxml")
+pytest.importorskip("cssselect")
+
+from manen.testing import FakeWebDriver
+
+ROWS = "".join(f'<tr class="row"><td class="id">{i}</td></tr>' for i in range(120))
+HTML = f"<html><body><table>{ROWS}</table></body></html>"
+
+
+class TablePage(Page):
+    class Row(Component):
+        id: Annotated[int, CSS("td.id")]
+
+    rows: Annotated[list[Row], CSS("tr.missing"), CSS("tr.row")]
+    missing: Annotated[list[Row], CSS("tr.missing"), Default([])]
+
+
+@pytest.fixture
+def driver():
+    return FakeWebDriver(HTML)
+
+
+def test_len_costs_one_command(driver):
+    rows = TablePage(driver).rows
+    assert isinstance(rows, ComponentSequence)
+    assert len(rows) == 120
+    assert rows[0].id == 0
+    assert driver.commands == {"executeScript": 2}
+
+
+def test_components_are_fetched_by_chunks(driver):
+    rows = TablePage(driver).rows
+    assert rows[-1].id == 119
+    assert [row.id for row in rows[48:52]] == [48, 49, 50, 51]
+    # 1 count + 2 chunks fetched + 3 reads of `id` (one per chunk)
+    assert driver.command_count == 6
+    with pytest.raises(IndexError):
+        rows[120]
+
+
+def test_iteration(driver):
+    assert [row.id for row in TablePage(driver).rows] == list(range(120))
+    # 1 count + 2 chunks fetched + 3 reads of `id` (one per chunk)
+    assert driver.command_count == 6
+
+
+def test_default_when_no_element(driver):
+    assert TablePage(driver).missing == []
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from manen.exceptions import ElementNotFound, PollTimeoutException
+from manen.finder import afind
+from manen.helpers import apoll
+
+
+class SlowScope:
+    """Scope where an element appears after a given number of lookups."""
+
+    def __init__(self, appears_after: int):
+        self.appears_after = appears_after
+        self.lookups = 0
+        self.title = "Slow page"
+        self.current_url = "https://example.com"
+        self.parent = self
+
+    def find_elements(self, by, value):
+        self.lookups += 1
+        return ["element"] if self.lookups > self.appears_after else []
+
+
+def test_apoll():
+    attempts = []
+
+    async def attempt():
+        attempts.append(1)
+        return len(attempts) if len(attempts) == 3 else None
+
+    assert asyncio.run(apoll(attempt, step=0.01, timeout=1)) == 3
+
+
+def test_apoll_timeout():
+    with pytest.raises(PollTimeoutException):
+        asyncio.run(apoll(lambda: None, step=0.01, timeout=0.05))
+
+
+def test_afind_wait():
+    scope = SlowScope(appears_after=1)
+    assert asyncio.run(afind("div", inside=scope, many=True, wait=2)) == ["element"]  # type: ignore
+    assert scope.lookups == 2
+
+
+def test_afind_several_scopes():
+    scopes = [SlowScope(appears_after=0), SlowScope(appears_after=10)]
+    output = asyncio.run(afind("div", inside=scopes, many=True, default=[]))  # type: ignore
+    assert output == [["element"], []]
+
+
+def test_afind_not_found():
+    with pytest.raises(ElementNotFound):
+        asyncio.run(afind("div", inside=SlowScope(appears_after=10), many=True))  # type: ignore
+
+
+def test_afind_partial():
+    lookup = asyncio.run(afind(inside=SlowScope(appears_after=0), many=True))  # type: ignore
+    assert asyncio.run(lookup("div")) == ["element"]
+
+
+def test_amodel_dump():
+    pytest.importorskip("lxml")
+    from manen.snapshot import Snapshot
+
+    from .test_snapshot import HTML, CataloguePage
+
+    page = CataloguePage(Snapshot(HTML))
+
+    async def dump():
+        return await asyncio.gather(page.aget("heading"), page.amodel_dump())
+
+    heading, dump = asyncio.run(dump())
+    assert heading == "All products"
+    assert dump == page.model_dump()
@@ -0,0 +1,333 @@
+import json
+import threading
+from fnmatch import fnmatchcase
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from selenium.webdriver.remote.switch_to import SwitchTo
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from manen.browser import (
+    BrowserMixin,
+    BrowserPool,
+    ChromeBrowser,
+    NetworkStats,
+    ResourceType,
+    blocked_url_patterns,
+)
+from manen.javascript import NAVIGATE_SCRIPT, READY_STATE_SCRIPT
+from manen.page_object_model.component import Page
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.alive = True
+        self.resets = 0
+        self.quit_called = False
+
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return ["main"]
+
+    def reset(self):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        self.resets += 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_lease_and_reset():
+    with BrowserPool(size=2, factory=FakeBrowser) as pool:
+        with pool.lease() as browser_1, pool.lease() as browser_2:
+            assert browser_1 is not browser_2
+            assert pool.stats.available == 0
+        assert browser_1.resets == browser_2.resets == 1
+        assert pool.stats.available == 2
+        assert pool.stats.leases == 2
+    assert browser_1.quit_called and browser_2.quit_called
+
+
+def test_crashed_browser_replaced():
+    with BrowserPool(size=1, factory=FakeBrowser) as pool:
+        with pool.lease() as browser:
+            browser.alive = False
+        with pool.lease() as new_browser:
+            assert new_browser is not browser
+        assert browser.quit_called
+        assert pool.stats.replacements == 1
+
+
+def test_driver_crash_replaced():
+    def refuse_connection():
+        raise ConnectionRefusedError("chromedriver is gone")
+
+    with BrowserPool(size=1, factory=FakeBrowser) as pool:
+        with pool.lease() as browser:
+            # When chromedriver itself died, the errors are connection errors
+            browser.reset = browser.quit = refuse_connection
+        with pool.lease(timeout=1) as new_browser:
+            assert new_browser is not browser
+        assert pool.stats.replacements == 1
+
+
+def test_failed_replacement_keeps_the_slot():
+    factory_broken = False
+
+    def factory():
+        if factory_broken:
+            raise RuntimeError("chromedriver failed to start")
+        return FakeBrowser()
+
+    with BrowserPool(size=1, factory=factory) as pool:
+        factory_broken = True
+        with pytest.raises(ValueError, match="job failed"), pool.lease() as browser:
+            browser.alive = False
+            raise ValueError("job failed")
+        assert pool.stats.available == 1
+        with pytest.raises(RuntimeError, match="failed to start"), pool.lease(timeout=1):
+            pass
+        assert pool.stats.available == 1
+        factory_broken = False
+        with pool.lease(timeout=1) as new_browser:
+            assert new_browser is not browser
+        assert pool.stats.replacements == 1
+
+
+def test_start_failure_quits_started_browsers():
+    started = []
+    lock = threading.Lock()
+
+    def factory():
+        with lock:
+            if len(started) == 2:
+                started.append(None)
+                raise RuntimeError("chromedriver failed to start")
+            browser = FakeBrowser()
+            started.append(browser)
+            return browser
+
+    pool = BrowserPool(size=4, factory=factory)
+    with pytest.raises(RuntimeError, match="failed to start"):
+        pool.start()
+    browsers = [browser for browser in started if browser is not None]
+    assert len(browsers) == 3
+    assert all(browser.quit_called for browser in browsers)
+    assert pool.stats.available == 0
+
+
+def test_lease_timeout():
+    with (
+        BrowserPool(size=1, factory=FakeBrowser) as pool,
+        pool.lease(),
+        pytest.raises(TimeoutError),
+        pool.lease(timeout=0.01),
+    ):
+        pass
+
+
+def test_concurrent_leases():
+    leased = []
+    with BrowserPool(size=2, factory=FakeBrowser) as pool:
+
+        def job():
+            with pool.lease(timeout=5) as browser:
+                leased.append(browser)
+
+        threads = [threading.Thread(target=job) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = pool.stats
+    assert len(leased) == 10
+    assert len(set(map(id, leased))) == 2
+    assert stats.leases == 10
+    assert 0 <= stats.utilization <= 1
+
+
+def test_pool_not_started():
+    with pytest.raises(RuntimeError), BrowserPool(size=1, factory=FakeBrowser).lease():
+        pass
+
+
+class RecordingChromeBrowser(ChromeBrowser):
+    def __init__(self, options, service):
+        self.options = options
+        self.cdp_commands = []
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.cdp_commands.append((cmd, cmd_args))
+
+
+def test_initialize_with_blocked_requests():
+    browser = RecordingChromeBrowser.initialize(
+        page_load_strategy="eager",
+        blocked_resources=[ResourceType.FONT, "stylesheet"],
+        blocked_urls=["*doubleclick.net*", "*.css"],
+    )
+    assert browser.options.page_load_strategy == "eager"
+    assert "goog:loggingPrefs" not in browser.options.capabilities
+    assert browser.cdp_commands[-1] == (
+        "Network.setBlockedURLs",
+        {
+            "urls": [
+                *(
+                    f"*.{extension}{suffix}"
+                    for extension in ("eot", "otf", "ttf", "woff", "woff2", "css")
+                    for suffix in ("", "?*", "#*")
+                ),
+                "*doubleclick.net*",
+            ]
+        },
+    )
+
+    browser = RecordingChromeBrowser.initialize(network_stats=True)
+    assert browser.options.capabilities["goog:loggingPrefs"] == {"performance": "ALL"}
+    assert browser.cdp_commands == []
+
+
+@pytest.mark.parametrize(
+    "url, blocked",
+    [
+        ("https://cdn.example.com/logo.png", True),
+        ("https://cdn.example.com/logo.png?v=3", True),
+        ("https://cdn.example.com/icons.svg#cart", True),
+        ("https://cdn.example.com/fonts/inter.woff2?display=swap", True),
+        ("https://example.com/products?sort=png", False),
+        ("https://example.com/image?id=1", False),
+    ],
+)
+def test_blocked_url_patterns(url, blocked):
+    patterns = blocked_url_patterns([ResourceType.IMAGE, ResourceType.FONT])
+    assert any(fnmatchcase(url, pattern) for pattern in patterns) is blocked
+
+
+def test_network_stats_from_performance_log():
+    def entry(method, **params):
+        return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+    stats = NetworkStats.from_performance_log(
+        [
+            entry("Network.requestWillBeSent", requestId="1"),
+            entry("Network.requestWillBeSent", requestId="2"),
+            entry("Network.requestWillBeSent", requestId="3"),
+            entry("Network.loadingFinished", requestId="1", encodedDataLength=1200),
+            entry("Network.loadingFailed", requestId="2", type="Font", blockedReason="inspector"),
+            entry(
+                "Network.loadingFailed", requestId="3", type="XHR", errorText="net::ERR_FAILED"
+            ),
+        ]
+    )
+    assert (stats.requests, stats.blocked, stats.transferred_bytes) == (3, 1, 1200)
+    assert stats.blocked_by_type == {"Font": 1}
+
+
+class FakeCommandExecutor:
+    """Executor of a fake WebDriver session with several windows, recording the commands."""
+
+    def __init__(self):
+        self.windows = {"window-0": "about:blank"}
+        self.current = "window-0"
+        self.log = []
+
+    def execute(self, command, params):
+        self.log.append((command, params.get("script")))
+        value = None
+        if command == Command.NEW_WINDOW:
+            handle = f"window-{len(self.windows)}"
+            self.windows[handle] = "about:blank"
+            value = {"handle": handle, "type": "tab"}
+        elif command == Command.SWITCH_TO_WINDOW:
+            self.current = params["handle"]
+        elif command == Command.W3C_GET_CURRENT_WINDOW_HANDLE:
+            value = self.current
+        elif command == Command.CLOSE:
+            del self.windows[self.current]
+        elif command == Command.W3C_EXECUTE_SCRIPT and params["script"] == NAVIGATE_SCRIPT:
+            self.windows[self.current] = params["args"][0]
+        elif command == Command.W3C_EXECUTE_SCRIPT and params["script"] == READY_STATE_SCRIPT:
+            value = "complete"
+        elif command == Command.GET_CURRENT_URL:
+            value = self.windows[self.current]
+        return {"value": value}
+
+
+class TabBrowser(BrowserMixin, WebDriver):
+    def __init__(self):
+        self.command_executor = FakeCommandExecutor()
+        self.session_id = "session"
+        self.error_handler = ErrorHandler()
+        self._switch_to = SwitchTo(self)
+
+
+def test_tab_pool_map():
+    browser = TabBrowser()
+    executor = browser.command_executor
+    urls = [f"https://example.com/{i}" for i in range(5)]
+    with browser.tab_pool(size=3) as tabs:
+        assert list(tabs.map(lambda tab: tab.current_url, urls)) == urls
+        assert len(executor.windows) == 3
+    assert list(executor.windows) == ["window-0"]
+    assert executor.current == "window-0"
+    assert browser._tabs is None
+
+    # The pages of the three tabs are loading before the first one is read
+    commands = [script or command for command, script in executor.log]
+    first_read = commands.index(Command.GET_CURRENT_URL)
+    assert commands[:first_read].count(NAVIGATE_SCRIPT) == 3
+
+
+class TabChromeBrowser(ChromeBrowser):
+    def __init__(self):
+        TabBrowser.__init__(self)
+        self.caps = {"browserName": "chrome"}
+
+
+def test_tab_pool_blocks_requests_of_new_tabs():
+    browser = TabChromeBrowser()
+    executor = browser.command_executor
+    blocked = []
+    execute = executor.execute
+
+    def record(command, params):
+        if command == "executeCdpCommand" and params["cmd"] == "Network.setBlockedURLs":
+            blocked.append(executor.current)
+        return execute(command, params)
+
+    executor.execute = record
+    browser.block_urls(["*.css"])
+    with browser.tab_pool(size=3):
+        assert blocked == ["window-0", "window-1", "window-2"]
+        assert executor.current == "window-0"
+    browser.switch_to.new_window("tab")
+    assert blocked[3:] == [executor.current]
+
+
+def test_tab_pool_binds_pages_to_their_tab():
+    browser = TabBrowser()
+    with browser.tab_pool(size=2) as tabs, tabs.lease() as tab_1, tabs.lease() as tab_2:
+        tab_1.execute_script(NAVIGATE_SCRIPT, "https://example.com/1")
+        tab_2.execute_script(NAVIGATE_SCRIPT, "https://example.com/2")
+        page_1, page_2 = Page(tab_1), Page(tab_2)
+
+        def read(page, url):
+            for _ in range(50):
+                assert page._driver.current_url == url
+
+        threads = [
+            threading.Thread(target=read, args=(page_1, "https://example.com/1")),
+            threading.Thread(target=read, args=(page_2, "https://example.com/2")),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with pytest.raises(TimeoutError), tabs.lease(timeout=0.01):
+            pass
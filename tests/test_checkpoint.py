@@ -0,0 +1,27 @@
+from manen.checkpoint import Checkpoint
+
+
+def test_record_and_reload(tmp_path):
+    path = tmp_path / "crawl.checkpoint"
+    with Checkpoint(path, batch_size=2, flush_interval=60) as checkpoint:
+        checkpoint.record("https://site.com/1")
+        assert not path.exists()
+        checkpoint.record("https://site.com/2", error="TimeoutException: page too slow")
+        assert len(path.read_text().splitlines()) == 2
+        checkpoint.record("https://site.com/3")
+    assert len(path.read_text().splitlines()) == 3
+
+    checkpoint = Checkpoint(path)
+    assert "https://site.com/1" in checkpoint
+    assert "https://site.com/2" not in checkpoint
+    assert checkpoint.errors == {"https://site.com/2": "TimeoutException: page too slow"}
+    assert len(checkpoint) == 2
+
+
+def test_partially_written_record(tmp_path):
+    path = tmp_path / "crawl.checkpoint"
+    path.write_text('["https://site.com/1", null]\n["https://site.com/2", nu')
+    with Checkpoint(path) as checkpoint:
+        assert checkpoint.done == {"https://site.com/1"}
+        checkpoint.record("https://site.com/2")
+    assert Checkpoint(path).done == {"https://site.com/1", "https://site.com/2"}
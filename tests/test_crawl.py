@@ -0,0 +1,123 @@
+import json
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Annotated
+from urllib.request import urlopen
+
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException
+
+from manen.checkpoint import Checkpoint
+from manen.page_object_model.component import Page
+from manen.page_object_model.config import CSS
+
+pytest.importorskip("lxml")
+pytest.importorskip("cssselect")
+
+from manen.crawl import CrawlRunner
+from manen.snapshot import Snapshot
+
+
+class BookPage(Page):
+    title: Annotated[str, CSS("h1")]
+    price: Annotated[float, CSS("p.price")]
+
+
+class HTTPDriver(Snapshot):
+    """Snapshot loading the pages from an HTTP server."""
+
+    def __init__(self):
+        super().__init__("<html></html>")
+
+    def get(self, url: str):
+        with urlopen(url) as response:
+            Snapshot.__init__(self, response.read().decode(), url=url)
+
+
+class CrashingDriver(HTTPDriver):
+    """Driver whose browser crashes on its third page."""
+
+    def __init__(self):
+        super().__init__()
+        self.pages = 0
+
+    def get(self, url: str):
+        self.pages += 1
+        if self.pages >= 3:
+            raise InvalidSessionIdException("invalid session id")
+        super().get(url)
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    for i in range(8):
+        (tmp_path / f"book_{i}.html").write_text(
+            f"<html><body><h1>Book {i}</h1><p class='price'>{i}.5</p></body></html>"
+        )
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=tmp_path))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_crawl(server, tmp_path):
+    urls = [f"{server}/book_{i}.html" for i in range(8)] + [f"{server}/missing.html"]
+    runner = CrawlRunner(BookPage, workers=2, max_in_flight=3, factory=HTTPDriver)
+    stats = runner.run(urls, tmp_path / "books.jsonl")
+
+    records = [json.loads(line) for line in (tmp_path / "books.jsonl").read_text().splitlines()]
+    assert sorted(record["url"] for record in records) == sorted(urls)
+    data = {record["url"]: record["data"] for record in records}
+    assert data[urls[3]] == {"title": "Book 3", "price": 3.5}
+    assert data[urls[-1]] is None
+    assert [record["error"] for record in records if record["error"]] == [
+        "HTTPError: HTTP Error 404: File not found"
+    ]
+    assert (stats.submitted, stats.completed, stats.failed) == (9, 8, 1)
+    assert not stats.interrupted
+    assert 1 <= len(stats.workers) <= 2
+    assert sum(worker.pages for worker in stats.workers.values()) == 8
+    assert all(worker.throughput > 0 for worker in stats.workers.values())
+
+
+def test_crawl_restarts_crashed_browser(server, tmp_path):
+    urls = [f"{server}/book_{i}.html" for i in range(8)]
+    runner = CrawlRunner(BookPage, workers=1, factory=CrashingDriver)
+    stats = runner.run(urls, tmp_path / "books.jsonl")
+    # A new browser is started after each crash, which happens on its third page
+    assert (stats.completed, stats.failed) == (6, 2)
+
+
+def test_crawl_stopped(server, tmp_path):
+    runner = CrawlRunner(BookPage, workers=2, max_in_flight=2, factory=HTTPDriver)
+
+    def urls():
+        for i in range(8):
+            if i == 3:
+                runner.stop()
+            yield f"{server}/book_{i}.html"
+
+    output = tmp_path / "books.jsonl"
+    stats = runner.run(urls(), output)
+    assert stats.interrupted
+    assert stats.submitted == stats.completed == len(output.read_text().splitlines()) <= 4
+
+
+def test_crawl_resumed_from_checkpoint(server, tmp_path):
+    urls = [f"{server}/book_{i}.html" for i in range(8)]
+    output = tmp_path / "books.jsonl"
+    runner = CrawlRunner(BookPage, workers=2, factory=HTTPDriver)
+    with Checkpoint(tmp_path / "books.checkpoint") as checkpoint:
+        runner.run(urls[:5], output, checkpoint=checkpoint)
+    with Checkpoint(tmp_path / "books.checkpoint") as checkpoint:
+        stats = runner.run(urls, output, checkpoint=checkpoint)
+    assert (stats.skipped, stats.submitted) == (5, 3)
+    assert sorted(json.loads(line)["url"] for line in output.read_text().splitlines()) == urls
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+
+import pytest
+
+from manen.export import flatten, write_csv, write_ndjson
+
+pytest.importorskip("lxml")
+pytest.importorskip("cssselect")
+
+from manen.testing import FakeWebDriver
+
+from .page_object_model.test_extraction import HTML, CataloguePage
+
+
+@pytest.fixture
+def driver():
+    return FakeWebDriver(HTML)
+
+
+@pytest.mark.parametrize("with_js", [False, True])
+def test_model_iter(driver, with_js):
+    rows = CataloguePage(driver).model_iter("books", with_js=with_js)
+    assert next(rows) == {
+        "title": "Book 0",
+        "price": 0.5,
+        "author": {"name": "Author 0", "born": 1900},
+        "tags": ["tag 0", "other"],
+    }
+    assert list(rows) == CataloguePage(driver).model_dump()["books"][1:]
+
+
+def test_model_iter_with_js_by_chunks(driver):
+    assert len(list(CataloguePage(driver).model_iter("books", with_js=True))) == 120
+    # 3 chunks of 50 rows
+    assert driver.commands == {"executeScript": 3}
+    assert list(CataloguePage(driver).model_iter("reviews", with_js=True)) == []
+
+
+def test_model_iter_not_a_list_of_components(driver):
+    with pytest.raises(ValueError, match="not a list of components"):
+        next(CataloguePage.Book(driver).model_iter("tags"))
+
+
+def test_flatten():
+    row = {"title": "Book", "author": {"name": "Author", "born": 1900}, "tags": ["a", "b"]}
+    assert flatten(row) == {
+        "title": "Book",
+        "author.name": "Author",
+        "author.born": 1900,
+        "tags": ["a", "b"],
+    }
+    assert flatten(row, ["author.name", "tags.1", "tags.5"]) == {
+        "author.name": "Author",
+        "tags.1": "b",
+        "tags.5": None,
+    }
+    assert flatten(row, {"author": "author/name"}, separator="/") == {"author": "Author"}
+
+
+def test_write_ndjson(driver, tmp_path):
+    rows = CataloguePage(driver).model_iter("books", with_js=True)
+    count = write_ndjson(rows, tmp_path / "books.jsonl", columns={"author": "author.name"})
+    assert count == 120
+    lines = (tmp_path / "books.jsonl").read_text().splitlines()
+    assert json.loads(lines[7]) == {"author": "Author 7"}
+
+
+def test_write_csv(driver):
+    output = io.StringIO(newline="")
+    assert write_csv(CataloguePage(driver).model_iter("books"), output) == 120
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert rows[3] == {
+        "title": "Book 3",
+        "price": "3.5",
+        "author.name": "Author 3",
+        "author.born": "1903",
+        "tags": '["tag 3", "other"]',
+    }
+
+    output = io.StringIO(newline="")
+    assert write_csv([], output, columns=["title", "author.name"]) == 0
+    assert output.getvalue() == "title,author.name\r\n"
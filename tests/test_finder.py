@@ -1,7 +1,11 @@
+import time
+
 import pytest
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
 
-from manen.finder import parse_selector
+from manen.finder import Selector, _parse_selector_string, find, parse_selector
 
 
 @pytest.mark.parametrize(
@@ -40,3 +44,105 @@ def test_parse_selector(selector, expected_selection_method):
 def test_parse_selector_with_inference(selector, expected_selection_method):
     selection_method = parse_selector(selector)
     assert selection_method == expected_selection_method
+
+
+@pytest.mark.parametrize("by", [By.CLASS_NAME, By.CSS_SELECTOR, By.ID, By.TAG_NAME, By.XPATH])
+def test_selector_str_round_trip(by):
+    selector = Selector(by, "a:b")
+    assert parse_selector(str(selector)) == selector
+
+
+def test_parse_selector_is_cached():
+    selector = parse_selector("css:div.cached > p")
+    hits = _parse_selector_string.cache_info().hits
+    assert parse_selector("css:div.cached > p") is selector
+    assert _parse_selector_string.cache_info().hits == hits + 1
+    assert parse_selector(Selector(By.XPATH, "//p")) == (By.XPATH, "//p")
+
+
+class RecordingScope:
+    def __init__(self):
+        self.lookups = []
+
+    def find_elements(self, by, value):
+        self.lookups.append((by, value))
+        return ["element"]
+
+
+def test_find_accepts_selector():
+    scope = RecordingScope()
+    assert find(Selector(By.XPATH, "//h1"), inside=[scope], many=True) == [["element"]]  # type: ignore
+    assert scope.lookups == [(By.XPATH, "//h1")]
+
+
+class DelayedScope:
+    """Scope answering each lookup after a delay, where an element appears at a given time."""
+
+    def __init__(self, name, delay=0.0, appears_at=0.0):
+        self.name = name
+        self.delay = delay
+        self.appears_at = time.monotonic() + appears_at
+
+    def find_elements(self, by, value):
+        time.sleep(self.delay)
+        return [self.name] if time.monotonic() >= self.appears_at else []
+
+
+def test_find_concurrently_preserves_order():
+    scopes = [DelayedScope(name=i, delay=0.1) for i in range(8)]
+    start = time.monotonic()
+    output = find("div", inside=scopes, many=True, max_workers=8)  # type: ignore
+    assert time.monotonic() - start < 0.5
+    assert output == [[i] for i in range(8)]
+
+
+def test_find_concurrently_shared_deadline():
+    scopes = [DelayedScope(name=i, appears_at=10) for i in range(4)]
+    start = time.monotonic()
+    output = find("div", inside=scopes, many=True, default=[], wait=1, max_workers=2)  # type: ignore
+    assert output == [[], [], [], []]
+    assert time.monotonic() - start < 1.9
+
+
+def test_find_concurrently_with_wait():
+    scopes = [DelayedScope(name=0), DelayedScope(name=1, appears_at=0.2)]
+    output = find("div", inside=scopes, many=True, wait=2, max_workers=2)  # type: ignore
+    assert output == [[0], [1]]
+
+
+class AsyncScriptDriver(WebDriver):
+    """Driver where no element is found by Selenium, but where the in-browser wait resolves."""
+
+    def __init__(self, result):
+        self.result = result
+        self.scripts = []
+
+    def find_element(self, by, value):
+        raise NoSuchElementException()
+
+    def find_elements(self, by, value):
+        return []
+
+    def execute_async_script(self, script, *args):
+        self.scripts.append(args)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_find_wait_in_browser():
+    driver = AsyncScriptDriver(result=[["element"]])
+    assert find(["h1", "xpath://h2"], inside=driver, wait=5) == "element"
+    assert find("h1", inside=driver, many=True, wait=5) == ["element"]
+    (scopes, selectors, many, timeout), _ = driver.scripts
+    assert scopes == [None]
+    assert selectors == [(By.CSS_SELECTOR, "h1"), (By.XPATH, "//h2")]
+    assert not many
+    assert 4900 < timeout <= 5000
+
+
+def test_find_wait_in_browser_fallback():
+    driver = AsyncScriptDriver(result=WebDriverException("javascript error"))
+    start = time.monotonic()
+    assert find("h1", inside=driver, wait=1, default=None) is None
+    assert 0.9 < time.monotonic() - start < 2
@@ -0,0 +1,85 @@
+import pytest
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from manen import instrumentation
+from manen.finder import find
+from manen.instrumentation import CallStats, instrument
+
+pytest.importorskip("lxml")
+pytest.importorskip("cssselect")
+
+from manen.testing import FakeWebDriver
+
+from .test_snapshot import HTML, CataloguePage
+
+
+@pytest.fixture
+def driver():
+    return FakeWebDriver(HTML, url="https://books.toscrape.com/catalogue/")
+
+
+def test_fields_are_measured(driver):
+    with instrument() as stats:
+        page = CataloguePage(driver)
+        titles = [book.title for book in page.books]
+        assert page.heading == "All products"
+    assert len(titles) == 2
+    assert stats.fields[("CataloguePage", "books")].commands == 1
+    assert stats.fields[("CataloguePage.Book", "title")].calls == 2
+    # The values of the siblings are read with one command, by the first book
+    assert stats.fields[("CataloguePage.Book", "title")].commands == 1
+    # A single value is read from the element found, without the reading script
+    assert stats.fields[("CataloguePage", "heading")].commands == 2
+    assert all(item.wall_time > 0 for item in stats.fields.values())
+
+
+def test_finds_are_measured_by_call_site(driver):
+    with instrument() as stats:
+        find(["css:h2", "css:h1"], inside=driver)
+        find("css:h2", inside=driver, default=None)
+        find("css:h2", inside=driver, wait=0.1, default=None)
+    assert [key.rsplit(":")[0] for key in stats.finds] == [__file__] * 3
+    first, second, third = stats.finds.values()
+    assert first == CallStats(calls=1, commands=2, wall_time=first.wall_time, fallback_hits=1)
+    assert second.defaults == 1
+    assert third.polls >= 1
+
+
+def test_nested_calls_are_included(driver):
+    with instrument() as stats:
+        _ = CataloguePage(driver).ratings
+    field = stats.fields[("CataloguePage", "ratings")]
+    (call,) = stats.finds.values()
+    assert field.defaults == call.defaults == 1
+    assert field.commands == call.commands + 1
+
+
+def test_callback():
+    measurements = []
+    driver = FakeWebDriver(HTML)
+    with instrument(callback=measurements.append):
+        find("css:li.book", inside=driver, many=True)
+    assert [(item.kind, item.stats.commands) for item in measurements] == [("find", 1)]
+
+
+def test_disabled(driver):
+    with instrument() as stats:
+        pass
+    find("css:h1", inside=driver)
+    assert not instrumentation.is_enabled()
+    assert stats.finds == {}
+    assert WebDriver.execute is instrumentation._execute
+
+
+def test_nested_instrumentation(driver):
+    with instrument() as outer:
+        find("css:h1", inside=driver)
+        with instrument() as inner:
+            find("css:h1", inside=driver)
+        assert instrumentation.is_enabled()
+        find("css:h1", inside=driver)
+    assert not instrumentation.is_enabled()
+    assert WebDriver.execute is instrumentation._execute
+    assert [stats.calls for stats in outer.finds.values()] == [1, 1, 1]
+    assert [stats.calls for stats in inner.finds.values()] == [1]
+    assert sum(stats.commands for stats in outer.finds.values()) == 3
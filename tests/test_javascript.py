@@ -0,0 +1,308 @@
+import json
+import re
+import shutil
+import subprocess
+from typing import Any
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from manen.javascript import (
+    COUNT_ELEMENTS_SCRIPT,
+    EXTRACT_SCRIPT,
+    READ_ATTRIBUTES_SCRIPT,
+    VISIBLE_TEXT_FUNCTIONS,
+)
+from manen.page_object_model.extraction import compile_spec
+from manen.snapshot import BLOCK_TAGS, Snapshot, SnapshotElement, is_hidden
+
+# Minimal DOM, enough to evaluate the text functions with Node.js
+FAKE_DOM = """
+const Node = {ELEMENT_NODE: 1, TEXT_NODE: 3};
+const DISPLAYS = {div: "block", p: "block", tr: "table-row", td: "table-cell", br: "inline"};
+const window = {getComputedStyle: (element) => element.style};
+
+function build([tag, style, children], parent) {
+    const element = {
+        nodeType: Node.ELEMENT_NODE,
+        tagName: tag.toUpperCase(),
+        parent: parent,
+        style: Object.assign(
+            {display: DISPLAYS[tag] || "inline", whiteSpace: "normal", textTransform: "none",
+             cssFloat: "none"},
+            style,
+        ),
+    };
+    element.childNodes = children.map((child) => typeof child === "string"
+        ? {nodeType: Node.TEXT_NODE, nodeValue: child}
+        : build(child, element));
+    const elements = element.childNodes.filter((node) => node.nodeType === Node.ELEMENT_NODE);
+    elements.forEach((child, index) => { child.previousElementSibling = elements[index - 1]; });
+    return element;
+}
+
+function manenIsDisplayed(element) {
+    for (let current = element; current; current = current.parent) {
+        if (current.style.display === "none") {
+            return false;
+        }
+    }
+    return true;
+}
+"""
+
+
+def visible_text(tree) -> str:
+    script = (
+        FAKE_DOM
+        + VISIBLE_TEXT_FUNCTIONS
+        + f"process.stdout.write(JSON.stringify(manenReadText(build({json.dumps(tree)}))));"
+    )
+    output = subprocess.run(["node", "-e", script], capture_output=True, check=True, text=True)
+    return json.loads(output.stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is not installed")
+def test_visible_text_like_selenium():
+    tree = [
+        "div",
+        {},
+        [
+            "Price:\xa012 ",
+            ["span", {"display": "none"}, ["hidden"]],
+            ["p", {}, ["  First \n  paragraph "]],
+            ["div", {}, [["p", {}, ["Nested"]], " tail", ["br", {}, []], "next"]],
+            ["tr", {}, [["td", {}, ["a"]], ["td", {}, ["b"]]]],
+            ["span", {"textTransform": "uppercase"}, ["loud"]],
+        ],
+    ]
+    # Non-breaking spaces are replaced, and blocks separated by a single line break
+    assert visible_text(tree) == "Price: 12\nFirst paragraph\nNested\ntail\nnext\na b\nLOUD"
+
+
+# Document built from a page parsed by lxml, enough to run the scripts of manen and the Selenium
+# atoms they embed: the selectors are evaluated beforehand by lxml (``MATCHES``), the styles come
+# from the tags and the ``style`` attributes, and all the elements have the same size
+FAKE_DOCUMENT = """
+const Node = {ELEMENT_NODE: 1, TEXT_NODE: 3, DOCUMENT_NODE: 9, DOCUMENT_FRAGMENT_NODE: 11};
+const XPathResult = {ORDERED_NODE_SNAPSHOT_TYPE: 7};
+const CSS = {escape: (value) => value};
+const ELEMENTS = {};
+
+class Element {
+    constructor([tag, attributes, path, html, display], parent) {
+        Object.assign(this, {nodeType: Node.ELEMENT_NODE, tag, attributes, path, display});
+        Object.assign(this, {outerHTML: html, parentNode: parent, ownerDocument: document});
+        ELEMENTS[path] = this;
+    }
+    get tagName() {
+        return this.tag.toUpperCase();
+    }
+    get previousElementSibling() {
+        const siblings = this.parentNode.childNodes.filter((node) => node instanceof Element);
+        return siblings[siblings.indexOf(this) - 1] || null;
+    }
+    get className() {
+        return this.getAttribute("class") || "";
+    }
+    get type() {
+        return this.getAttribute("type") || "text";
+    }
+    get checked() {
+        return this.getAttribute("checked") !== null;
+    }
+    get value() {
+        return this.tag === "input" ? this.getAttribute("value") || "" : undefined;
+    }
+    get href() {
+        return new URL(this.getAttribute("href"), URL_).href;
+    }
+    get src() {
+        return new URL(this.getAttribute("src"), URL_).href;
+    }
+    getAttribute(name) {
+        return name in this.attributes ? this.attributes[name] : null;
+    }
+    get clientWidth() {
+        return 10;
+    }
+    get clientHeight() {
+        return 10;
+    }
+    getBoundingClientRect() {
+        return {left: 0, top: 0, right: 10, bottom: 10};
+    }
+    closest(tag) {
+        let current = this;
+        while (current instanceof Element && current.tag !== tag) {
+            current = current.parentNode;
+        }
+        return current instanceof Element ? current : null;
+    }
+    contains(node) {
+        while (node && node !== this) {
+            node = node.parentNode;
+        }
+        return node === this;
+    }
+    querySelectorAll(selector) {
+        return MATCHES.css[selector].map((path) => ELEMENTS[path])
+            .filter((element) => element !== this && this.contains(element));
+    }
+}
+
+class HTMLFormElement extends Element {}
+
+function build(node, parent) {
+    const Class = node[0] === "form" ? HTMLFormElement : Element;
+    const element = new Class(node, parent);
+    element.childNodes = node[5].map((child) => typeof child === "string"
+        ? {nodeType: Node.TEXT_NODE, nodeValue: child, parentNode: element}
+        : build(child, element));
+    return element;
+}
+
+const window = {
+    pageXOffset: 0,
+    pageYOffset: 0,
+    getComputedStyle: (element) => ({
+        display: element.display,
+        visibility: element.display === "hidden" ? "hidden" : "visible",
+        whiteSpace: "normal",
+        textTransform: "none",
+        cssFloat: "none",
+        getPropertyValue(name) {
+            return {display: this.display, visibility: this.visibility, opacity: "1"}[name];
+        },
+    }),
+};
+
+const document = {
+    nodeType: Node.DOCUMENT_NODE,
+    compatMode: "CSS1Compat",
+    defaultView: window,
+    querySelectorAll: (selector) => MATCHES.css[selector].map((path) => ELEMENTS[path]),
+    evaluate: (expression, scope) => {
+        const paths = MATCHES.xpath[expression][scope.path || ""];
+        const elements = paths.map((path) => ELEMENTS[path]);
+        return {snapshotLength: elements.length, snapshotItem: (index) => elements[index]};
+    },
+};
+"""
+
+
+def run_script(page: Snapshot, script: str, *args) -> tuple[Any, Any]:
+    """Run a script of :py:mod:`manen` with Node.js in a fake document built from a snapshot,
+    and return its result with the one of the emulation of the snapshot. The elements of the
+    arguments and of the results are identified by their XPath in the page."""
+    etree = pytest.importorskip("lxml.etree")
+    tree = page.root.getroottree()
+
+    def build(node):
+        if is_hidden(node):
+            display = "none"
+        elif node.tag in ("html", "body", *BLOCK_TAGS):
+            display = "block"
+        else:
+            display = {"td": "table-cell", "th": "table-cell"}.get(node.tag, "inline")
+        children = [node.text] if node.text else []
+        for child in node:
+            if isinstance(child.tag, str):
+                children.append(build(child))
+            if child.tail:
+                children.append(child.tail)
+        html = etree.tostring(node, encoding="unicode", method="html", with_tail=False)
+        return [node.tag, dict(node.attrib), tree.getpath(node), html, display, children]
+
+    def encode(value):
+        if isinstance(value, SnapshotElement):
+            return {"element": tree.getpath(value.node)}
+        raise TypeError(value)
+
+    nodes = [None, *page.root.iter()]
+    css, xpath = {}, {}
+    # Selectors of the arguments: CSS selectors, XPath expressions and link texts
+    for by, value in re.findall(r'\["([a-z ]+)", ("[^"]*")\]', json.dumps(args, default=encode)):
+        value = json.loads(value)
+        if by == By.XPATH:
+            xpath[value] = {
+                "" if node is None else tree.getpath(node): [
+                    tree.getpath(item)
+                    for item in (tree if node is None else node).xpath(value)
+                    if isinstance(getattr(item, "tag", None), str)
+                ]
+                for node in nodes
+                if node is None or isinstance(node.tag, str)
+            }
+        else:
+            selector = "a" if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT) else value
+            css[selector] = [
+                tree.getpath(item) for item in page.query(None, By.CSS_SELECTOR, selector)
+            ]
+
+    program = (
+        FAKE_DOCUMENT
+        + f"const URL_ = {json.dumps(page.url)};\n"
+        + f"const MATCHES = {json.dumps({'css': css, 'xpath': xpath})};\n"
+        + f"document.documentElement = build({json.dumps(build(page.root))}, document);\n"
+        + "document.body = ELEMENTS['/html/body'];\n"
+        + f"const args = JSON.parse({json.dumps(json.dumps(args, default=encode))},"
+        + " (key, value) => value && value.element ? ELEMENTS[value.element] : value);\n"
+        + f"const result = (function () {{ {script} }}).apply(null, args);\n"
+        + "process.stdout.write(JSON.stringify(result, (key, value) =>"
+        + " value instanceof Element ? {element: value.path} : value));"
+    )
+    output = subprocess.run(["node"], input=program, capture_output=True, check=True, text=True)
+    expected = json.loads(json.dumps(page.execute_script(script, *args), default=encode))
+    return json.loads(output.stdout), expected
+
+
+@pytest.fixture
+def page():
+    pytest.importorskip("lxml")
+    pytest.importorskip("cssselect")
+    from .test_snapshot import HTML
+
+    return Snapshot(HTML, url="https://books.toscrape.com/catalogue/")
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is not installed")
+def test_extract_script_like_snapshot(page):
+    from .test_snapshot import CataloguePage
+
+    result, expected = run_script(page, EXTRACT_SCRIPT, None, compile_spec(CataloguePage._config))
+    assert result == expected
+    # The text of the hidden elements is empty
+    assert result["values"]["books"][1]["values"]["tags"] == [""]
+    assert result["missing"] == ["previous_url", "ratings"]
+
+    book = page.find_elements(By.CSS_SELECTOR, "li.book")[1]
+    spec = compile_spec(CataloguePage.Book._config)
+    result, expected = run_script(page, EXTRACT_SCRIPT, book, spec)
+    assert result == expected
+    assert result["values"]["link"] == "https://books.toscrape.com/book-2.html"
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is not installed")
+def test_count_elements_script_like_snapshot(page):
+    selectors = [(By.CSS_SELECTOR, "p.missing"), (By.XPATH, ".//li[@class='book']")]
+    result, expected = run_script(page, COUNT_ELEMENTS_SCRIPT, None, selectors, 1)
+    assert result == expected == [1, 2, [{"element": "/html/body/ol/li[1]"}]]
+
+    pager = page.find_element(By.CSS_SELECTOR, "ul.pager")
+    result, expected = run_script(page, COUNT_ELEMENTS_SCRIPT, pager, selectors, 1)
+    assert result == expected is None
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is not installed")
+@pytest.mark.parametrize(
+    "selector, attribute",
+    [("h3 a", "href"), ("h3 a", "title"), ("input", "value"), ("input", "checked")],
+)
+def test_read_attributes_script_like_snapshot(page, selector, attribute):
+    scopes = [None, *page.find_elements(By.CSS_SELECTOR, "li.book")]
+    selectors = [(By.CSS_SELECTOR, selector)]
+    result, expected = run_script(
+        page, READ_ATTRIBUTES_SCRIPT, scopes, selectors, True, attribute
+    )
+    assert result == expected
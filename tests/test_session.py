@@ -0,0 +1,153 @@
+import stat
+from types import SimpleNamespace
+
+from manen.browser import ChromeBrowser
+from manen.javascript import READ_STORAGE_SCRIPT
+from manen.session import Session, SessionStore
+
+COOKIES = [
+    {
+        "name": "token",
+        "value": "abc",
+        "domain": ".example.com",
+        "path": "/",
+        "secure": True,
+        "httpOnly": True,
+        "expiry": 2000000000,
+    },
+    {"name": "lang", "value": "fr", "domain": "shop.example.org", "path": "/"},
+]
+
+
+class RecordingChromeBrowser(ChromeBrowser):
+    def __init__(self, storage=("https://example.com", {"theme": "dark"}, {})):
+        self.page_storage = list(storage)
+        self.cdp_commands = []
+        self.scripts = []
+        self.devtools_cookies = []
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.cdp_commands.append((cmd, cmd_args))
+        if cmd == "Network.setCookies":
+            self.devtools_cookies = [
+                dict(cookie, session=False) for cookie in cmd_args["cookies"]
+            ]
+        if cmd == "Storage.getCookies":
+            return {"cookies": self.devtools_cookies}
+        if cmd == "Network.clearBrowserCookies":
+            self.devtools_cookies = []
+        if cmd == "Page.addScriptToEvaluateOnNewDocument":
+            return {"identifier": str(len(self.cdp_commands))}
+        return {}
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if script == READ_STORAGE_SCRIPT:
+            return self.page_storage
+        return self.page_storage[0]
+
+    # Single window, to reset the browser
+    window_handles = ["main"]
+
+    @property
+    def switch_to(self):
+        return SimpleNamespace(window=lambda handle: None)
+
+    def get(self, url):
+        self.scripts.append(url)
+
+
+def test_add_cookies_with_one_devtools_command():
+    browser = RecordingChromeBrowser()
+    browser.cookies = COOKIES
+    assert len(browser.cdp_commands) == 1
+    command, params = browser.cdp_commands[0]
+    assert command == "Network.setCookies"
+    assert params["cookies"][0]["expires"] == 2000000000
+    assert "expiry" not in params["cookies"][0]
+    assert browser.get_all_cookies() == [
+        {**COOKIES[0]},
+        {**COOKIES[1], "secure": False, "httpOnly": False},
+    ]
+
+
+def test_store_save_and_restore(tmp_path):
+    store = SessionStore(tmp_path / "sessions")
+    browser = RecordingChromeBrowser()
+    browser.add_cookies(COOKIES)
+    store.save(browser, "example")
+
+    browser.page_storage = ["https://shop.example.org", {}, {"cart": "1"}]
+    session = store.save(browser, "example")
+    assert store.names() == ["example"]
+    assert session.storage == {
+        "https://example.com": {"local": {"theme": "dark"}, "session": {}},
+        "https://shop.example.org": {"local": {}, "session": {"cart": "1"}},
+    }
+    assert store.load("example") == session
+
+    worker = RecordingChromeBrowser()
+    assert store.restore(worker, "example")
+    assert [command for command, _ in worker.cdp_commands] == [
+        "Network.setCookies",
+        "Page.addScriptToEvaluateOnNewDocument",
+    ]
+    assert "shop.example.org" in worker.cdp_commands[1][1]["source"]
+    assert not store.restore(worker, "unknown")
+    assert stat.S_IMODE(store.path("example").stat().st_mode) == 0o600
+
+    # The script restoring the storage is removed (as done by BrowserMixin.reset)
+    worker.remove_document_scripts()
+    assert worker.cdp_commands[-1] == (
+        "Page.removeScriptToEvaluateOnNewDocument",
+        {"identifier": "2"},
+    )
+    worker.remove_document_scripts()
+    assert len(worker.cdp_commands) == 3
+
+
+def test_reset_clears_all_domains():
+    browser = RecordingChromeBrowser()
+    browser.add_cookies(COOKIES)
+    browser.cdp_commands.clear()
+    browser.reset()
+    assert browser.get_all_cookies() == []
+    cleared = [
+        params["origin"]
+        for command, params in browser.cdp_commands
+        if command == "Storage.clearDataForOrigin"
+    ]
+    # The origin of the current page, and the ones of the cookies (second domain included)
+    assert cleared == [
+        "http://example.com",
+        "http://shop.example.org",
+        "https://example.com",
+        "https://shop.example.org",
+    ]
+    assert browser.scripts[-1] == "about:blank"
+
+
+def test_apply_without_devtools():
+    class Driver:
+        def __init__(self):
+            self.cookies = []
+            self.scripts = []
+
+        def add_cookie(self, cookie):
+            self.cookies.append(cookie)
+
+        def execute_script(self, script, *args):
+            self.scripts.append(script)
+
+    driver = Driver()
+    Session(COOKIES, {"https://example.com": {"local": {"a": "1"}, "session": {}}}).apply(driver)
+    assert driver.cookies == COOKIES
+    assert len(driver.scripts) == 1
+
+
+def test_store_delete(tmp_path):
+    store = SessionStore(tmp_path)
+    store.dump("example", Session(COOKIES))
+    store.delete("example")
+    store.delete("example")
+    assert store.names() == []
@@ -0,0 +1,230 @@
+from typing import Annotated
+
+import pytest
+from selenium.common.exceptions import JavascriptException
+from selenium.webdriver.common.by import By
+
+from manen.exceptions import ElementNotFound
+from manen.finder import Selector, find, match_selectors
+from manen.page_object_model.component import Component, Page
+from manen.page_object_model.config import CSS, Attribute, Default, LinkText, XPath
+from manen.page_object_model.extraction import ExtractionCache
+from manen.page_object_model.types import checkbox, href, input_value
+
+pytest.importorskip("lxml")
+pytest.importorskip("cssselect")
+
+from manen.snapshot import DevToolsSnapshot, Snapshot, SnapshotElement
+from manen.testing import FakeWebDriver
+
+HTML = """
+<html>
+  <head><title> Books </title></head>
+  <body>
+    <h1>All products</h1>
+    <form><input name="q" value="python"><input type="checkbox" class="accept" checked></form>
+    <ol>
+      <li class="book">
+        <h3><a href="book-1.html" title="A Light in the Attic">A Light...</a></h3>
+        <p class="price">51.77</p>
+        <p class="tags"><span>poetry</span> <span>classic</span></p>
+      </li>
+      <li class="book">
+        <h3><a href="/book-2.html" title="Tipping the Velvet">Tipping...</a></h3>
+        <p class="price">53.74</p>
+        <p class="tags" style="display: none"><span>hidden</span></p>
+      </li>
+    </ol>
+    <ul class="pager"><li class="next"><a href="page-2.html">next</a></li></ul>
+  </body>
+</html>
+"""
+
+
+class CataloguePage(Page):
+    class Book(Component):
+        title: Annotated[str, Attribute("title"), CSS("h3 a")]
+        link: Annotated[href, CSS("h3 a")]
+        price: Annotated[float, CSS("p.price")]
+        tags: Annotated[list[str], CSS("p.tags span")]
+
+    heading: Annotated[str, XPath("//h1")]
+    query: Annotated[input_value, CSS("input[name='q']")]
+    accept: Annotated[checkbox, CSS("input.accept")]
+    books: Annotated[list[Book], CSS("li.book")]
+    next_url: Annotated[href, LinkText("next")]
+    previous_url: Annotated[href | None, CSS("li.previous a")]
+    ratings: Annotated[list[int], CSS("p.rating"), Default([])]
+
+
+@pytest.fixture
+def snapshot():
+    return Snapshot(HTML, url="https://books.toscrape.com/catalogue/")
+
+
+def test_find(snapshot):
+    books = find("li.book", inside=snapshot, many=True)
+    assert len(books) == 2
+    assert all(isinstance(book, SnapshotElement) for book in books)
+    assert find("css:p.price", inside=books[1]).text == "53.74"
+    assert find("./h3/a", inside=books[0]).get_attribute("title") == "A Light in the Attic"
+    assert find(["p.missing", "p.price"], inside=books, many=False)[0].text == "51.77"
+    assert find("li.book", inside=snapshot) == books[0]
+
+
+def test_find_not_found(snapshot):
+    assert find("table", inside=snapshot, default=None) is None
+    with pytest.raises(ElementNotFound, match="https://books.toscrape.com/catalogue/"):
+        find("table", inside=snapshot)
+
+
+@pytest.mark.parametrize("with_js", [False, True])
+def test_model_dump(snapshot, with_js):
+    page = CataloguePage(snapshot)
+    assert page.title == "Books"
+    assert page.model_dump(with_js=with_js) == {
+        "heading": "All products",
+        "query": "python",
+        "accept": True,
+        "books": [
+            {
+                "title": "A Light in the Attic",
+                "link": "https://books.toscrape.com/catalogue/book-1.html",
+                "price": 51.77,
+                "tags": ["poetry", "classic"],
+            },
+            {
+                "title": "Tipping the Velvet",
+                "link": "https://books.toscrape.com/book-2.html",
+                "price": 53.74,
+                "tags": [""],
+            },
+        ],
+        "next_url": "https://books.toscrape.com/catalogue/page-2.html",
+        "previous_url": None,
+        "ratings": [],
+    }
+
+
+class NoScriptSnapshot(Snapshot):
+    """Snapshot of a page where the scripts can't be executed (CSP...)."""
+
+    def execute_script(self, script, *args):
+        raise JavascriptException("EvalError: Refused to evaluate a string as JavaScript")
+
+
+def test_values_read_without_script():
+    snapshot = NoScriptSnapshot(HTML, url="https://books.toscrape.com/catalogue/")
+    page = CataloguePage(snapshot)
+    assert page.heading == "All products"
+    assert [book.price for book in page.books] == [51.77, 53.74]
+    assert page.books[0].tags == ["poetry", "classic"]
+
+
+def test_interactions_not_supported(snapshot):
+    page = CataloguePage(snapshot)
+    with pytest.raises(Exception, match="snapshot"):
+        page.query = "selenium"
+
+
+def test_match_selectors(snapshot):
+    match = match_selectors(["p.missing", "xpath://p[@class='price']"], inside=snapshot)
+    assert match.selector == Selector(By.XPATH, "//p[@class='price']")
+    assert match.elements.text == "51.77"
+    assert match_selectors(["p.missing", "table"], inside=snapshot, many=True) is None
+    book = find("li.book", inside=snapshot)
+    assert find(["p.missing", "p.tags span"], inside=book, many=True, with_js=True)[1].text == (
+        "classic"
+    )
+
+
+def test_model_dump_incremental(snapshot):
+    cache = ExtractionCache()
+    dump = CataloguePage(snapshot).model_dump(cache=cache)
+    assert (cache.extracted, cache.reused) == (2, 0)
+    assert dump == CataloguePage(snapshot).model_dump()
+
+    updated = Snapshot(HTML.replace("53.74", "12.99"), url=snapshot.current_url)
+    new_dump = CataloguePage(updated).model_dump(cache=cache)
+    assert (cache.extracted, cache.reused) == (1, 1)
+    assert new_dump["books"][0] is dump["books"][0]
+    assert new_dump["books"][1]["price"] == 12.99
+    assert new_dump == CataloguePage(updated).model_dump()
+    assert (cache.extracted, cache.reused) == (1, 1)
+
+    # The sections of another component class at the same path are not reused
+    other_dump = OtherCataloguePage(updated).model_dump(cache=cache)
+    assert (cache.extracted, cache.reused) == (2, 0)
+    assert other_dump["books"][0] == {"title": "A Light..."}
+    # The cache only holds the sections of the last extraction
+    CataloguePage(updated).model_dump(cache=cache)
+    assert (cache.extracted, cache.reused) == (2, 0)
+
+
+class OtherCataloguePage(Page):
+    class Book(Component):
+        title: Annotated[str, CSS("h3 a")]
+
+    books: Annotated[list[Book], CSS("li.book")]
+
+
+@pytest.mark.parametrize("with_js", [False, True])
+def test_devtools_snapshot(snapshot, with_js):
+    driver = FakeWebDriver(HTML, url="https://books.toscrape.com/catalogue/")
+    devtools_snapshot = DevToolsSnapshot.capture(driver)
+    assert driver.commands == {"executeCdpCommand": 1}
+    assert devtools_snapshot.current_url == "https://books.toscrape.com/catalogue/"
+    assert CataloguePage(devtools_snapshot).model_dump(with_js=with_js) == (
+        CataloguePage(snapshot).model_dump(with_js=with_js)
+    )
+
+
+def test_devtools_snapshot_rendering():
+    strings = [
+        "#document", "HTML", "BODY", "DIV", "SPAN", "#text", "Shown", "Invisible", "INPUT",
+        "name", "q", "type", "checkbox", "checked", "", "typed", "visible", "hidden",
+    ]  # fmt: skip
+    nodes = [
+        # (parent, type, name, value, attributes)
+        (-1, 9, 0, -1, []),
+        (0, 1, 1, -1, []),
+        (1, 1, 2, -1, []),
+        (2, 1, 3, -1, []),  # display: contents, no layout object
+        (3, 1, 4, -1, []),
+        (4, 3, 5, 6, []),
+        (2, 1, 4, -1, []),  # visibility: hidden
+        (6, 3, 5, 7, []),
+        (2, 1, 8, -1, [9, 10]),
+        (2, 1, 8, -1, [11, 12, 13, 14]),
+    ]
+    rendered = {1: 16, 2: 16, 4: 16, 5: 16, 6: 17, 7: 17, 8: 16, 9: 16}
+    data = {
+        "strings": strings,
+        "documents": [
+            {
+                "documentURL": -1,
+                "nodes": {
+                    "parentIndex": [node[0] for node in nodes],
+                    "nodeType": [node[1] for node in nodes],
+                    "nodeName": [node[2] for node in nodes],
+                    "nodeValue": [node[3] for node in nodes],
+                    "attributes": [node[4] for node in nodes],
+                    "inputValue": {"index": [8], "value": [15]},
+                    "inputChecked": {"index": []},
+                },
+                "layout": {
+                    "nodeIndex": list(rendered),
+                    "styles": [[style] for style in rendered.values()],
+                },
+            }
+        ],
+    }
+    devtools_snapshot = DevToolsSnapshot(data)
+    spans = find("span", inside=devtools_snapshot, many=True)
+    assert [span.text for span in spans] == ["Shown", ""]
+    assert find("div", inside=devtools_snapshot).is_displayed()
+    assert find("input[name='q']", inside=devtools_snapshot).get_attribute("value") == "typed"
+    assert (
+        find("input[type='checkbox']", inside=devtools_snapshot).get_attribute("checked") is None
+    )
+    assert devtools_snapshot.current_url == "about:blank"
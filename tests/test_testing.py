@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from manen.finder import find
+
+pytest.importorskip("lxml")
+pytest.importorskip("cssselect")
+
+from manen.testing import FakeWebDriver
+
+from .test_snapshot import HTML, CataloguePage
+
+
+@pytest.fixture
+def driver():
+    return FakeWebDriver(HTML, url="https://books.toscrape.com/catalogue/")
+
+
+def test_commands_are_counted(driver):
+    books = find("css:li.book", inside=driver, many=True)
+    assert [book.find_element("css selector", "p.price").text for book in books] == [
+        "51.77",
+        "53.74",
+    ]
+    assert driver.commands == {"findElements": 1, "findChildElement": 2, "getElementText": 2}
+    assert driver.command_count == 5
+    assert driver.reset_commands().total() == 5
+    assert driver.command_count == 0
+
+
+def test_nested_commands_are_not_counted(driver):
+    dump = CataloguePage(driver).model_dump(with_js=True)
+    assert dump["heading"] == "All products"
+    # The texts and attributes read by the extraction script are not counted
+    assert "getElementText" not in driver.commands
+    assert driver.commands["findElement"] + driver.commands["findElements"] == 2
+
+
+def test_wait_in_browser(driver):
+    assert find(["css:h1.loaded", "css:h1"], inside=driver, wait=1).text == "All products"
+    assert driver.commands["executeAsyncScript"] == 0
+    find("css:h2", inside=driver, wait=0.1, default=None)
+    assert driver.commands["executeAsyncScript"] == 1
+
+
+def test_wait_in_browser_for_all_scopes(driver):
+    books = find("css:li.book", inside=driver, many=True)
+    start = time.perf_counter()
+    output = find("css:span.missing", inside=books, wait=1, default=None, max_workers=4)
+    assert output == [None] * len(books)
+    assert time.perf_counter() - start < 1.5
+    assert driver.commands["executeAsyncScript"] == 1
+
+
+def test_latency():
+    driver = FakeWebDriver(HTML, latency=0.05)
+    start = time.perf_counter()
+    find("css:li.book", inside=driver, many=True)
+    assert time.perf_counter() - start >= 0.05